@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for parameter writes.
+
+Run with:
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_parameters.py
+
+"""
+#
+#   Imports
+#
+import timeit
+
+from spines import Model
+from spines import Parameter
+
+
+#
+#   Model
+#
+
+class LineModel(Model):
+    """
+    Simple line model used for benchmarking
+    """
+    m = Parameter(float)
+    b = Parameter(float)
+
+    def predict(self, x):
+        return self.m * x + self.b
+
+
+#
+#   Benchmarks
+#
+
+def write_validated(model, n):
+    """Writes `n` values through the normal, validated, path"""
+    for i in range(n):
+        model.m = 0.5 * i
+    return
+
+
+def write_trusted(model, n):
+    """Writes `n` values within a trusted block"""
+    with model.parameters.trusted():
+        for i in range(n):
+            model.m = 0.5 * i
+    return
+
+
+def main(n=100000, repeat=5):
+    model = LineModel()
+    results = dict()
+    for func in (write_validated, write_trusted):
+        times = timeit.repeat(
+            lambda: func(model, n), number=1, repeat=repeat
+        )
+        results[func.__name__] = min(times)
+        print('%-16s %8.1f ns/write' % (
+            func.__name__, 1e9 * results[func.__name__] / n
+        ))
+    print('speedup          %8.1fx' % (
+        results['write_validated'] / results['write_trusted']
+    ))
+    return
+
+
+if __name__ == '__main__':
+    main()
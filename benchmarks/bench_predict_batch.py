@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for batched model predictions.
+
+Run with:
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_predict_batch.py
+
+"""
+#
+#   Imports
+#
+import time
+
+import numpy as np
+
+from spines import Model
+from spines import Parameter
+
+
+#
+#   Model
+#
+
+class PolyModel(Model):
+    """
+    Polynomial model used for benchmarking
+    """
+    coefs = Parameter(tuple, default=(0.5, -1.0, 2.0, 0.25))
+
+    def predict(self, x):
+        ret = np.zeros_like(x)
+        for c in self.coefs:
+            ret = ret * x + np.sin(c * x)
+        return ret
+
+
+#
+#   Benchmarks
+#
+
+def main(n=20000000):
+    model = PolyModel()
+    x = np.random.default_rng(0).random(n)
+
+    start = time.perf_counter()
+    expected = model.predict(x)
+    print('%-24s %6.3fs' % ('predict', time.perf_counter() - start))
+
+    for executor in ('thread', 'process'):
+        start = time.perf_counter()
+        ret = model.predict_batch(x, chunk_size=1000000, executor=executor)
+        print('%-24s %6.3fs' % (
+            'predict_batch (%s)' % executor, time.perf_counter() - start
+        ))
+        assert np.allclose(ret, expected)
+    return
+
+
+if __name__ == '__main__':
+    main()
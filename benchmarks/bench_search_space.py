@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for vectorized search space sampling.
+
+Run with:
+
+.. code-block:: bash
+
+    $ python benchmarks/bench_search_space.py
+
+"""
+#
+#   Imports
+#
+import time
+
+from spines import HyperBounded
+from spines import HyperChoice
+from spines import HyperIntRange
+from spines import HyperLogBounded
+from spines import Model
+from spines.search import SearchSpace
+
+
+#
+#   Model
+#
+
+class SpaceModel(Model):
+    """
+    Model with a mix of hyper-parameter kinds used for benchmarking
+    """
+    rate = HyperLogBounded(low=1e-5, high=1.0, default=0.1)
+    depth = HyperIntRange(low=1, high=64, default=8)
+    width = HyperIntRange(low=16, high=1024, step=16, default=64)
+    kind = HyperChoice(choices=['a', 'b', 'c', 'd'], default='a')
+    frac = HyperBounded(float, minimum=0.0, maximum=1.0, default=0.5)
+
+    def predict(self, x):
+        return x
+
+
+#
+#   Benchmarks
+#
+
+def main(n=1000000):
+    space = SearchSpace(SpaceModel)
+    for method in ('uniform', 'lhs', 'sobol'):
+        start = time.perf_counter()
+        columns = space.sample(n, method=method, seed=0)
+        sampled = time.perf_counter()
+        valid = space.check(columns)
+        columns = space.unique({k: v[valid] for k, v in columns.items()})
+        done = time.perf_counter()
+        print('%-8s sample %6.3fs  check+unique %6.3fs  (%d unique)' % (
+            method, sampled - start, done - sampled, len(columns['rate'])
+        ))
+    return
+
+
+if __name__ == '__main__':
+    main()
@@ -43,9 +43,11 @@ setup(
     version=versioneer.get_version(),
     cmdclass=versioneer.get_cmdclass(),
     install_requires=[
+        'numpy',
         'parver',
+        'pycodestyle',
         'toml',
-        'xxhash',
+        'xxhash>=2.0',
     ],
     tests_require=[
         'pytest',
@@ -54,6 +56,11 @@ setup(
     setup_requires=[
         'pytest-runner',
     ],
+    entry_points={
+        'console_scripts': [
+            'spines=spines.cli:main',
+        ],
+    },
 
     license='MIT',
     keywords="spines parameterized models",
@@ -10,18 +10,34 @@ del get_versions
 
 from .parameters import Parameter, HyperParameter
 from .parameters import Bounded, HyperBounded
+from .parameters import Choice, HyperChoice
+from .parameters import IntRange, HyperIntRange
+from .parameters import IntervalSet, HyperIntervalSet
+from .parameters import LogBounded, HyperLogBounded
 from . import transforms
 from .model import Model
+from .composites import Ensemble
+from .composites import ModelArray
 from . import utils
 
 __all__ = [
     # Models
     'Model',
+    'Ensemble',
+    'ModelArray',
     # Parameters
     'Parameter',
     'HyperParameter',
     'Bounded',
     'HyperBounded',
+    'Choice',
+    'HyperChoice',
+    'IntRange',
+    'HyperIntRange',
+    'IntervalSet',
+    'HyperIntervalSet',
+    'LogBounded',
+    'HyperLogBounded',
     # Submodules
     'transforms',
     'utils',
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""
+Entry point for running spines as a module (``python -m spines``).
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Command-line interface for the spines package.
+"""
+#
+#   Imports
+#
+import argparse
+import logging
+from typing import List
+
+from . import __version__
+
+
+#
+#   Functions
+#
+
+def main(argv: [List[str], None] = None) -> int:
+    """Runs the ``spines`` command
+
+    Parameters
+    ----------
+    argv : list, optional
+        Command-line arguments to use (default is :obj:`None`, to use
+        :obj:`sys.argv`).
+
+    Returns
+    -------
+    int
+        Exit status of the command.
+
+    """
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if not hasattr(args, 'func'):
+        parser.print_help()
+        return 1
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper()),
+        format='%(asctime)s [%(process)d] %(levelname)s %(message)s',
+    )
+    return args.func(args) or 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Creates the parser for the ``spines`` command's arguments
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        The argument parser, with a sub-parser for each command.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='spines', description='Backbones for parameterized models.'
+    )
+    parser.add_argument(
+        '--version', action='version', version='%(prog)s ' + __version__
+    )
+    parser.add_argument(
+        '--log-level', default='info',
+        choices=('debug', 'info', 'warning', 'error'),
+        help="Level of messages to log (default: %(default)s).",
+    )
+    commands = parser.add_subparsers(title='commands')
+
+    serve = commands.add_parser(
+        'serve', help="Serve predictions from a saved model over HTTP.",
+        description=(
+            "Serve predictions from a saved model archive (or the latest "
+            "archive in a directory) over HTTP, reloading it when a new "
+            "version is saved."
+        ),
+    )
+    serve.add_argument(
+        'path', help="Model archive, or directory of model archives."
+    )
+    serve.add_argument(
+        '--host', default='127.0.0.1',
+        help="Host to listen on (default: %(default)s).",
+    )
+    serve.add_argument(
+        '--port', type=int, default=8000,
+        help="Port to listen on (default: %(default)s).",
+    )
+    serve.add_argument(
+        '--socket', dest='socket_path', default=None,
+        help="Unix socket path to listen on instead of a host and port.",
+    )
+    serve.add_argument(
+        '--workers', type=int, default=None,
+        help=(
+            "Number of worker processes (default: one per CPU, 0 to serve "
+            "from a single process)."
+        ),
+    )
+    serve.add_argument(
+        '--reload-interval', type=float, default=1.0,
+        help=(
+            "Seconds between checks for a new model version, 0 to disable "
+            "(default: %(default)s)."
+        ),
+    )
+    serve.set_defaults(func=_serve)
+
+    return parser
+
+
+def _serve(args: argparse.Namespace) -> int:
+    """Runs the ``serve`` command"""
+    from .serving.server import ModelServer
+
+    server = ModelServer(
+        args.path, host=args.host, port=args.port,
+        socket_path=args.socket_path, workers=args.workers,
+        reload_interval=args.reload_interval or None,
+    )
+    with server:
+        logging.getLogger(__name__).info(
+            "Serving %s on %s", server.source.archive, server.address
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
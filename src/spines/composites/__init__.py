@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+"""
+Composite models subpackage for spines.
+"""
+from .array import ModelArray
+from .ensemble import Ensemble
+
+__all__ = [
+    # Arrays
+    'ModelArray',
+    # Ensembles
+    'Ensemble',
+]
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+Arrays of models of the same class, stored by parameter.
+"""
+#
+#   Imports
+#
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Type
+
+import numpy as np
+
+from ..core.utils import get_class_parameters
+from ..model import Model
+from ..parameters.base import HyperParameter
+from ..parameters.base import Parameter
+
+
+#
+#   Classes
+#
+
+class ModelArray(object):
+    """
+    Array of models of the same class, stored as one column per parameter
+
+    Each of the parameters (and hyper-parameters) declared on the model
+    class is stored as a single numpy array holding its value for every
+    model in the array, so operations over all of the models can be
+    done with a few array operations instead of a call on each model.
+    Subclasses can implement a vectorized :meth:`predict` using the
+    columns (which are available as attributes), for instance::
+
+        class LineModelArray(ModelArray):
+            __model__ = LineModel
+
+            def predict(self, x):
+                return self.m[:, np.newaxis] * x + self.b[:, np.newaxis]
+
+    Columns of numeric parameters (with types :obj:`bool`, :obj:`int`
+    and/or :obj:`float`) are numeric arrays, and the columns of any
+    other parameters are arrays of objects.  Values set on the columns
+    directly are not validated, though they are when set on (or got
+    from) individual models.
+
+    Parameters
+    ----------
+    size : int, optional
+        Initial number of (empty) models in the array (default is 0).
+    model : type, optional
+        The class of the models in the array (default is the class's
+        ``__model__``).
+
+    """
+    __model__ = None
+
+    def __init__(self, size: int = 0, model: [Type[Model], None] = None):
+        if model is None:
+            model = self.__model__
+        if model is None or not issubclass(model, Model):
+            raise TypeError("A Model class is required")
+        self._model = model
+        self._params = get_class_parameters(model, Parameter)
+        self._size = 0
+        self._columns = {
+            k: np.empty(0, dtype=_get_dtype(v))
+            for k, v in self._params.items()
+        }
+        self._set = {k: np.zeros(0, dtype=bool) for k in self._params}
+        self.resize(size)
+        return
+
+    def __repr__(self):
+        return '<%s model=%s size=%s>' % (
+            self.__class__.__name__, self._model.__name__, self._size
+        )
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self) -> Iterator[Model]:
+        for i in range(self._size):
+            yield self[i]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name.startswith('_') or name not in self._params:
+            raise AttributeError(name)
+        return self._columns[name][:self._size]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._get_column(key)
+        elif isinstance(key, (int, np.integer)):
+            return self._get_model(self._get_index(key))
+        ret = self.__class__.__new__(self.__class__)
+        ret.__dict__.update(self.__dict__)
+        ret._columns = {
+            k: v[:self._size][key] for k, v in self._columns.items()
+        }
+        ret._set = {k: v[:self._size][key] for k, v in self._set.items()}
+        ret._size = len(next(iter(ret._set.values()), ()))
+        return ret
+
+    def __setitem__(self, key, value) -> None:
+        if isinstance(key, str):
+            column = self._get_column(key)
+            column[...] = value
+            self._set[key][:self._size] = True
+            return
+        elif not isinstance(key, (int, np.integer)):
+            raise TypeError("Can only set columns and single models")
+        self._set_model(self._get_index(key), value)
+        return
+
+    @property
+    def model(self) -> Type[Model]:
+        """type: The class of the models in this array."""
+        return self._model
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """dict: The column of values for each parameter, by name."""
+        return {k: v[:self._size] for k, v in self._columns.items()}
+
+    @classmethod
+    def from_models(cls, models: Iterable[Model],
+                    model: [Type[Model], None] = None) -> 'ModelArray':
+        """Creates an array of (copies of) the given models
+
+        Parameters
+        ----------
+        models : iterable
+            The models to store in the array.
+        model : type, optional
+            The class of the models (default is the class's
+            ``__model__``, or the class of the first of the `models`).
+
+        Returns
+        -------
+        ModelArray
+            New array of the models' parameter values.
+
+        """
+        models = list(models)
+        if model is None and cls.__model__ is None and models:
+            model = type(models[0])
+        ret = cls(model=model)
+        ret.extend(models)
+        return ret
+
+    def to_models(self) -> List[Model]:
+        """Gets (new) models with the values of each row of the array
+
+        Returns
+        -------
+        list
+            New model instances, one for each row.
+
+        """
+        return list(self)
+
+    def resize(self, size: int) -> None:
+        """Changes the number of models in the array
+
+        New models (rows) have none of their parameters set.
+
+        Parameters
+        ----------
+        size : int
+            The new number of models in the array.
+
+        """
+        if size < 0:
+            raise ValueError("The size can't be negative")
+        self._reserve(size)
+        for v in self._set.values():
+            v[min(size, self._size):] = False
+        self._size = size
+        return
+
+    def append(self, model: Model) -> None:
+        """Adds (a copy of the values of) a model to the end of the array
+
+        Parameters
+        ----------
+        model : Model
+            The model to add.
+
+        """
+        self.extend([model])
+        return
+
+    def extend(self, models: Iterable[Model]) -> None:
+        """Adds (copies of the values of) models to the end of the array
+
+        Parameters
+        ----------
+        models : iterable
+            The models to add.
+
+        """
+        models = list(models)
+        for model in models:
+            self._check_model(model)
+        start = self._size
+        self.resize(start + len(models))
+        stop = self._size
+        values = [self._get_values(m) for m in models]
+        for name, column in self._columns.items():
+            is_set = np.fromiter(
+                (name in v for v in values), dtype=bool, count=len(values)
+            )
+            self._set[name][start:stop] = is_set
+            if not is_set.any():
+                continue
+            column[start:stop][is_set] = _to_column(
+                [v[name] for v in values if name in v], column.dtype
+            )
+        return
+
+    def is_set(self, name: str) -> np.ndarray:
+        """Gets which models have a value set for the given parameter
+
+        Parameters
+        ----------
+        name : str
+            Name of the parameter.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the models with the parameter set.
+
+        """
+        self._get_column(name)
+        return self._set[name][:self._size]
+
+    def predict(self, *args, **kwargs) -> np.ndarray:
+        """Predicts outputs with each of the models
+
+        By default this predicts with each model in turn, subclasses
+        should override it with a vectorized implementation.
+
+        Parameters
+        ----------
+        args
+            Inputs to predict outputs for (with every model).
+        kwargs : optional
+            Additional keyword-arguments to pass to each predict call.
+
+        Returns
+        -------
+        numpy.ndarray
+            Predictions of each model (along the first axis).
+
+        """
+        return np.stack([m.predict(*args, **kwargs) for m in self])
+
+    def _get_column(self, name: str) -> np.ndarray:
+        """Gets the column of values of the given parameter"""
+        if name not in self._columns:
+            raise KeyError(name)
+        return self._columns[name][:self._size]
+
+    def _get_index(self, index: int) -> int:
+        """Gets the (non-negative) index of a row"""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Model index out of range")
+        return int(index)
+
+    def _get_model(self, index: int) -> Model:
+        """Creates a model with the values of the given row"""
+        params, hyper_params = dict(), dict()
+        for name, param in self._params.items():
+            if not self._set[name][index]:
+                continue
+            value = self._columns[name][index]
+            if isinstance(value, np.generic):
+                value = value.item()
+            if isinstance(param, HyperParameter):
+                hyper_params[name] = value
+            else:
+                params[name] = value
+        ret = self._model()
+        if hyper_params:
+            ret.set_hyper_params(**hyper_params)
+        if params:
+            ret.set_params(**params)
+        return ret
+
+    def _set_model(self, index: int, model: Model) -> None:
+        """Sets the values of the given row from a model"""
+        self._check_model(model)
+        values = self._get_values(model)
+        for name, column in self._columns.items():
+            is_set = name in values
+            self._set[name][index] = is_set
+            if is_set:
+                column[index:index + 1] = _to_column(
+                    [values[name]], column.dtype
+                )
+        return
+
+    def _check_model(self, model: Model) -> None:
+        """Checks that a model is of this array's class"""
+        if not isinstance(model, self._model):
+            raise TypeError(
+                "Expected a %s model, got: %s" % (
+                    self._model.__name__, type(model).__name__
+                )
+            )
+        return
+
+    @staticmethod
+    def _get_values(model: Model) -> Dict[str, object]:
+        """Gets all of the parameter values set on a model"""
+        ret = model.parameters.values
+        ret.update(model.hyper_parameters.values)
+        return ret
+
+    def _reserve(self, size: int) -> None:
+        """Grows the columns (geometrically) to fit the given size"""
+        capacity = len(next(iter(self._set.values()), ()))
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 8)
+        for store in (self._columns, self._set):
+            for name, column in store.items():
+                new = np.zeros(capacity, dtype=column.dtype)
+                new[:self._size] = column[:self._size]
+                store[name] = new
+        return
+
+
+#
+#   Functions
+#
+
+def _get_dtype(param: Parameter) -> np.dtype:
+    """Gets the type of array to store a parameter's values in"""
+    types = set(param.value_type)
+    if types == {bool}:
+        return np.dtype(bool)
+    elif types and types <= {bool, int}:
+        return np.dtype(np.int64)
+    elif types and types <= {bool, int, float}:
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+def _to_column(values: List[object], dtype: np.dtype) -> np.ndarray:
+    """Converts values to an array to store in a column"""
+    if dtype.hasobject:
+        ret = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            ret[i] = value
+        return ret
+    return np.asarray(values, dtype=dtype)
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+Ensembles of models, fit in parallel on bootstrap samples of the data.
+"""
+#
+#   Imports
+#
+from functools import partial
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Type
+from uuid import uuid4
+
+import numpy as np
+
+from ..model import Model
+from ..parameters.base import HyperParameter
+from ..parameters.base import Parameter
+from ..parameters.core import HyperChoice
+from ..parameters.core import HyperIntRange
+from ..utils.concurrency import get_executor
+from ..utils.concurrency import get_worker_count
+from ..utils.file import load_arrays
+from ..utils.file import load_shared_pickle
+from ..utils.file import save_arrays
+from ..utils.file import save_pickle
+from ..utils.file import save_shared_pickle
+from ..utils.shared import SharedArray
+from ..utils.shared import share_array
+
+
+#
+#   Variables
+#
+
+_WORKER_DATA = dict()
+
+
+#
+#   Classes
+#
+
+class Ensemble(Model):
+    """
+    Ensemble of models, combining their predictions
+
+    Each member is a clone of the `model` hyper-parameter (or, if it's a
+    list of models, of each of them) fit on its own bootstrap sample of
+    the data.  Members are fit in parallel, with each worker drawing its
+    sample's indices from the `seed` and the member's index, so the data
+    itself is only sent to the workers once (in shared memory, for
+    process pools) and never copied for each member up front.
+
+    Predictions of the members are stacked into one array (with the
+    members along the first axis) and combined with a vectorized
+    `reduce`: the ``'mean'``, ``'median'``, the ``'weighted'`` mean (by
+    the members' `weights`) or the (weighted) majority ``'vote'``.
+
+    Ensembles are saved as a single archive in which arrays with the same
+    contents (e.g. shared by several members) are only stored once.
+    """
+    model = HyperParameter(Model, list)
+    n_members = HyperIntRange(low=1, high=100000, default=10)
+    bootstrap = HyperParameter(bool, default=True)
+    reduce = HyperChoice(
+        choices=['mean', 'median', 'weighted', 'vote'], default='mean'
+    )
+    seed = HyperParameter(int, default=0)
+
+    members = Parameter(list)
+    weights = Parameter(np.ndarray)
+
+    @classmethod
+    def from_models(cls, models: List[Model],
+                    weights: [np.ndarray, None] = None,
+                    **hyper_params) -> 'Ensemble':
+        """Creates an ensemble of already fitted models
+
+        Parameters
+        ----------
+        models : list
+            The (fitted) member models.
+        weights : array_like, optional
+            Weights of each of the members (default is to weight them
+            equally).
+        hyper_params : optional
+            Hyper-parameter values to set on the ensemble.
+
+        Returns
+        -------
+        Ensemble
+            New ensemble of the given models (with the models as the
+            templates to clone when refitting).
+
+        """
+        ret = cls()
+        ret.set_hyper_params(model=list(models), **hyper_params)
+        ret.members = list(models)
+        ret.weights = _get_weights(weights, len(models))
+        return ret
+
+    def fit(self, *data, workers: [int, None] = None,
+            executor: str = 'thread', **kwargs) -> None:
+        """Fits each of the members on a sample of the data, in parallel
+
+        Parameters
+        ----------
+        data : array_like
+            Data to fit on (e.g. the inputs and the outputs), which must
+            all be the same length.
+        workers : int, optional
+            Number of workers to use (default is the number of CPUs
+            available).
+        executor : str, optional
+            Type of worker pool to use, ``'thread'`` (default) or
+            ``'process'``.
+        kwargs : optional
+            Additional keyword-arguments to pass to each member's ``fit``.
+
+        """
+        data = [np.asarray(x) for x in data]
+        if not data:
+            raise ValueError("No data to fit on")
+        if any(len(x) != len(data[0]) for x in data):
+            raise ValueError("The data must all be the same length")
+        templates = self._get_templates()
+        weighted = self.reduce == 'weighted'
+
+        token = uuid4().hex
+        shared = list()
+        try:
+            if executor == 'process':
+                data = [share_array(x, shared) for x in data]
+            pool = get_executor(
+                executor, min(get_worker_count(workers), len(templates)),
+                initializer=_initialize, initargs=(
+                    token, templates, tuple(data), self.bootstrap, self.seed
+                )
+            )
+            with pool:
+                results = list(pool.map(
+                    _fit_member, [token] * len(templates),
+                    range(len(templates)), [weighted] * len(templates),
+                    [kwargs] * len(templates)
+                ))
+        finally:
+            for x in shared:
+                x.unlink()
+            _WORKER_DATA.pop(token, None)
+
+        members = [member for member, _ in results]
+        errors = [error for _, error in results]
+        weights = None
+        if weighted and all(x is not None for x in errors):
+            weights = 1.0 / np.maximum(errors, np.finfo(float).tiny)
+        self.members = members
+        self.weights = _get_weights(weights, len(members))
+        return
+
+    def predict(self, *args, **kwargs):
+        """Predicts outputs by combining the members' predictions
+
+        Parameters
+        ----------
+        args
+            Inputs to predict outputs for.
+        kwargs : optional
+            Additional keyword-arguments to pass to each member's
+            ``predict`` (see :meth:`predict_members`).
+
+        Returns
+        -------
+        numpy.ndarray
+            The combined predictions.
+
+        """
+        return self.reduce_predictions(self.predict_members(*args, **kwargs))
+
+    def predict_members(self, *args, workers: int = 1,
+                        executor: str = 'thread', **kwargs) -> np.ndarray:
+        """Gets the predictions of each member, stacked
+
+        Parameters
+        ----------
+        args
+            Inputs to predict outputs for.
+        workers : int, optional
+            Number of workers to predict with (default is 1, predicting
+            with each member in turn).
+        executor : str, optional
+            Type of worker pool to use (when using more than one
+            worker), ``'thread'`` (default) or ``'process'``.
+        kwargs : optional
+            Additional keyword-arguments to pass to each member's
+            ``predict``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Predictions of each of the members (along the first axis).
+
+        """
+        members = self.members
+        if workers == 1:
+            predictions = (m.predict(*args, **kwargs) for m in members)
+        else:
+            pool = get_executor(executor, workers)
+            with pool:
+                predictions = list(pool.map(
+                    _predict_member, members, [args] * len(members),
+                    [kwargs] * len(members)
+                ))
+        ret = None
+        for i, prediction in enumerate(predictions):
+            prediction = np.asarray(prediction)
+            if ret is None:
+                ret = np.empty(
+                    (len(members),) + prediction.shape, prediction.dtype
+                )
+            ret[i] = prediction
+        return ret
+
+    def reduce_predictions(
+        self, predictions: np.ndarray,
+        reduce: [str, Callable, None] = None
+    ) -> np.ndarray:
+        """Combines the stacked predictions of the members
+
+        Parameters
+        ----------
+        predictions : numpy.ndarray
+            Predictions of each member (along the first axis).
+        reduce : str or callable, optional
+            Reduction to use (default is the `reduce` hyper-parameter),
+            or a function taking the stacked predictions and the
+            members' weights.
+
+        Returns
+        -------
+        numpy.ndarray
+            The combined predictions.
+
+        """
+        if reduce is None:
+            reduce = self.reduce
+        if callable(reduce):
+            return reduce(predictions, self.weights)
+        elif reduce == 'mean':
+            return predictions.mean(axis=0)
+        elif reduce == 'median':
+            return np.median(predictions, axis=0)
+        elif reduce == 'weighted':
+            weights = self.weights
+            return np.tensordot(weights, predictions, axes=1) / weights.sum()
+        elif reduce == 'vote':
+            return _vote(predictions, self.weights)
+        raise ValueError("Unknown reduction: %s" % reduce)
+
+    def _get_templates(self) -> List[Model]:
+        """Gets the (unfitted) models to fit as each member"""
+        model = self.model
+        if isinstance(model, list):
+            if not model:
+                raise ValueError("At least one model is required")
+            return [x.clone() for x in model]
+        return [model.clone() for _ in range(self.n_members)]
+
+    def _save_helper(self, dir_path: str) -> List[str]:
+        """Saves the ensemble, storing duplicate arrays once"""
+        arrays = dict()
+        ret = [
+            save_pickle(self.__class__, dir_path, 'class'),
+            save_shared_pickle(self._params, arrays, dir_path, 'parameters'),
+            save_shared_pickle(
+                self._hyper_params, arrays, dir_path, 'hyperparameters'
+            ),
+        ]
+        ret.append(save_arrays(arrays, dir_path, 'arrays'))
+        return ret
+
+    @classmethod
+    def _load_helper(
+        cls, dir_path: str, new: bool, load: [Callable, None] = None
+    ) -> 'Ensemble':
+        """Helper function for loading an Ensemble from file"""
+        if load is None:
+            load = partial(
+                load_shared_pickle, load_arrays(dir_path, 'arrays')
+            )
+        return super(Ensemble, cls)._load_helper(dir_path, new, load=load)
+
+
+#
+#   Functions
+#
+
+def _get_weights(weights: [np.ndarray, None], n: int) -> np.ndarray:
+    """Gets the (validated) weights of each member"""
+    if weights is None:
+        return np.ones(n)
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (n,):
+        raise ValueError("There must be one weight for each member")
+    return weights
+
+
+def _vote(predictions: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Gets the (weighted) most common prediction for each output"""
+    labels, index = np.unique(predictions, return_inverse=True)
+    index = index.reshape(len(predictions), -1)
+    n = index.shape[1]
+    counts = np.bincount(
+        (index * n + np.arange(n)).ravel(),
+        weights=np.repeat(weights, n), minlength=len(labels) * n
+    ).reshape(len(labels), n)
+    return labels[counts.argmax(axis=0)].reshape(predictions.shape[1:])
+
+
+def _initialize(token: str, templates: List[Model], data: Tuple,
+                bootstrap: bool, seed: int) -> None:
+    """Initializes a worker with the models and data to fit"""
+    _WORKER_DATA[token] = {
+        'templates': templates, 'data': data, 'bootstrap': bootstrap,
+        'seed': seed,
+    }
+    return
+
+
+def _fit_member(token: str, index: int, weighted: bool,
+                kwargs: dict) -> Tuple[Model, [float, None]]:
+    """Fits a member on its sample of the data (and gets its error)"""
+    state = _WORKER_DATA[token]
+    data = [
+        x.array if isinstance(x, SharedArray) else x for x in state['data']
+    ]
+    model = state['templates'][index].clone()
+    if not state['bootstrap']:
+        model.fit(*data, **kwargs)
+        return model, None
+
+    n = len(data[0])
+    rng = np.random.default_rng((state['seed'], index))
+    sample = rng.integers(0, n, n)
+    model.fit(*[x[sample] for x in data], **kwargs)
+
+    error = None
+    if weighted:
+        unused = np.bincount(sample, minlength=n) == 0
+        if unused.any():
+            error = model.error(*[x[unused] for x in data])
+        if error is not None:
+            error = float(np.mean(error))
+    return model, error
+
+
+def _predict_member(model: Type[Model], args: Tuple,
+                    kwargs: Dict[str, object]):
+    """Gets a member's predictions"""
+    return model.predict(*args, **kwargs)
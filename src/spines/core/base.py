@@ -7,9 +7,11 @@ Base classes for core spines library.
 #
 from abc import ABC
 import tempfile
+from typing import Callable
 from typing import List
 from typing import Type
 
+from ..parameters.base import HyperParameter
 from ..parameters.base import Parameter
 from ..parameters.store import ParameterStore
 from ..utils.file import extract_archive
@@ -17,6 +19,7 @@ from ..utils.file import save_archive
 from ..utils.file import save_pickle
 from ..utils.file import load_pickle
 from .decorators import override
+from .utils import get_class_parameters
 from .utils import get_overridden_methods
 
 
@@ -33,7 +36,7 @@ class BaseObject(ABC):
 
     def __init__(self, *args, **kwargs):
         self._params = self._create_store(
-            self.__param_store__, Parameter
+            self.__param_store__, Parameter, exclude=HyperParameter
         )
         self._modify_methods()
         return
@@ -47,6 +50,20 @@ class BaseObject(ABC):
             ', '.join(sorted(self.parameters.keys()))
         )
 
+    def __getstate__(self) -> dict:
+        # Methods modified on creation (see _modify_methods) are bound to
+        # this instance, so they're re-created when unpickled instead
+        cls = type(self)
+        return {
+            k: v for k, v in self.__dict__.items()
+            if not (callable(v) and hasattr(cls, k))
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._modify_methods()
+        return
+
     @property
     def parameters(self) -> Type[ParameterStore]:
         """ParameterStore: Parameters in this object."""
@@ -136,6 +153,18 @@ class BaseObject(ABC):
         """
         return self._params.pop(name)
 
+    def clone(self) -> Type['BaseObject']:
+        """Creates a new, unfitted, copy of this object
+
+        Returns
+        -------
+        BaseObject
+            New instance of this object's class (without any of this
+            object's parameter values).
+
+        """
+        return self.__class__()
+
     def save(
         self, path: [None, str] = None, fmt: [None, str] = None
     ) -> str:
@@ -209,15 +238,38 @@ class BaseObject(ABC):
             return cls._load_helper(tmp_dir, new)
 
     @classmethod
-    def _load_helper(cls, dir_path: str, new: bool) -> Type['BaseObject']:
-        """Loads the various files into a new object"""
+    def _load_helper(
+        cls, dir_path: str, new: bool, load: [Callable, None] = None
+    ) -> Type['BaseObject']:
+        """Loads the various files into a new object
+
+        The `load` function, if given, is used instead of
+        :func:`load_pickle` to load the saved parameter stores.
+
+        """
         if new:
             instance = cls()
         else:
             instance = load_pickle(dir_path, 'class')()
-        instance._params = load_pickle(dir_path, 'parameters')
+        instance._load_store(
+            instance._params, dir_path, 'parameters', load=load
+        )
         return instance
 
+    @staticmethod
+    def _load_store(
+        store: Type[ParameterStore], dir_path: str, name: str,
+        load: [Callable, None] = None
+    ) -> None:
+        """Loads saved parameter values into an existing store"""
+        if load is None:
+            load = load_pickle
+        loaded = load(dir_path, name)
+        store.update(loaded.values)
+        if loaded.final:
+            store.finalize()
+        return
+
     def _get_file_path(self) -> str:
         """Gets the default file path for saving to"""
         pass
@@ -228,12 +280,13 @@ class BaseObject(ABC):
         return
 
     @classmethod
-    def _create_store(cls, store_cls, param_cls) -> Type[ParameterStore]:
+    def _create_store(
+        cls, store_cls, param_cls, exclude=None
+    ) -> Type[ParameterStore]:
         """Creates and instance of the parameter store"""
         store = store_cls()
-        for attr in cls.__dict__.values():
-            if isinstance(attr, param_cls):
-                store.add(attr)
+        for attr in get_class_parameters(cls, param_cls, exclude).values():
+            store.add(attr)
         return store
 
     def _mark_overridden_methods(self) -> None:
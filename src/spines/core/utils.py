@@ -5,8 +5,11 @@ Utilities for the spines core classes.
 #
 #   Imports
 #
+from typing import Dict
 from typing import Type
 
+from ..parameters.base import Parameter
+
 
 #
 #   Functions
@@ -33,3 +36,34 @@ def get_overridden_methods(cls: type, obj: Type['spines.base.BaseObject']):
         m for m in common if cls.__dict__[m] != obj.__class__.__dict__[m]
         and callable(cls.__dict__[m])
     ]
+
+
+def get_class_parameters(
+    cls: type, param_cls: type = Parameter, exclude: [type, None] = None
+) -> Dict[str, Parameter]:
+    """Gets the parameters declared on a class (and its bases)
+
+    Parameters
+    ----------
+    cls : type
+        Class to get the declared parameters of.
+    param_cls : type, optional
+        The type of parameters to get (default is :class:`Parameter`).
+    exclude : type, optional
+        Type (or tuple of types) of parameters to exclude, if any.
+
+    Returns
+    -------
+    :obj:`dict` of :obj:`str`, :obj:`Parameter`
+        Parameter names and specifications declared for the `cls`.
+
+    """
+    ret = dict()
+    for klass in reversed(cls.__mro__):
+        for k, v in vars(klass).items():
+            if (isinstance(v, param_cls)
+                    and not (exclude and isinstance(v, exclude))):
+                ret[k] = v
+            elif k in ret:
+                del ret[k]
+    return ret
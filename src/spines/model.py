@@ -6,17 +6,28 @@ Model class for the spines package.
 #   Imports
 #
 from abc import abstractmethod
+from copy import deepcopy
+from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import Tuple
 from typing import Type
 
+import numpy as np
+
 from .decorators import negate
 from .parameters.base import HyperParameter
 from .parameters.decorators import finalize_post
 from .parameters.decorators import finalize_pre
 from .parameters.store import ParameterStore
+from .training.core import Trainer
+from .training.core import TrainingResult
+from .training.stopping import StoppingCriterion
 from .transforms.base import Transform
-from .utils.file import load_pickle
+from .utils.batching import map_chunks
+from .utils.batching import map_stream
 from .utils.file import save_pickle
 
 
@@ -29,6 +40,7 @@ class Model(Transform):
     Spines primary Model class
     """
     __hyperparam_store__ = ParameterStore
+    _memo_method = 'predict'
 
     def __init__(self, *args, **kwargs):
         self._hyper_params = self._create_store(
@@ -130,14 +142,29 @@ class Model(Transform):
         """
         return self._hyper_parameters.pop(name)
 
+    def clone(self) -> Type['Model']:
+        """Creates a new, unfitted, copy of this model
+
+        Returns
+        -------
+        Model
+            New instance of this model's class with the same
+            hyper-parameter values (but none of the fitted parameter
+            values).
+
+        """
+        ret = super(Model, self).clone()
+        ret.set_hyper_params(**self.get_hyper_params())
+        return ret
+
     def fit(self, *args, **kwargs) -> [None, Dict]:
         """Fits the model
 
         Generally this method is used for a single iteration of model
         fitting (and for simple models this may be the only call
-        which is required).  The :obj:`train` method can call this
-        function multiple times and update the model iteratively (where
-        that approach is appropriate).
+        which is required).  For data too large to fit in memory at
+        once, models can implement :obj:`partial_fit` and be fitted on
+        chunks of the data with :obj:`train`.
 
         Parameters
         ----------
@@ -155,29 +182,197 @@ class Model(Transform):
 
         See Also
         --------
-        train, transform
+        partial_fit, train, transform
 
         """
         return super().fit(*args, **kwargs)
 
-    def train(self, *args, **kwargs) -> None:
-        """Trains the model, iteratively
+    def warm_start(
+        self, params: Dict[str, object],
+        hyper_params: [Dict[str, object], None] = None
+    ) -> None:
+        """Initializes the model from a previously fitted model
 
-        This is the main training routine method for the model class.
-        It's generally used for training models such as neural networks
-        where you'll want to iteratively update the model (via ``fit``
-        calls), potentially based on different hyper-parameter settings.
+        Called (before fitting) to seed this model with the fitted
+        parameters of a model with similar hyper-parameters, so that
+        iterative models can start from a nearby solution.  By default
+        the values of any of the given parameters which this model has
+        are set, models whose parameters depend on their hyper-parameters
+        (e.g. in shape) should override this to adapt them.  Values are
+        copied, so fitting in-place doesn't modify the other model's.
+
+        Parameters
+        ----------
+        params : dict
+            Fitted parameter values of the other model.
+        hyper_params : dict, optional
+            Hyper-parameter values the other model was fitted with.
+
+        See Also
+        --------
+        fit, train
+
+        """
+        self._params.update({
+            k: deepcopy(v) for k, v in params.items()
+            if k in self._params.parameters
+        })
+        return
+
+    def partial_fit(self, *args, **kwargs) -> [None, Dict]:
+        """Fits the model incrementally on a single chunk of data
+
+        Implemented by models which can be fitted on data in pieces (e.g.
+        data too large to fit in memory), each call should update the
+        model's parameters using only the given chunk.  Used by
+        :meth:`train` to fit the model on each chunk of a data source
+        in turn.
+
+        During training the model's parameters are only validated and
+        finalized at the end of each epoch, so values set here are
+        stored as-is.
 
         Parameters
         ----------
         args : optional
-            Arguments to use in train call.
+            The chunk of data (e.g. inputs and outputs) to fit on.
+        kwargs : optional
+            Any additional keyword arguments given to :meth:`train`.
+
+        Returns
+        -------
+        :obj:`None` or :obj:`dict`
+            Either returns `None` if adjustments to the model's
+            parameters happen internally, otherwise returns the
+            dictionary of updated parameters to apply.
+
+        Raises
+        ------
+        NotImplementedError
+            If the model doesn't support incremental fitting.
+
+        See Also
+        --------
+        fit, train
+
+        """
+        raise NotImplementedError(
+            "%s doesn't support incremental fitting" % self.__class__.__name__
+        )
+
+    def train(
+        self, data, epochs: int = 1, chunk_size: [int, None] = None,
+        prefetch: int = 1, validation: [Tuple, None] = None,
+        stopping: [StoppingCriterion, List[StoppingCriterion], None] = None,
+        eval_every: int = 1, restore_best: bool = True,
+        checkpoint: [str, None] = None, checkpoint_every: [int, None] = None,
+        checkpoint_interval: [float, None] = None,
+        resume: [str, bool, None] = None, **kwargs
+    ) -> TrainingResult:
+        """Trains the model, iteratively, on chunks of data
+
+        This is the main training routine method for the model class.
+        The `data` is streamed in chunks (with the next chunks read on a
+        background thread) and the model is updated with a
+        :meth:`partial_fit` call for each, so the data never needs to fit
+        in memory at once.  Models which don't implement
+        :meth:`partial_fit` are updated with a :meth:`fit` call for each
+        chunk instead (so, for models whose ``fit`` is a single iterative
+        step, this is the training loop).
+
+        Parameters
+        ----------
+        data
+            The data to train on: a :class:`spines.training.DataSource`,
+            an array or tuple of arrays (which may be memory-mapped), a
+            path (or tuple of paths) to ``.npy`` files, a path to a
+            ``.csv`` file or a function (or iterable) generating chunks.
+        epochs : int, optional
+            Number of passes to make over the data (default is 1).
+        chunk_size : int, optional
+            Maximum number of rows in each chunk (default is 10000).
+        prefetch : int, optional
+            Number of chunks to read ahead on a background thread
+            (default is 1), or 0 to read them in the calling thread.
+        validation : tuple, optional
+            Data (e.g. inputs and outputs) to evaluate the model's
+            :meth:`error` on, every `eval_every` steps.
+        stopping : StoppingCriterion or list, optional
+            Criteria for stopping training early (see
+            :mod:`spines.training.stopping`).
+        eval_every : int, optional
+            Number of steps between evaluations (default is 1).
+        restore_best : bool, optional
+            Whether or not to restore the parameters with the lowest
+            validation error at the end of training (default is
+            :obj:`True`).
+        checkpoint : str, optional
+            Path to save checkpoints of the training run to (at the end
+            of each epoch, and at the given intervals), which are
+            written atomically.
+        checkpoint_every : int, optional
+            Number of steps between checkpoints (within an epoch).
+        checkpoint_interval : float, optional
+            Time (in seconds) between checkpoints (within an epoch).
+        resume : str or bool, optional
+            Path of a checkpoint to continue training from, or
+            :obj:`True` to continue from the `checkpoint` (if one has
+            been saved, otherwise training starts from the beginning).
         kwargs : optional
-            Any additional keyword arguments to use in the train call.
+            Any additional keyword arguments to use in each
+            :meth:`partial_fit` (or :meth:`fit`) call.
+
+        Returns
+        -------
+        TrainingResult
+            Summary of the training run.
+
+        See Also
+        --------
+        fit, partial_fit
+
+        """
+        trainer = Trainer(
+            epochs=epochs, chunk_size=chunk_size, prefetch=prefetch,
+            validation=validation, stopping=stopping, eval_every=eval_every,
+            restore_best=restore_best, checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+            checkpoint_interval=checkpoint_interval
+        )
+        return trainer.train(self, data, resume=resume, **kwargs)
+
+    def get_train_state(self):
+        """Gets the model's training state, other than its parameters
+
+        Models with state used while training which isn't stored in
+        their parameters (e.g. an optimizer's moment estimates, or their
+        own random number generator) should override this, along with
+        :meth:`set_train_state`, so that it's saved in (and restored
+        from) training checkpoints.
+
+        Returns
+        -------
+        object
+            The (picklable) training state, by default :obj:`None`.
+
+        See Also
+        --------
+        set_train_state, train
+
+        """
+        return None
+
+    def set_train_state(self, state) -> None:
+        """Restores the model's training state
+
+        Parameters
+        ----------
+        state : object
+            Training state to restore (from :meth:`get_train_state`).
 
         See Also
         --------
-        fit
+        get_train_state, train
 
         """
         return
@@ -219,6 +414,81 @@ class Model(Transform):
         """
         pass
 
+    def predict_batch(
+        self, data, chunk_size: [int, None] = None,
+        workers: [int, None] = None, executor: str = 'thread', **kwargs
+    ) -> np.ndarray:
+        """Predicts outputs for a large array of inputs in parallel chunks
+
+        Parameters
+        ----------
+        data : array_like
+            Inputs to predict outputs for.
+        chunk_size : int, optional
+            Number of rows in each chunk (default is to use four chunks
+            per worker).
+        workers : int, optional
+            Number of workers to use (default is the number of CPUs
+            available).
+        executor : str, optional
+            Type of worker pool to use, ``'thread'`` (default) or
+            ``'process'``.
+        kwargs : optional
+            Additional keyword arguments to pass to each predict call.
+
+        Returns
+        -------
+        numpy.ndarray
+            Predictions for all of the inputs, in order.
+
+        See Also
+        --------
+        predict, transform_batch
+
+        """
+        return map_chunks(
+            self.predict, data, chunk_size=chunk_size, workers=workers,
+            executor=executor, **kwargs
+        )
+
+    def predict_stream(
+        self, iterable: Iterable, batch_size: int = 1024,
+        read_ahead: int = 0, collate: [Callable, None] = np.asarray,
+        **kwargs
+    ) -> Iterator:
+        """Predicts outputs for a stream of inputs in batches
+
+        Parameters
+        ----------
+        iterable : iterable
+            Inputs to predict outputs for (e.g. from a generator).
+        batch_size : int, optional
+            Maximum number of inputs in each batch (default is 1024).
+        read_ahead : int, optional
+            Number of batches to read ahead on a background thread, to
+            overlap reading the inputs with predicting (default is 0).
+        collate : callable, optional
+            Function to combine each batch of inputs into the input for
+            :meth:`predict` (default is :func:`numpy.asarray`), or
+            :obj:`None` to pass the list of inputs.
+        kwargs : optional
+            Additional keyword arguments to pass to each predict call.
+
+        Yields
+        ------
+        object
+            The prediction for each input, in order.
+
+        See Also
+        --------
+        predict, transform_stream
+
+        """
+        return map_stream(
+            self.predict, iterable, batch_size=batch_size,
+            read_ahead=read_ahead, collate=collate, **kwargs
+        )
+
     def error(self, *args, **kwargs) -> float:
         """Returns the error measure of the model for the given data
 
@@ -237,6 +507,150 @@ class Model(Transform):
         """
         return
 
+    def loss(self, outputs, predictions) -> np.ndarray:
+        """Returns the loss of each of the model's predictions
+
+        Models whose :meth:`error` is the mean of a loss over the outputs
+        should implement this, so that :meth:`error_many` (and
+        :meth:`score_many`) can be computed with a single call to
+        :meth:`predict`.
+
+        Parameters
+        ----------
+        outputs : array_like
+            The actual outputs.
+        predictions : array_like
+            The model's predictions of the `outputs`.
+
+        Returns
+        -------
+        numpy.ndarray
+            Loss for each of the outputs (along the first axis).
+
+        """
+        raise NotImplementedError
+
+    def error_many(
+        self, *data, segments: [np.ndarray, None] = None,
+        loss: [Callable, None] = None, **kwargs
+    ) -> np.ndarray:
+        """Returns the error of the model on each of many segments of data
+
+        The segments are given either as a single list of segments (each
+        a tuple of the inputs and outputs, like the arguments to
+        :meth:`error`), or as the inputs and outputs of all of the
+        segments along with the segment id of each row.
+
+        For models implementing :meth:`loss` (or given a `loss`) the
+        segments are predicted together, with a single :meth:`predict`
+        call, and the error of each is the mean of the loss over its
+        rows.  Otherwise, :meth:`error` is called for each segment.
+
+        Parameters
+        ----------
+        data
+            Either a list of segments, or the inputs and outputs for all
+            of the segments.
+        segments : array_like, optional
+            Segment id of each row of the `data` (if not a list of
+            segments).
+        loss : callable, optional
+            Function taking the outputs and predictions and returning
+            the loss of each (default is :meth:`loss`).
+        kwargs : optional
+            Additional keyword-arguments to pass to each predict (or
+            error) call.
+
+        Returns
+        -------
+        numpy.ndarray
+            Error of each segment, in the order given (or, if given
+            segment ids, in the order of the sorted unique ids).
+
+        See Also
+        --------
+        error, score_many
+
+        """
+        if loss is None and hasattr(self.loss, '__is_overridden'):
+            loss = self.loss
+        if segments is None:
+            if len(data) != 1:
+                raise ValueError(
+                    "Requires either a list of segments, or the data and"
+                    " the segment ids of each row"
+                )
+            parts = [tuple(x) for x in data[0]]
+            if loss is None:
+                return np.array(
+                    [self.error(*x, **kwargs) for x in parts], dtype=float
+                )
+            if not parts:
+                return np.empty(0)
+            index = np.repeat(
+                np.arange(len(parts)), [len(x[-1]) for x in parts]
+            )
+            data = tuple(
+                np.concatenate([x[i] for x in parts])
+                for i in range(len(parts[0]))
+            )
+            n = len(parts)
+        else:
+            data = tuple(np.asarray(x) for x in data)
+            _, index = np.unique(segments, return_inverse=True)
+            index = index.ravel()
+            n = index.max() + 1 if len(index) else 0
+            if loss is None:
+                order = np.argsort(index, kind='stable')
+                bounds = np.cumsum(np.bincount(index, minlength=n))[:-1]
+                return np.array([
+                    self.error(*[x[rows] for x in data], **kwargs)
+                    for rows in np.split(order, bounds)
+                ], dtype=float)
+
+        *inputs, outputs = data
+        losses = np.asarray(
+            loss(outputs, self.predict(*inputs, **kwargs)), dtype=float
+        ).reshape(len(outputs), -1).mean(axis=1)
+        totals = np.bincount(index, weights=losses, minlength=n)
+        return totals / np.bincount(index, minlength=n)
+
+    def score_many(
+        self, *data, segments: [np.ndarray, None] = None,
+        loss: [Callable, None] = None, **kwargs
+    ) -> np.ndarray:
+        """Returns the score of the model on each of many segments of data
+
+        The score of each segment is its (negated) error, see
+        :meth:`error_many` for the details.
+
+        Parameters
+        ----------
+        data
+            Either a list of segments, or the inputs and outputs for all
+            of the segments.
+        segments : array_like, optional
+            Segment id of each row of the `data` (if not a list of
+            segments).
+        loss : callable, optional
+            Function taking the outputs and predictions and returning
+            the loss of each (default is :meth:`loss`).
+        kwargs : optional
+            Additional keyword-arguments to pass to each predict (or
+            error) call.
+
+        Returns
+        -------
+        numpy.ndarray
+            Score of each segment.
+
+        See Also
+        --------
+        score, error_many
+
+        """
+        return -self.error_many(*data, segments=segments, loss=loss, **kwargs)
+
     def _save_helper(self, dir_path: str) -> List[str]:
         """Saves Model objects to the specified directory"""
         ret = super(Model, self)._save_helper(dir_path)
@@ -246,18 +660,29 @@ class Model(Transform):
         return ret
 
     @classmethod
-    def _load_helper(cls, dir_path: str, new: bool) -> Type['Model']:
+    def _load_helper(
+        cls, dir_path: str, new: bool, load: [Callable, None] = None
+    ) -> Type['Model']:
         """Helper function for loading a Model from file"""
-        instance = super(Model, cls)._load_helper(dir_path, new)
-        instance._hyper_params = load_pickle(dir_path, 'hyperparameters')
+        instance = super(Model, cls)._load_helper(dir_path, new, load=load)
+        instance._load_store(
+            instance._hyper_params, dir_path, 'hyperparameters', load=load
+        )
         return instance
 
+    def _memo_stores(self) -> List[ParameterStore]:
+        """Gets the parameter stores the memoized results depend on"""
+        ret = super(Model, self)._memo_stores()
+        ret.append(self._hyper_params)
+        return ret
+
     def _modify_methods(self, *args, **kwargs):
         """Modifies the model's functions in-place on object creation"""
         super(Model, self)._modify_methods(*args, **kwargs)
 
         self.fit = finalize_pre(self.fit, self._hyper_params)
         self.fit = finalize_post(self.fit, self._params)
+        self.partial_fit = finalize_pre(self.partial_fit, self._hyper_params)
 
         if (hasattr(self.error, '__is_overridden')
                 and not hasattr(self.score, '__is_overridden')):
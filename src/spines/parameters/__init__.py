@@ -7,7 +7,16 @@ from .base import HyperParameter
 from .base import InvalidParameterException
 from .base import MissingParameterException
 from .core import Bounded
+from .core import Choice
 from .core import HyperBounded
+from .core import HyperChoice
+from .core import HyperIntRange
+from .core import HyperIntervalSet
+from .core import HyperLogBounded
+from .core import IntRange
+from .core import IntervalSet
+from .core import LogBounded
+from .store import ConcurrentParameterStore
 from .store import ParameterStore
 
 __all__ = [
@@ -16,8 +25,17 @@ __all__ = [
     'HyperParameter',
     'Bounded',
     'HyperBounded',
+    'Choice',
+    'HyperChoice',
+    'IntRange',
+    'HyperIntRange',
+    'IntervalSet',
+    'HyperIntervalSet',
+    'LogBounded',
+    'HyperLogBounded',
     # Parameter store
     'ParameterStore',
+    'ConcurrentParameterStore',
     # Exceptions
     'InvalidParameterException',
     'MissingParameterException',
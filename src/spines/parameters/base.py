@@ -6,6 +6,7 @@ Base classes for model parameters.
 #   Imports
 #
 from abc import ABC
+from typing import Callable
 from typing import Type
 
 
@@ -23,12 +24,21 @@ class Parameter(object):
         The type(s) of values allowed for this parameter.
     default : object, optional
         Default value for this parameter, if any.
+    default_factory : callable, optional
+        Zero-argument callable used to create the default value for this
+        parameter, if any.  It's called separately for each parameter
+        store which needs the default value (so defaults created this
+        way are not shared between instances).  Cannot be used with
+        `default`.
     desc : str, optional
         Description for this parameter, if any.
 
     """
 
-    def __init__(self, *value_type, default=None, desc: str = None):
+    def __init__(
+        self, *value_type, default=None, default_factory: Callable = None,
+        desc: str = None
+    ):
         self._name = None
         self._desc = desc
 
@@ -36,8 +46,17 @@ class Parameter(object):
             raise TypeError('Must use types when setting this value')
         self._value_types = value_type
 
+        if default_factory is not None:
+            if default is not None:
+                raise ValueError(
+                    'Cannot specify both default and default_factory'
+                )
+            if not callable(default_factory):
+                raise ValueError('The default_factory must be callable')
+        self._default_factory = default_factory
+
         if default is None:
-            self._required = True
+            self._required = default_factory is None
         else:
             if not isinstance(default, self.value_type):
                 raise TypeError(
@@ -105,6 +124,11 @@ class Parameter(object):
         """object: Default value to use for this parameter."""
         return self._default
 
+    @property
+    def default_factory(self) -> [Callable, None]:
+        """callable: Factory used to create default values, if any."""
+        return self._default_factory
+
     @property
     def required(self) -> bool:
         """bool: Whether or not this parameter is required to be set."""
@@ -180,6 +204,25 @@ class Parameter(object):
                 pass
         return value
 
+    def create_default(self):
+        """Creates the default value to use for this parameter
+
+        Returns
+        -------
+        object
+            A new value from this parameter's `default_factory`, if set,
+            otherwise this parameter's `default` value.
+
+        Raises
+        ------
+        InvalidParameterException
+            If the value created by the `default_factory` is not valid.
+
+        """
+        if self._default_factory is None:
+            return self._default
+        return self(self._default_factory())
+
     def _check_helper(self, value, raise_exceptions=True) -> bool:
         """Helper function for checking if a value is valid"""
         if not isinstance(value, self.value_type):
@@ -201,6 +244,10 @@ class Parameter(object):
             ret.append('required')
         if self.default:
             ret.append('default=%s' % self.default)
+        if self.default_factory is not None:
+            ret.append('default_factory=%s' % getattr(
+                self.default_factory, '__name__', self.default_factory
+            ))
         return ret
 
 
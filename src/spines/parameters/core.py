@@ -26,3 +26,61 @@ class HyperBounded(mixins.Minimum, mixins.Maximum, HyperParameter):
     Bounded hyper-parameter (min/max)
     """
     pass
+
+
+class Choice(mixins.Choices, Parameter):
+    """
+    Categorical parameter (one of a set of choices)
+    """
+    pass
+
+
+class HyperChoice(mixins.Choices, HyperParameter):
+    """
+    Categorical hyper-parameter (one of a set of choices)
+    """
+    pass
+
+
+class LogBounded(mixins.LogScale, mixins.Low, mixins.High, Parameter):
+    """
+    Positive, bounded parameter on a log-scale (low/high)
+    """
+    pass
+
+
+class HyperLogBounded(
+    mixins.LogScale, mixins.Low, mixins.High, HyperParameter
+):
+    """
+    Positive, bounded hyper-parameter on a log-scale (low/high)
+    """
+    pass
+
+
+class IntRange(mixins.Step, mixins.Low, mixins.High, Parameter):
+    """
+    Stepped range parameter (low/high/step)
+    """
+    pass
+
+
+class HyperIntRange(mixins.Step, mixins.Low, mixins.High, HyperParameter):
+    """
+    Stepped range hyper-parameter (low/high/step)
+    """
+    pass
+
+
+class IntervalSet(mixins.Intervals, Parameter):
+    """
+    Parameter in a set of intervals
+    """
+    pass
+
+
+class HyperIntervalSet(mixins.Intervals, HyperParameter):
+    """
+    Hyper-parameter in a set of intervals
+    """
+    pass
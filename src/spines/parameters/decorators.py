@@ -16,6 +16,10 @@ from typing import Type
 def state_changed(func):
     """Decorator indicating a function which changes the state
 
+    The wrapped call is run as part of a batch of changes on the store,
+    so subscribers are notified of the changes once the (outermost)
+    call completes.
+
     Parameters
     ----------
     func : callable
@@ -29,8 +33,9 @@ def state_changed(func):
     """
     @wraps(func)
     def wrapped(self, *args, **kwargs):
-        ret = func(self, *args, **kwargs)
-        self._finalized = False
+        with self.batch():
+            ret = func(self, *args, **kwargs)
+            self._finalized = False
         return ret
     return wrapped
 
@@ -5,6 +5,7 @@ Parameter factory functions
 #
 #   Imports
 #
+from .base import InvalidParameterException
 from .base import ParameterMixin
 
 
@@ -27,7 +28,8 @@ def bound_mixin(name, checker, cls_name=None):
 
     The call should return True when the value is within the boundary and False
     when it's not.  The `checker` doesn't necessarily have to be a function,
-    it just needs to be callable.
+    it just needs to be callable.  The check is skipped if the boundary is not
+    set (i.e. is :obj:`None`).
 
     Parameters
     ----------
@@ -79,19 +81,28 @@ def bound_mixin(name, checker, cls_name=None):
 
             super(_NewBoundMixin, self).__init__(*args, **kwargs)
 
-            if prop_val:
+            if prop_val is not None:
                 setattr(self, prop_name, prop_val)
 
         def _check_helper(self, value, raise_exceptions=True) -> bool:
             ret = super(_NewBoundMixin, self)._check_helper(
                 value, raise_exceptions=raise_exceptions
             )
-            return ret and checker(value, getattr(self, var_name))
+            bnd = getattr(self, var_name)
+            if not ret or bnd is None or checker(value, bnd):
+                return ret
+            if raise_exceptions:
+                raise InvalidParameterException(
+                    '%s: value outside of %s bound: %s (%s=%s)' % (
+                        self.name, name, value, prop_name, bnd
+                    )
+                )
+            return False
 
         def _disp_props(self):
             ret = super(_NewBoundMixin, self)._disp_props()
             bnd = getattr(self, prop_name, None)
-            if bnd:
+            if bnd is not None:
                 ret.append('%s=%s' % (prop_name, bnd))
             return ret
 
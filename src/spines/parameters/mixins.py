@@ -5,9 +5,18 @@ Mixin classes for Parameters.
 #
 #   Imports
 #
+from bisect import bisect_right
+from operator import ge
 from operator import gt
+from operator import le
 from operator import lt
+from typing import Iterable
+from typing import Tuple
 
+import numpy as np
+
+from .base import InvalidParameterException
+from .base import ParameterMixin
 from .factories import bound_mixin
 
 
@@ -49,3 +58,312 @@ class Minimum(bound_mixin('minimum', gt)):
 
     """
     pass
+
+
+class Low(bound_mixin('low', ge)):
+    """
+    Lower (inclusive) bound mixin class
+
+    Attributes
+    ----------
+    low
+        Lowest allowed value for this parameter.
+
+    Parameters
+    ----------
+    low : optional
+        Lowest allowed value for this parameter.
+
+    """
+    pass
+
+
+class High(bound_mixin('high', le)):
+    """
+    Upper (inclusive) bound mixin class
+
+    Attributes
+    ----------
+    high
+        Highest allowed value for this parameter.
+
+    Parameters
+    ----------
+    high : optional
+        Highest allowed value for this parameter.
+
+    """
+    pass
+
+
+class Choices(ParameterMixin):
+    """
+    Mixin restricting values to a fixed set of choices
+
+    If no value types are given they're inferred from the `choices`.
+
+    Parameters
+    ----------
+    choices : Iterable
+        The (hashable) values allowed for this parameter.
+
+    """
+
+    def __init__(self, *args, choices: Iterable = None, **kwargs):
+        if not choices:
+            raise ValueError("Must specify the choices allowed")
+        self._choices = tuple(dict.fromkeys(choices))
+        self._choice_index = {x: i for i, x in enumerate(self._choices)}
+        self._choice_set = frozenset(self._choices)
+        if not args:
+            args = tuple(dict.fromkeys(type(x) for x in self._choices))
+        super(Choices, self).__init__(*args, **kwargs)
+
+    @property
+    def choices(self) -> tuple:
+        """tuple: The values allowed for this parameter, in order."""
+        return self._choices
+
+    def index(self, value) -> int:
+        """Gets the position of the given value in the choices
+
+        Parameters
+        ----------
+        value
+            The choice to get the (integer) encoding of.
+
+        Returns
+        -------
+        int
+            Index of the `value` in the :attr:`choices`.
+
+        Raises
+        ------
+        KeyError
+            If the given `value` is not one of the choices.
+
+        """
+        return self._choice_index[value]
+
+    def _check_helper(self, value, raise_exceptions: bool = True) -> bool:
+        ret = super(Choices, self)._check_helper(
+            value, raise_exceptions=raise_exceptions
+        )
+        if not ret or value in self._choice_set:
+            return ret
+        if raise_exceptions:
+            raise InvalidParameterException(
+                '%s: value is not one of the choices: %s' % (
+                    self.name, value
+                )
+            )
+        return False
+
+    def _disp_props(self):
+        ret = super(Choices, self)._disp_props()
+        ret.append('choices=%s' % (self._choices,))
+        return ret
+
+
+class LogScale(ParameterMixin):
+    """
+    Mixin for strictly positive parameters varying on a log-scale
+
+    The value types default to :obj:`float` if not given.
+
+    """
+    log = True
+
+    def __init__(self, *args, **kwargs):
+        super(LogScale, self).__init__(*(args or (float,)), **kwargs)
+
+    def _check_helper(self, value, raise_exceptions: bool = True) -> bool:
+        ret = super(LogScale, self)._check_helper(
+            value, raise_exceptions=raise_exceptions
+        )
+        if not ret or value > 0:
+            return ret
+        if raise_exceptions:
+            raise InvalidParameterException(
+                '%s: value must be positive: %s' % (self.name, value)
+            )
+        return False
+
+
+class Step(ParameterMixin):
+    """
+    Mixin restricting values to a regular grid
+
+    Values must be an integer number of `step` sizes from the parameter's
+    ``low`` bound (or zero, if it has none).  The value types default to
+    :obj:`int` if not given.
+
+    Parameters
+    ----------
+    step : optional
+        Spacing between allowed values (default is 1).
+
+    """
+
+    def __init__(self, *args, step=1, **kwargs):
+        if not step > 0:
+            raise ValueError("The step must be positive")
+        self._step = step
+        super(Step, self).__init__(*(args or (int,)), **kwargs)
+
+    @property
+    def step(self):
+        """The spacing between allowed values."""
+        return self._step
+
+    @property
+    def size(self) -> [int, None]:
+        """int: Number of allowed values (if bounded on both sides)."""
+        low = getattr(self, 'low', None)
+        high = getattr(self, 'high', None)
+        if low is None or high is None:
+            return None
+        return get_step_count(low, high, self._step)
+
+    def _check_helper(self, value, raise_exceptions: bool = True) -> bool:
+        ret = super(Step, self)._check_helper(
+            value, raise_exceptions=raise_exceptions
+        )
+        origin = getattr(self, 'low', None) or 0
+        if not ret or get_step_index(value, origin, self._step)[1]:
+            return ret
+        if raise_exceptions:
+            raise InvalidParameterException(
+                '%s: value is not on the step grid: %s (step=%s)' % (
+                    self.name, value, self._step
+                )
+            )
+        return False
+
+    def _disp_props(self):
+        ret = super(Step, self)._disp_props()
+        ret.append('step=%s' % self._step)
+        return ret
+
+
+class Intervals(ParameterMixin):
+    """
+    Mixin restricting values to a union of closed intervals
+
+    Overlapping intervals are merged.  Checks take logarithmic time in the
+    number of (merged) intervals.  The value types default to
+    :obj:`float` if not given.
+
+    Parameters
+    ----------
+    intervals : Iterable
+        The ``(low, high)`` pairs of allowed value intervals.
+
+    """
+
+    def __init__(self, *args, intervals: Iterable[Tuple] = None, **kwargs):
+        if not intervals:
+            raise ValueError("Must specify the intervals allowed")
+        merged = list()
+        for low, high in sorted(intervals):
+            if low > high:
+                raise ValueError("Invalid interval: (%s, %s)" % (low, high))
+            if merged and low <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(high, merged[-1][1]))
+            else:
+                merged.append((low, high))
+        self._intervals = tuple(merged)
+        self._starts = [x[0] for x in merged]
+        super(Intervals, self).__init__(*(args or (float,)), **kwargs)
+
+    @property
+    def intervals(self) -> Tuple[Tuple]:
+        """tuple: The (merged) ``(low, high)`` intervals allowed."""
+        return self._intervals
+
+    @property
+    def measure(self):
+        """The total length of the intervals allowed."""
+        return sum(high - low for low, high in self._intervals)
+
+    def _check_helper(self, value, raise_exceptions: bool = True) -> bool:
+        ret = super(Intervals, self)._check_helper(
+            value, raise_exceptions=raise_exceptions
+        )
+        if not ret:
+            return ret
+        idx = bisect_right(self._starts, value) - 1
+        if idx >= 0 and value <= self._intervals[idx][1]:
+            return ret
+        if raise_exceptions:
+            raise InvalidParameterException(
+                '%s: value is not in the intervals allowed: %s' % (
+                    self.name, value
+                )
+            )
+        return False
+
+    def _disp_props(self):
+        ret = super(Intervals, self)._disp_props()
+        ret.append('intervals=%s' % (self._intervals,))
+        return ret
+
+
+#
+#   Functions
+#
+
+def get_step_index(value, origin, step):
+    """Gets the nearest number of steps from an origin to a value
+
+    Parameters
+    ----------
+    value : float or numpy.ndarray
+        Value (or values) to get the number of steps to.
+    origin : float
+        Value to count the steps from.
+    step : float
+        Size of each step.
+
+    Returns
+    -------
+    index : int or numpy.ndarray
+        Nearest whole number of steps from the `origin` to the `value`.
+    on_grid : bool or numpy.ndarray
+        Whether or not the `value` is a whole number of steps from the
+        `origin` (exactly for integers, otherwise to within a small
+        fraction of a step, allowing for rounding error).
+
+    """
+    offset = np.subtract(value, origin)
+    if np.issubdtype(np.result_type(offset, step), np.integer):
+        index, remainder = np.divmod(offset, step)
+        return index.astype(np.int64), remainder == 0
+    ratio = np.divide(offset, step)
+    index = np.round(ratio)
+    on_grid = np.isclose(index, ratio, rtol=0.0, atol=1e-9)
+    return index.astype(np.int64), on_grid
+
+
+def get_step_count(low, high, step) -> int:
+    """Gets the number of values on a step grid between two bounds
+
+    Parameters
+    ----------
+    low : float
+        Lower bound (and first value) of the grid.
+    high : float
+        Upper bound of the grid (inclusive).
+    step : float
+        Spacing between values.
+
+    Returns
+    -------
+    int
+        Number of grid values from `low` to `high` (inclusive).
+
+    """
+    index, on_grid = get_step_index(high, low, step)
+    if not on_grid:
+        index = np.floor((high - low) / step)
+    return max(int(index) + 1, 0)
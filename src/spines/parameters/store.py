@@ -6,8 +6,14 @@ Parameter storage module.
 #   Imports
 #
 from collections.abc import MutableMapping
+from contextlib import contextmanager
+import threading
+from types import MappingProxyType
+from typing import Callable
 from typing import Dict
+from typing import FrozenSet
 from typing import Iterator
+from typing import Mapping
 from typing import Type
 
 from .base import Parameter
@@ -15,6 +21,13 @@ from .base import MissingParameterException
 from .decorators import state_changed
 
 
+#
+#   Constants
+#
+
+_MISSING = object()
+
+
 #
 #   Classes
 #
@@ -28,6 +41,29 @@ class ParameterStore(MutableMapping):
         self._params = dict()
         self._values = dict()
         self._finalized = True
+        self._subscribers = list()
+        self._changed = set()
+        self._batch_depth = 0
+        self._trusted = False
+        self._unchecked = set()
+        return
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_subscribers'] = list()
+        state['_changed'] = set()
+        state['_batch_depth'] = 0
+        state['_trusted'] = False
+        state['_unchecked'] = set()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault('_subscribers', list())
+        self.__dict__.setdefault('_changed', set())
+        self.__dict__.setdefault('_batch_depth', 0)
+        self.__dict__.setdefault('_trusted', False)
+        self.__dict__.setdefault('_unchecked', set())
         return
 
     def __repr__(self):
@@ -44,23 +80,41 @@ class ParameterStore(MutableMapping):
         ret += "}"
         return ret
 
-    @state_changed
     def __setitem__(self, k: str, v) -> None:
-        self._values[k] = self._params[k](v)
+        if self._trusted:
+            if k not in self._params:
+                raise KeyError(k)
+            self._current()[k] = v
+            self._unchecked.add(k)
+            return
+        self._set_value(k, v)
         return
 
     @state_changed
     def __delitem__(self, v: str) -> None:
-        del self._values[v]
+        with self._writing() as values:
+            del values[v]
+        self._changed.add(v)
 
     def __getitem__(self, k: str):
-        return self._values[k]
+        try:
+            return self._current()[k]
+        except KeyError:
+            param = self._params.get(k)
+            if param is None or param.required:
+                raise
+        if param.default_factory is None:
+            return param.create_default()
+        return self._get_default(k, param)
+
+    def __contains__(self, k) -> bool:
+        return k in self._current()
 
     def __len__(self) -> int:
-        return len(self._values)
+        return len(self._current())
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self._values)
+        return iter(self._current())
 
     @property
     def parameters(self) -> Dict[str, Parameter]:
@@ -70,7 +124,7 @@ class ParameterStore(MutableMapping):
     @property
     def values(self) -> Dict[str, object]:
         """dict: Copy of the current set of parameter values."""
-        return self._values.copy()
+        return self._current().copy()
 
     @property
     def valid(self) -> bool:
@@ -82,6 +136,11 @@ class ParameterStore(MutableMapping):
         """bool: Whethor or not this set of parameters is finalized."""
         return self._finalized
 
+    @property
+    def trusting(self) -> bool:
+        """bool: Whether or not values are being set without validation."""
+        return self._trusted
+
     def copy(self, deep: bool = False) -> Type['ParameterStore']:
         """Returns a copy of this parameter store object.
 
@@ -97,18 +156,38 @@ class ParameterStore(MutableMapping):
 
         """
         new_obj = self.__class__()
-        for k, v in self._params:
+        for k, v in self._params.items():
             new_obj.add(v)
-        for k, v in self._values:
+        for k, v in self._values.items():
             new_obj[k] = v
         if self._finalized:
             new_obj.finalize()
         return new_obj
 
+    def update(self, *args, **kwargs) -> None:
+        """Updates multiple parameter values at once
+
+        All of the changes made are reported to subscribers in a single
+        notification.
+
+        Parameters
+        ----------
+        args : optional
+            Mapping or iterable of key-value pairs to set.
+        kwargs : optional
+            Additional parameter names and values to set.
+
+        """
+        with self.batch():
+            super(ParameterStore, self).update(*args, **kwargs)
+        return
+
     @state_changed
     def reset(self) -> None:
         """Clears all of the parameters and options stored."""
-        self._values.clear()
+        self._changed.update(self._params.keys())
+        with self._writing() as values:
+            values.clear()
         self._params.clear()
 
     @state_changed
@@ -128,6 +207,7 @@ class ParameterStore(MutableMapping):
 
         """
         self._params[parameter.name] = parameter
+        self._changed.add(parameter.name)
         return
 
     @state_changed
@@ -150,10 +230,95 @@ class ParameterStore(MutableMapping):
             If the given `name` does not exist.
 
         """
-        if name in self._values.keys():
-            del self._values[name]
+        if name in self._current().keys():
+            with self._writing() as values:
+                del values[name]
+        self._changed.add(name)
         return self._params.pop(name)
 
+    def subscribe(
+        self, callback: Callable[['ParameterStore', FrozenSet[str]], None]
+    ) -> None:
+        """Subscribes a callback to changes in this store
+
+        The `callback` is called once per batch of changes (a single
+        call for an individual change made outside of a :meth:`batch`)
+        with this store and the :obj:`frozenset` of names which changed:
+
+        .. code-block:: python
+
+            def callback(store, changed):
+                ...
+
+        Parameters
+        ----------
+        callback : callable
+            Function to call when the contents of this store change.
+
+        See Also
+        --------
+        batch, unsubscribe
+
+        """
+        if not callable(callback):
+            raise ValueError("The callback must be callable")
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+        return
+
+    def unsubscribe(self, callback: Callable) -> None:
+        """Removes a previously subscribed callback
+
+        Parameters
+        ----------
+        callback : callable
+            The callback to remove.
+
+        Raises
+        ------
+        ValueError
+            If the given `callback` is not subscribed to this store.
+
+        See Also
+        --------
+        subscribe
+
+        """
+        self._subscribers.remove(callback)
+        return
+
+    @contextmanager
+    def batch(self):
+        """Context manager to group changes into a single notification
+
+        Changes made within the context are coalesced and subscribers are
+        notified once, with all of the names changed, when the outermost
+        batch exits.
+
+        .. code-block:: python
+
+            with model.parameters.batch():
+                model.m = 2.0
+                model.b = 1.0
+
+        Yields
+        ------
+        ParameterStore
+            This parameter store.
+
+        See Also
+        --------
+        subscribe
+
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._notify()
+
     def finalize(self) -> None:
         """Finalizes the parameters stored
 
@@ -164,17 +329,257 @@ class ParameterStore(MutableMapping):
 
         """
         if self._validate_helper(raise_exceptions=True):
-            for k, v in self._params.items():
-                if k not in self._values.keys():
-                    self._values[k] = v.default
+            with self._writing() as values:
+                for k, v in self._params.items():
+                    if k not in values.keys():
+                        values[k] = v.create_default()
             self._finalized = True
         return
 
+    def snapshot(self) -> Mapping[str, object]:
+        """Gets a read-only snapshot of the current parameter values
+
+        Returns
+        -------
+        Mapping
+            Read-only mapping of the parameter values currently set.
+
+        """
+        return MappingProxyType(self._values.copy())
+
+    @contextmanager
+    def trusted(self):
+        """Context manager for writing values without validation
+
+        Values set within the context are stored as-is, skipping the
+        type and bound checks and the state-change bookkeeping, which
+        makes repeated writes (e.g. within a tight fitting loop) much
+        cheaper.  All of the values set are validated once, when the
+        context exits, and subscribers are notified of the changes.
+        Memoized results (see :meth:`Transform.memoize`) aren't used
+        while :attr:`trusting`, since they're only invalidated then.
+
+        .. code-block:: python
+
+            with model.parameters.trusted():
+                for _ in range(n_iter):
+                    model.m -= rate * grad_m
+
+        Yields
+        ------
+        ParameterStore
+            This parameter store.
+
+        Raises
+        ------
+        InvalidParameterException
+            If any of the values set within the context are not valid, in
+            which case all of the values are restored to what they were
+            on entering the context.
+
+        """
+        if self._trusted:
+            yield self
+            return
+
+        with self.batch(), self._writing() as values:
+            backup = values.copy()
+            self._trusted = True
+            try:
+                yield self
+                for k in self._unchecked:
+                    values[k] = self._params[k](values[k])
+            except Exception:
+                values.clear()
+                values.update(backup)
+                raise
+            finally:
+                self._trusted = False
+                unchecked, self._unchecked = self._unchecked, set()
+
+            if unchecked:
+                self._changed.update(unchecked)
+                self._finalized = False
+        return
+
+    @state_changed
+    def _set_value(self, k: str, v) -> None:
+        """Validates and sets the value for the given parameter"""
+        with self._writing() as values:
+            values[k] = self._params[k](v)
+        self._changed.add(k)
+        return
+
+    def _current(self) -> Mapping[str, object]:
+        """Gets the value table to read from"""
+        return self._values
+
+    def _get_default(self, k: str, param: Parameter):
+        """Gets (and stores) the default of a default factory parameter"""
+        with self._writing() as values:
+            return values.setdefault(k, param.create_default())
+
+    @contextmanager
+    def _writing(self):
+        """Context manager providing the value table to modify"""
+        yield self._values
+
+    def _notify(self) -> None:
+        """Notifies subscribers of the changes made since the last call"""
+        if not self._changed:
+            return
+        changed = frozenset(self._changed)
+        self._changed.clear()
+        for callback in list(self._subscribers):
+            callback(self, changed)
+        return
+
     def _validate_helper(self, raise_exceptions: bool = False) -> bool:
         """Helper to check if this set of parameters is valid"""
         for k, v in self._params.items():
-            if v.required and k not in self._values.keys():
+            if v.required and k not in self._current().keys():
                 if raise_exceptions:
                     raise MissingParameterException(k)
                 return False
         return True
+
+
+class ConcurrentParameterStore(ParameterStore):
+    """
+    Parameter store safe for use by concurrent readers and writers.
+
+    Parameter values are held in an immutable table.  Writers build a new
+    table from a copy of the current one and swap it in once all of
+    their changes are made, so reads never block and always see a
+    consistent set of values.  Writes (including all the changes made
+    within a :meth:`batch`) are applied atomically and serialized with
+    one another.  The writing thread reads its own (not yet published)
+    changes, so read-modify-writes within a batch behave as they do on
+    a :class:`ParameterStore`.  Values set within a :meth:`trusted`
+    context are likewise only published once they've been validated.
+
+    To use it for a model's parameters set the class's store type:
+
+    .. code-block:: python
+
+        class MyModel(Model):
+            __param_store__ = ConcurrentParameterStore
+
+    Readers needing more than one value at a time should use
+    :meth:`snapshot` to get them all from the same version.  Defaults
+    created by reading parameters with a default factory are kept aside
+    (without blocking on writers) and published with the next write.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pending = None
+        self._writer = None
+        self._defaults = dict()
+        super(ConcurrentParameterStore, self).__init__()
+        self._values = MappingProxyType(self._values)
+        return
+
+    def __getstate__(self):
+        state = super(ConcurrentParameterStore, self).__getstate__()
+        state['_values'] = dict(self._defaults, **self._values)
+        del state['_lock']
+        del state['_pending']
+        del state['_writer']
+        del state['_defaults']
+        return state
+
+    def __setstate__(self, state):
+        super(ConcurrentParameterStore, self).__setstate__(state)
+        self._lock = threading.RLock()
+        self._pending = None
+        self._writer = None
+        self._defaults = dict()
+        self._values = MappingProxyType(dict(self._values))
+        return
+
+    def __setitem__(self, k: str, v) -> None:
+        with self._lock:
+            super(ConcurrentParameterStore, self).__setitem__(k, v)
+        return
+
+    @contextmanager
+    def batch(self):
+        """Context manager to group changes into a single atomic write
+
+        All of the changes made within the context are published to
+        readers together, when the outermost batch exits, and then
+        subscribers are notified once with all of the names changed.
+
+        Yields
+        ------
+        ConcurrentParameterStore
+            This parameter store.
+
+        See Also
+        --------
+        ParameterStore.batch
+
+        """
+        with self._lock:
+            with super(ConcurrentParameterStore, self).batch():
+                with self._writing():
+                    yield self
+
+    def snapshot(self) -> Mapping[str, object]:
+        """Gets a read-only snapshot of the current parameter values
+
+        The snapshot is the current (immutable) value table, so this is
+        a constant-time call which doesn't block on writers.  Changes
+        being made (within a :meth:`batch` or :meth:`trusted` context)
+        aren't included until they're published.
+
+        Returns
+        -------
+        Mapping
+            Read-only mapping of the parameter values currently set.
+
+        """
+        return self._values
+
+    def _current(self) -> Mapping[str, object]:
+        """Gets the value table to read from (the pending one if writing)"""
+        if self._writer == threading.get_ident():
+            return self._pending
+        return self._values
+
+    def _get_default(self, k: str, param: Parameter):
+        """Gets the default of a default factory parameter
+
+        The default is created without taking the write lock and kept
+        aside, with :meth:`dict.setdefault` picking the one returned by
+        all readers if several create it at once, until it's published
+        with the next write.
+
+        """
+        if self._writer == threading.get_ident():
+            return self._pending.setdefault(k, param.create_default())
+        ret = self._defaults.get(k, _MISSING)
+        if ret is _MISSING:
+            ret = self._defaults.setdefault(k, param.create_default())
+        return self._values.get(k, ret)
+
+    @contextmanager
+    def _writing(self):
+        """Context manager providing a new value table to modify"""
+        with self._lock:
+            if self._pending is not None:
+                yield self._pending
+                return
+            defaults = self._defaults.copy()
+            self._pending = dict(defaults, **self._values)
+            self._writer = threading.get_ident()
+            try:
+                yield self._pending
+                self._values = MappingProxyType(self._pending)
+                for k in defaults:
+                    self._defaults.pop(k, None)
+            finally:
+                self._writer = None
+                self._pending = None
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Hyper-parameter search subpackage for spines.
+"""
+from .base import BaseSearch
+from .base import SearchException
+from .base import SearchResult
+from .cache import EvaluationCache
+from .core import GridSearch
+from .core import RandomSearch
+from .schedulers import Hyperband
+from .schedulers import SuccessiveHalving
+from .space import SearchSpace
+from .warm import WarmStartIndex
+
+__all__ = [
+    # Searches
+    'BaseSearch',
+    'GridSearch',
+    'RandomSearch',
+    'SuccessiveHalving',
+    'Hyperband',
+    # Search spaces
+    'SearchSpace',
+    'WarmStartIndex',
+    # Results
+    'SearchResult',
+    'EvaluationCache',
+    # Exceptions
+    'SearchException',
+]
@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+Base classes for the search subpackage.
+"""
+#
+#   Imports
+#
+from abc import ABC
+from abc import abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+import threading
+import time
+from typing import Dict
+from typing import Iterator
+from typing import List
+from uuid import uuid4
+
+from ..utils.concurrency import get_executor
+from ..utils.concurrency import get_worker_count
+from . import pool
+from .cache import fingerprint
+from .cache import get_signature
+
+
+#
+#   Constants
+#
+
+_POLL_INTERVAL = 0.1
+
+
+#
+#   Classes
+#
+
+class SearchResult(object):
+    """
+    Result of a single hyper-parameter evaluation
+
+    Attributes
+    ----------
+    hyper_params : dict
+        Hyper-parameter values evaluated.
+    score : float
+        Score of the model fit with the `hyper_params` (:obj:`None` if
+        the evaluation failed).
+    parameters : dict
+        Fitted parameter values (:obj:`None` if the evaluation failed).
+    duration : float
+        Time taken for the evaluation (in seconds).
+    exception : Exception
+        Exception raised by the evaluation, if any.
+    iterations : int
+        Total number of ``fit`` iterations the model was trained for, if
+        tracked by the search.
+    cached : bool
+        Whether or not the result was loaded from an evaluation cache
+        (rather than evaluated by the search).
+    index : int
+        Position of the candidate in the order the search generated
+        them, used to break ties in score.
+
+    """
+
+    def __init__(
+        self, hyper_params: Dict[str, object], score: [float, None] = None,
+        parameters: [Dict[str, object], None] = None, duration: float = 0.0,
+        exception: [Exception, None] = None, iterations: [int, None] = None,
+        cached: bool = False, index: int = 0
+    ):
+        self.hyper_params = hyper_params
+        self.score = score
+        self.parameters = parameters
+        self.duration = duration
+        self.exception = exception
+        self.iterations = iterations
+        self.cached = cached
+        self.index = index
+
+    def __repr__(self):
+        return '<%s score=%s hyper_params=%s>' % (
+            self.__class__.__name__, self.score, self.hyper_params
+        )
+
+    @property
+    def ok(self) -> bool:
+        """bool: Whether or not the evaluation succeeded."""
+        return self.exception is None
+
+
+class BaseSearch(ABC):
+    """
+    Base class for hyper-parameter searches
+
+    Searches fit and score instances of a model class for each of the
+    hyper-parameter candidates generated, in parallel on a pool of
+    workers.  The data for the search is sent to each worker once and
+    reused for all of the evaluations it runs.
+
+    Parameters
+    ----------
+    model_cls : type
+        The :class:`Model` class to search hyper-parameters for.
+    space : dict, optional
+        Explicit values to use for (some of) the hyper-parameters, which
+        take precedence over the model's hyper-parameter specifications.
+    workers : int, optional
+        Number of workers to evaluate candidates on (default is the
+        number of CPUs available).
+    executor : str, optional
+        Type of worker pool to use, ``'process'`` (default) or
+        ``'thread'``.
+    max_evals : int, optional
+        Maximum number of evaluations to run, if any.
+    timeout : float, optional
+        Maximum total time (in seconds) to run the search for, if any.
+    cache : EvaluationCache, optional
+        Cache of evaluation results to use, if any.  Candidates already
+        evaluated (with the same model code and data) are loaded from
+        the cache rather than evaluated again, and do not count towards
+        the `max_evals` budget.
+    warm_start : bool, optional
+        Whether or not to warm-start each model fit from the nearest
+        previously fitted candidate (see :meth:`Model.warm_start`),
+        default is :obj:`False`.  Each worker process keeps its own
+        index of the candidates it has fitted.
+
+    """
+
+    def __init__(
+        self, model_cls: type, space: [Dict[str, list], None] = None,
+        workers: [int, None] = None, executor: str = 'process',
+        max_evals: [int, None] = None, timeout: [float, None] = None,
+        cache=None, warm_start: bool = False
+    ):
+        self._model_cls = model_cls
+        self._space = dict(space or dict())
+        self._workers = get_worker_count(workers)
+        self._executor = executor
+        self._max_evals = max_evals
+        self._timeout = timeout
+        self._cache = cache
+        self._cache_keys = None
+        self._warm_start = warm_start
+        self._results = list()
+        self._cancelled = threading.Event()
+        self._start = None
+        self._n_evals = 0
+        return
+
+    def __repr__(self):
+        return '<%s model=%s evaluated=%s>' % (
+            self.__class__.__name__, self._model_cls.__name__,
+            len(self._results)
+        )
+
+    @property
+    def model_cls(self) -> type:
+        """type: The model class being searched over."""
+        return self._model_cls
+
+    @property
+    def results(self) -> List[SearchResult]:
+        """list: Results of the evaluations completed, in order."""
+        return list(self._results)
+
+    @property
+    def best(self) -> [SearchResult, None]:
+        """SearchResult: Highest scoring result so far, if any."""
+        results = [x for x in self._results if x.ok]
+        if not results:
+            return None
+        return max(results, key=lambda x: (x.score, -x.index))
+
+    @property
+    def cancelled(self) -> bool:
+        """bool: Whether or not the search has been cancelled."""
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Cancels the search
+
+        No new evaluations are started and any which haven't yet started
+        are cancelled.  This may be called from another thread, or from
+        within the loop consuming the results of :meth:`run`.
+
+        """
+        self._cancelled.set()
+        return
+
+    def run(self, *args, score_args: [tuple, None] = None,
+            **kwargs) -> Iterator[SearchResult]:
+        """Runs the search, yielding results as they complete
+
+        Parameters
+        ----------
+        args
+            Arguments to pass to each model's ``fit`` call.
+        score_args : tuple, optional
+            Arguments to pass to each model's ``score`` call (default is
+            to use the same `args` as for ``fit``).
+        kwargs : optional
+            Keyword-arguments to pass to each model's ``fit`` call.
+
+        Yields
+        ------
+        SearchResult
+            The result of each evaluation, in the order completed.
+
+        """
+        self._cancelled.clear()
+        if score_args is None:
+            score_args = args
+        token = uuid4().hex
+        data = (self._model_cls, args, kwargs, score_args)
+        cache = None
+        if self._cache is not None:
+            self._cache_keys = (
+                get_signature(self._model_cls),
+                fingerprint(args, kwargs, score_args),
+            )
+            self._cache.invalidate(self._model_cls, self._cache_keys[0])
+            cache = (self._cache,) + self._cache_keys
+        index = None
+        if self._warm_start:
+            from .warm import WarmStartIndex
+            index = WarmStartIndex(self._model_cls, space=self._space)
+        executor = get_executor(
+            self._executor, self._workers, initializer=pool.initialize,
+            initargs=(token, data, cache, index)
+        )
+
+        self._start = time.monotonic()
+        self._n_evals = 0
+        schedule = self._schedule(executor, token)
+        try:
+            for result in schedule:
+                self._results.append(result)
+                yield result
+        finally:
+            schedule.close()
+            executor.shutdown(wait=False)
+            pool.release(token)
+        return
+
+    @abstractmethod
+    def _candidates(self) -> Iterator[Dict[str, object]]:
+        """Generates the hyper-parameter values to evaluate"""
+        pass
+
+    def _schedule(self, executor, token: str) -> Iterator[SearchResult]:
+        """Schedules the evaluations to run, yielding their results"""
+        hits = deque()
+
+        def tasks():
+            for i, x in enumerate(self._candidates()):
+                result = self._get_cached(x, i)
+                if result is not None:
+                    hits.append(result)
+                else:
+                    yield (i, x), (token, x)
+
+        candidates = tasks()
+        for (i, hyper_params), future in self._map(executor, pool.evaluate,
+                                                   candidates):
+            while hits:
+                yield hits.popleft()
+            yield self._get_result(hyper_params, future, index=i)
+
+        # Cached results don't use any of the evaluation budget, so the
+        # rest of the candidates are still checked for them
+        while not (self._cancelled.is_set() or self._timed_out()):
+            if next(candidates, None) is None:
+                break
+            while hits:
+                yield hits.popleft()
+        while hits:
+            yield hits.popleft()
+        return
+
+    def _get_cached(self, hyper_params,
+                    index: int = 0) -> [SearchResult, None]:
+        """Gets the cached result for the given candidate, if any"""
+        if self._cache is None:
+            return None
+        cached = self._cache.get(
+            self._cache_keys[0], hyper_params, self._cache_keys[1]
+        )
+        if cached is None:
+            return None
+        score, parameters, duration = cached
+        return SearchResult(
+            hyper_params, score=score, parameters=parameters,
+            duration=duration, cached=True, index=index
+        )
+
+    def _map(self, executor, func, tasks) -> Iterator[tuple]:
+        """Runs tasks on the executor, within the budget for the search
+
+        The `tasks` are pairs of a key and the arguments to call `func`
+        with, and the key and (completed) future for each are yielded in
+        the order they complete (those found complete together in the
+        order they were submitted).  Only a bounded number of tasks are
+        submitted at a time, so tasks are not pulled from `tasks` once
+        the search is cancelled or its budget is used up.
+
+        """
+        tasks = iter(tasks)
+        pending = dict()
+        try:
+            while not self._cancelled.is_set():
+                while len(pending) < 2 * self._workers:
+                    if (self._max_evals is not None
+                            and self._n_evals >= self._max_evals):
+                        break
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    key, args = task
+                    pending[executor.submit(func, *args)] = key
+                    self._n_evals += 1
+
+                if not pending:
+                    break
+                remaining = self._remaining()
+                if remaining is not None and remaining <= 0:
+                    break
+
+                done, _ = wait(
+                    pending, return_when=FIRST_COMPLETED,
+                    timeout=min(remaining or _POLL_INTERVAL, _POLL_INTERVAL)
+                )
+                for future in [x for x in pending if x in done]:
+                    yield pending.pop(future), future
+        finally:
+            for future in pending:
+                future.cancel()
+        return
+
+    def _stopped(self) -> bool:
+        """Whether or not the search is cancelled or out of budget"""
+        if self._cancelled.is_set():
+            return True
+        if self._max_evals is not None and self._n_evals >= self._max_evals:
+            return True
+        return self._timed_out()
+
+    def _timed_out(self) -> bool:
+        """Whether or not the search has run out of time"""
+        remaining = self._remaining()
+        return remaining is not None and remaining <= 0
+
+    def _remaining(self) -> [float, None]:
+        """Gets the time remaining in the search budget, if limited"""
+        if self._timeout is None:
+            return None
+        return self._timeout - (time.monotonic() - self._start)
+
+    @staticmethod
+    def _get_result(hyper_params, future, iterations=None,
+                    index=0) -> SearchResult:
+        """Creates the result object from a completed evaluation"""
+        ex = future.exception()
+        if ex is not None:
+            return SearchResult(
+                hyper_params, exception=ex, iterations=iterations,
+                index=index
+            )
+        score, parameters, duration = future.result()[:3]
+        return SearchResult(
+            hyper_params, score=score, parameters=parameters,
+            duration=duration, iterations=iterations, index=index
+        )
+
+
+#
+#   Exceptions
+#
+
+class SearchException(Exception):
+    """
+    Base class for search exceptions.
+    """
+    pass
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent caching of search evaluation results.
+"""
+#
+#   Imports
+#
+import numbers
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Dict
+from typing import Tuple
+
+import numpy as np
+from xxhash import xxh64
+
+from ..project.utils import PROJECT_DIRNAME
+from ..versioning.core import ClassSignature
+
+
+#
+#   Constants
+#
+
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_DIRNAME, 'cache', 'evaluations.db')
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS evaluations (
+        signature TEXT NOT NULL,
+        hyper_hash TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        model TEXT NOT NULL,
+        hyper_params BLOB NOT NULL,
+        score REAL,
+        parameters BLOB,
+        duration REAL NOT NULL,
+        created REAL NOT NULL,
+        PRIMARY KEY (signature, hyper_hash, fingerprint)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS evaluations_model
+        ON evaluations (model, signature)
+    """,
+)
+
+
+#
+#   Classes
+#
+
+class EvaluationCache(object):
+    """
+    Persistent cache of hyper-parameter evaluation results
+
+    Results are stored in a SQLite database, indexed by the signature of
+    the model class's code, a hash of the hyper-parameter values and a
+    fingerprint of the data the model was fit and scored on.  Entries
+    for a model class are invalidated whenever the signature of its code
+    changes.
+
+    Each process (and thread) using the cache opens its own connection
+    to the database, which is run in write-ahead logging mode, so the
+    cache can be written to concurrently from the workers of a search
+    (or several searches at once).  Cache objects can be pickled to send
+    to other processes.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the database file to use (default is
+        ``.spines/cache/evaluations.db`` in the current directory).
+    store_parameters : bool, optional
+        Whether or not to store the fitted parameter values (default is
+        :obj:`True`), otherwise only scores are stored.
+    timeout : float, optional
+        Time (in seconds) to wait for other writers to release the
+        database (default is 30).
+
+    """
+
+    def __init__(
+        self, path: [str, None] = None, store_parameters: bool = True,
+        timeout: float = 30.0
+    ):
+        self._path = os.path.abspath(path or DEFAULT_CACHE_PATH)
+        self._store_parameters = store_parameters
+        self._timeout = timeout
+        self._local = threading.local()
+        return
+
+    def __repr__(self):
+        return '<%s path="%s">' % (self.__class__.__name__, self._path)
+
+    def __len__(self):
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM evaluations'
+        ).fetchone()[0]
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+        return
+
+    @property
+    def path(self) -> str:
+        """str: Path of the database file for this cache."""
+        return self._path
+
+    @property
+    def store_parameters(self) -> bool:
+        """bool: Whether or not fitted parameter values are stored."""
+        return self._store_parameters
+
+    def get(
+        self, signature: str, hyper_params: Dict[str, object],
+        fingerprint: str
+    ) -> [Tuple, None]:
+        """Gets the cached result of an evaluation
+
+        Parameters
+        ----------
+        signature : str
+            Signature hash of the model class evaluated.
+        hyper_params : dict
+            Hyper-parameter values evaluated.
+        fingerprint : str
+            Fingerprint of the data the model was evaluated on.
+
+        Returns
+        -------
+        tuple
+            The score, fitted parameter values (:obj:`None` if not
+            stored) and time taken (in seconds) for the evaluation, if
+            cached, otherwise :obj:`None`.
+
+        """
+        row = self._connection().execute(
+            'SELECT score, parameters, duration FROM evaluations '
+            'WHERE signature = ? AND hyper_hash = ? AND fingerprint = ?',
+            (signature, get_hyper_hash(hyper_params), fingerprint)
+        ).fetchone()
+        if row is None:
+            return None
+        score, parameters, duration = row
+        if parameters is not None:
+            parameters = pickle.loads(parameters)
+        return score, parameters, duration
+
+    def put(
+        self, model_cls: type, signature: str,
+        hyper_params: Dict[str, object], fingerprint: str, score: float,
+        parameters: [Dict[str, object], None] = None, duration: float = 0.0
+    ) -> None:
+        """Stores the result of an evaluation
+
+        Parameters
+        ----------
+        model_cls : type
+            Model class evaluated.
+        signature : str
+            Signature hash of the model class evaluated.
+        hyper_params : dict
+            Hyper-parameter values evaluated.
+        fingerprint : str
+            Fingerprint of the data the model was evaluated on.
+        score : float
+            Score of the evaluation.
+        parameters : dict, optional
+            Fitted parameter values of the evaluation.
+        duration : float, optional
+            Time taken (in seconds) for the evaluation.
+
+        """
+        if parameters is not None and self._store_parameters:
+            parameters = pickle.dumps(parameters)
+        else:
+            parameters = None
+        self._connection().execute(
+            'INSERT OR REPLACE INTO evaluations VALUES '
+            '(?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (signature, get_hyper_hash(hyper_params), fingerprint,
+             _model_name(model_cls), pickle.dumps(hyper_params), score,
+             parameters, duration, time.time())
+        )
+        return
+
+    def invalidate(self, model_cls: type, signature: [str, None] = None
+                   ) -> int:
+        """Removes stale entries for a model class
+
+        Parameters
+        ----------
+        model_cls : type
+            Model class to remove the entries for.
+        signature : str, optional
+            Current signature hash of the model class (default is to
+            compute it), entries with any other signature are removed.
+
+        Returns
+        -------
+        int
+            Number of entries removed.
+
+        """
+        if signature is None:
+            signature = get_signature(model_cls)
+        with self._connection() as conn:
+            cursor = conn.execute(
+                'DELETE FROM evaluations WHERE model = ? AND signature != ?',
+                (_model_name(model_cls), signature)
+            )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Removes all entries from the cache"""
+        self._connection().execute('DELETE FROM evaluations')
+        return
+
+    def close(self) -> None:
+        """Closes this thread's connection to the database, if open"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn[1].close()
+            self._local.conn = None
+        return
+
+    def _connection(self) -> sqlite3.Connection:
+        """Gets the connection to the database for this thread/process
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn[0] == os.getpid():
+            return conn[1]
+
+        dir_path = os.path.dirname(self._path)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        ret = sqlite3.connect(
+            self._path, timeout=self._timeout, isolation_level=None
+        )
+        _enable_wal(ret, self._timeout)
+        ret.execute('PRAGMA synchronous=NORMAL')
+        for stmt in _SCHEMA:
+            ret.execute(stmt)
+        self._local.conn = (os.getpid(), ret)
+        return ret
+
+
+#
+#   Functions
+#
+
+def get_signature(model_cls: type) -> str:
+    """Gets the signature hash of a model class's code
+
+    Parameters
+    ----------
+    model_cls : type
+        Model class (or instance) to get the signature of.
+
+    Returns
+    -------
+    str
+        Signature hash for the model class.
+
+    """
+    return ClassSignature(model_cls).hash
+
+
+def get_hyper_hash(hyper_params: Dict[str, object]) -> str:
+    """Gets the hash of a set of hyper-parameter values
+
+    Parameters
+    ----------
+    hyper_params : dict
+        Hyper-parameter values to hash.
+
+    Returns
+    -------
+    str
+        Hash of the hyper-parameter values (independent of their
+        order).
+
+    """
+    return fingerprint(hyper_params)
+
+
+def fingerprint(*objs) -> str:
+    """Gets a fingerprint of the given data
+
+    Numeric values are hashed by value (so ``1``, ``1.0`` and
+    ``np.float64(1.0)`` are equal), arrays by their type, shape and
+    contents, containers recursively and any other objects by their
+    pickled representation.
+
+    Parameters
+    ----------
+    objs
+        Objects to fingerprint.
+
+    Returns
+    -------
+    str
+        Fingerprint of the objects given.
+
+    """
+    m = xxh64()
+    _update_hash(m, objs)
+    return m.hexdigest()
+
+
+def _update_hash(m, obj) -> None:
+    """Updates the given hash with the given object"""
+    if obj is None:
+        m.update(b'n:')
+    elif isinstance(obj, (bool, np.bool_)):
+        m.update(b'b:%d' % bool(obj))
+    elif isinstance(obj, str):
+        m.update(b's:%d:' % len(obj))
+        m.update(obj.encode())
+    elif isinstance(obj, bytes):
+        m.update(b'y:%d:' % len(obj))
+        m.update(obj)
+    elif isinstance(obj, numbers.Integral):
+        m.update(b'i:%d' % int(obj))
+    elif isinstance(obj, numbers.Real):
+        obj = float(obj)
+        if obj.is_integer() and abs(obj) < 2 ** 53:
+            m.update(b'i:%d' % int(obj))
+        else:
+            m.update(('f:%s' % obj.hex()).encode())
+    elif isinstance(obj, np.ndarray):
+        m.update(('a:%s:%s:' % (obj.dtype.str, obj.shape)).encode())
+        if obj.dtype.hasobject:
+            _update_hash(m, obj.tolist())
+        else:
+            m.update(np.ascontiguousarray(obj).data)
+    elif isinstance(obj, (list, tuple)):
+        m.update(b'l:%d:' % len(obj))
+        for x in obj:
+            _update_hash(m, x)
+    elif isinstance(obj, dict):
+        m.update(b'd:%d:' % len(obj))
+        for k in sorted(obj, key=repr):
+            _update_hash(m, k)
+            _update_hash(m, obj[k])
+    else:
+        m.update(b'p:')
+        m.update(pickle.dumps(obj, protocol=4))
+    return
+
+
+def _enable_wal(conn: sqlite3.Connection, timeout: float) -> None:
+    """Switches a database to write-ahead logging (if it isn't already)"""
+    deadline = time.monotonic() + timeout
+    while conn.execute('PRAGMA journal_mode').fetchone()[0].lower() != 'wal':
+        # Changing the journal mode needs an exclusive lock, which isn't
+        # waited for by the busy timeout, so retry while others hold it
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            return
+        except sqlite3.OperationalError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
+    return
+
+
+def _model_name(model_cls: type) -> str:
+    """Gets the full name of a model class"""
+    if not isinstance(model_cls, type):
+        model_cls = model_cls.__class__
+    return '%s.%s' % (model_cls.__module__, model_cls.__qualname__)
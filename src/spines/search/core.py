@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Core hyper-parameter search classes.
+"""
+#
+#   Imports
+#
+from itertools import product
+from random import Random
+from typing import Dict
+from typing import Iterator
+
+from .base import BaseSearch
+from .space import SearchSpace
+from .utils import get_hyper_parameters
+from .utils import grid_values
+from .utils import sample_value
+
+
+#
+#   Search classes
+#
+
+class GridSearch(BaseSearch):
+    """
+    Exhaustive search over a grid of hyper-parameter values
+
+    The values for each hyper-parameter are taken from the `space` given,
+    if specified, otherwise they're determined from the model's
+    hyper-parameter specifications (all choices, every step of stepped
+    ranges and `num` evenly-spaced values over continuous ranges).
+
+    Parameters
+    ----------
+    model_cls : type
+        The :class:`Model` class to search hyper-parameters for.
+    num : int, optional
+        Number of values to use for continuous hyper-parameters (default
+        is 5).
+    kwargs : optional
+        Additional keyword-arguments for the :class:`BaseSearch`.
+
+    """
+
+    def __init__(self, model_cls: type, num: int = 5, **kwargs):
+        super(GridSearch, self).__init__(model_cls, **kwargs)
+        self._num = num
+        return
+
+    @property
+    def grid(self) -> Dict[str, list]:
+        """dict: Values searched over for each hyper-parameter."""
+        ret = dict()
+        for k, v in get_hyper_parameters(self._model_cls).items():
+            if k in self._space:
+                ret[k] = list(self._space[k])
+            else:
+                ret[k] = grid_values(v, num=self._num)
+        return ret
+
+    def _candidates(self) -> Iterator[Dict[str, object]]:
+        grid = self.grid
+        names = list(grid.keys())
+        for values in product(*grid.values()):
+            yield dict(zip(names, values))
+
+
+class RandomSearch(BaseSearch):
+    """
+    Random search over hyper-parameter values
+
+    Values for each hyper-parameter are drawn uniformly from the `space`
+    given, if specified, otherwise they're sampled based on the model's
+    hyper-parameter specifications (log-uniformly for log-scale
+    parameters).
+
+    If a sampling `method` is given the candidates are instead generated
+    in a single batch from a :class:`SearchSpace`, using the given design,
+    and any duplicates are dropped.
+
+    Parameters
+    ----------
+    model_cls : type
+        The :class:`Model` class to search hyper-parameters for.
+    n_iter : int, optional
+        Number of candidates to evaluate (default is 10).
+    seed : int, optional
+        Seed for the random number generator.
+    method : str, optional
+        Batch sampling design to use (one of ``'uniform'``, ``'lhs'`` or
+        ``'sobol'``), if any.
+    kwargs : optional
+        Additional keyword-arguments for the :class:`BaseSearch`.
+
+    """
+
+    def __init__(
+        self, model_cls: type, n_iter: int = 10, seed: [int, None] = None,
+        method: [str, None] = None, **kwargs
+    ):
+        super(RandomSearch, self).__init__(model_cls, **kwargs)
+        self._n_iter = n_iter
+        self._seed = seed
+        self._rng = Random(seed)
+        self._method = method
+        return
+
+    def _candidates(self) -> Iterator[Dict[str, object]]:
+        if self._method is not None:
+            space = SearchSpace(self._model_cls, space=self._space)
+            columns = space.unique(
+                space.sample(self._n_iter, self._method, seed=self._seed)
+            )
+            yield from space.rows(columns)
+            return
+        for _ in range(self._n_iter):
+            yield self._sample()
+
+    def _sample(self) -> Dict[str, object]:
+        """Draws a single set of hyper-parameter values"""
+        ret = dict()
+        for k, v in get_hyper_parameters(self._model_cls).items():
+            if k in self._space:
+                ret[k] = self._rng.choice(list(self._space[k]))
+            else:
+                ret[k] = sample_value(v, self._rng)
+        return ret
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Functions for running search evaluations on worker pools.
+"""
+#
+#   Imports
+#
+import time
+from typing import Dict
+from typing import Tuple
+
+
+#
+#   Variables
+#
+
+_WORKER_DATA = dict()
+_WORKER_CACHE = dict()
+_WORKER_INDEX = dict()
+
+
+#
+#   Functions
+#
+
+def initialize(
+    token: str, data: Tuple, cache: [Tuple, None] = None, index=None
+) -> None:
+    """Initializes a worker with the data for a search
+
+    The data is stored once per worker (rather than sent with each
+    evaluation task) and looked up using the search's `token`.
+
+    Parameters
+    ----------
+    token : str
+        Unique identifier of the search the data is for.
+    data : tuple
+        The model class, fit arguments, fit keyword-arguments and score
+        arguments for the search.
+    cache : tuple, optional
+        The :class:`EvaluationCache` to store evaluation results in, the
+        model class's signature and the fingerprint of the data, if
+        caching results.
+    index : WarmStartIndex, optional
+        Index of fitted models to warm-start new fits from, if any (each
+        worker process keeps its own, threads share one).
+
+    """
+    _WORKER_DATA[token] = data
+    if cache is not None:
+        _WORKER_CACHE[token] = cache
+    if index is not None:
+        _WORKER_INDEX.setdefault(token, index)
+    return
+
+
+def release(token: str) -> None:
+    """Releases the data stored for a search
+
+    Parameters
+    ----------
+    token : str
+        Unique identifier of the search to release the data for.
+
+    """
+    _WORKER_DATA.pop(token, None)
+    _WORKER_CACHE.pop(token, None)
+    _WORKER_INDEX.pop(token, None)
+    return
+
+
+def evaluate(token: str, hyper_params: Dict[str, object]) -> Tuple:
+    """Fits and scores a model with the given hyper-parameters
+
+    Parameters
+    ----------
+    token : str
+        Unique identifier of the search the evaluation is for.
+    hyper_params : dict
+        Hyper-parameter values to fit the model with.
+
+    Returns
+    -------
+    tuple
+        The score, fitted parameter values and time taken (in seconds).
+
+    """
+    model_cls, args, kwargs, score_args = _WORKER_DATA[token]
+    start = time.perf_counter()
+    model = model_cls()
+    model.set_hyper_params(**hyper_params)
+    _warm_start(token, model, hyper_params)
+    model.fit(*args, **kwargs)
+    score = model.score(*score_args)
+    params = model.get_params()
+    duration = time.perf_counter() - start
+    _add_fitted(token, hyper_params, params)
+
+    if token in _WORKER_CACHE:
+        cache, signature, fingerprint = _WORKER_CACHE[token]
+        cache.put(
+            model_cls, signature, hyper_params, fingerprint, score,
+            parameters=params, duration=duration
+        )
+    return score, params, duration
+
+
+def advance(
+    token: str, hyper_params: Dict[str, object], state, n_iter: int,
+    checkpoint: [str, None] = None
+) -> Tuple:
+    """Continues fitting a model for a number of iterations and scores it
+
+    Parameters
+    ----------
+    token : str
+        Unique identifier of the search the evaluation is for.
+    hyper_params : dict
+        Hyper-parameter values to fit the model with.
+    state
+        State to resume the model from: :obj:`None` to start a new
+        model, the path of a saved model (if using a `checkpoint`) or
+        the model's previously fitted parameter values.
+    n_iter : int
+        Number of additional ``fit`` iterations to run.
+    checkpoint : str, optional
+        Path (without extension) to save the model to after fitting, if
+        any.
+
+    Returns
+    -------
+    tuple
+        The score, fitted parameter values, time taken (in seconds) and
+        the new state to resume the model from.
+
+    """
+    model_cls, args, kwargs, score_args = _WORKER_DATA[token]
+    start = time.perf_counter()
+    if state is not None and checkpoint is not None:
+        model = model_cls.load(state)
+    else:
+        model = model_cls()
+        model.set_hyper_params(**hyper_params)
+        if state is not None:
+            model.set_params(**state)
+        else:
+            _warm_start(token, model, hyper_params)
+
+    for _ in range(n_iter):
+        model.fit(*args, **kwargs)
+    score = model.score(*score_args)
+    params = model.get_params()
+    _add_fitted(token, hyper_params, params)
+
+    if checkpoint is not None:
+        state = model.save(checkpoint)
+    else:
+        state = params
+    return score, params, time.perf_counter() - start, state
+
+
+def _warm_start(token: str, model, hyper_params: Dict[str, object]) -> None:
+    """Warm-starts a model from its nearest fitted neighbour, if any"""
+    index = _WORKER_INDEX.get(token)
+    if index is None:
+        return
+    nearest = index.nearest(hyper_params)
+    if nearest is not None:
+        model.warm_start(nearest[1], nearest[0])
+    return
+
+
+def _add_fitted(token: str, hyper_params: Dict[str, object],
+                params: Dict[str, object]) -> None:
+    """Adds a fitted model to the warm-start index, if any"""
+    index = _WORKER_INDEX.get(token)
+    if index is not None:
+        index.add(hyper_params, params)
+    return
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-fidelity search schedulers based on training iterations.
+"""
+#
+#   Imports
+#
+import math
+import os
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from .base import SearchResult
+from .core import RandomSearch
+from . import pool
+
+
+#
+#   Scheduler classes
+#
+
+class SuccessiveHalving(RandomSearch):
+    """
+    Successive halving search over model ``fit`` iterations
+
+    Randomly sampled candidates are each fit for `min_iter` iterations
+    (calls to the model's ``fit`` method) and scored, then the best
+    scoring ``1 / eta`` of them continue training for ``eta`` times as
+    many iterations, and so on until `max_iter` is reached.  Surviving
+    candidates resume from their previously fitted state rather than
+    being retrained from scratch.
+
+    By default the state kept for each candidate is its fitted parameter
+    values.  If the model keeps additional state (e.g. saved by a custom
+    ``_save_helper``) a `checkpoint_dir` can be given, in which case each
+    candidate is saved to and resumed from its own model file.
+
+    Parameters
+    ----------
+    model_cls : type
+        The :class:`Model` class to search hyper-parameters for.
+    n_iter : int, optional
+        Number of candidates to start with (default is 27).
+    min_iter : int, optional
+        Number of ``fit`` iterations for the first round (default is 1).
+    max_iter : int, optional
+        Maximum number of ``fit`` iterations for any candidate (default
+        is 27).
+    eta : int, optional
+        Reduction factor for each round (default is 3).
+    checkpoint_dir : str, optional
+        Directory to save candidate models to between rounds, if any.
+    kwargs : optional
+        Additional keyword-arguments for the :class:`RandomSearch`.
+
+    """
+
+    def __init__(
+        self, model_cls: type, n_iter: int = 27, min_iter: int = 1,
+        max_iter: int = 27, eta: int = 3,
+        checkpoint_dir: [str, None] = None, **kwargs
+    ):
+        if eta < 2:
+            raise ValueError("The reduction factor (eta) must be at least 2")
+        if kwargs.get('cache') is not None:
+            raise ValueError(
+                "Evaluation caching isn't supported by iterative searches"
+            )
+        super(SuccessiveHalving, self).__init__(
+            model_cls, n_iter=n_iter, **kwargs
+        )
+        self._min_iter = max(min_iter, 1)
+        self._max_iter = max(max_iter, self._min_iter)
+        self._eta = eta
+        self._checkpoint_dir = checkpoint_dir
+        return
+
+    @property
+    def best(self) -> [SearchResult, None]:
+        """SearchResult: Highest scoring of the most trained results."""
+        results = [x for x in self._results if x.ok]
+        if not results:
+            return None
+        return max(
+            results, key=lambda x: (x.iterations or 0, x.score, -x.index)
+        )
+
+    def _schedule(self, executor, token: str) -> Iterator[SearchResult]:
+        configs = list(self._candidates())
+        yield from self._bracket(
+            executor, token, configs, self._min_iter, 'sh'
+        )
+
+    def _bracket(
+        self, executor, token: str, configs: List[Dict[str, object]],
+        n_iter: int, name: str
+    ) -> Iterator[SearchResult]:
+        """Runs successive halving rounds for the given candidates"""
+        states = [None] * len(configs)
+        done = [0] * len(configs)
+        active = list(range(len(configs)))
+        while active:
+            tasks = (
+                (i, (token, configs[i], states[i], n_iter - done[i],
+                     self._checkpoint_path(token, name, i)))
+                for i in active
+            )
+            scores = dict()
+            for i, future in self._map(executor, pool.advance, tasks):
+                result = self._get_result(
+                    configs[i], future, iterations=n_iter, index=i
+                )
+                if result.ok:
+                    states[i] = future.result()[3]
+                    done[i] = n_iter
+                    scores[i] = result.score
+                yield result
+
+            if n_iter >= self._max_iter or self._stopped():
+                break
+            n_keep = max(len(active) // self._eta, 1)
+            active = sorted(scores, key=scores.get, reverse=True)[:n_keep]
+            n_iter = min(n_iter * self._eta, self._max_iter)
+        return
+
+    def _checkpoint_path(
+        self, token: str, name: str, idx: int
+    ) -> [str, None]:
+        """Gets the path to save a candidate's model to, if any"""
+        if self._checkpoint_dir is None:
+            return None
+        return os.path.join(
+            self._checkpoint_dir, '%s-%s-%d' % (token, name, idx)
+        )
+
+
+class Hyperband(SuccessiveHalving):
+    """
+    Hyperband search over model ``fit`` iterations
+
+    Runs a series of :class:`SuccessiveHalving` brackets, each trading
+    off the number of candidates against the number of iterations they
+    start with: from many candidates starting with few iterations, to a
+    few candidates trained for `max_iter` iterations from the start.
+
+    Parameters
+    ----------
+    model_cls : type
+        The :class:`Model` class to search hyper-parameters for.
+    max_iter : int, optional
+        Maximum number of ``fit`` iterations for any candidate (default
+        is 81).
+    eta : int, optional
+        Reduction factor for each round (default is 3).
+    kwargs : optional
+        Additional keyword-arguments for the :class:`SuccessiveHalving`
+        search.
+
+    """
+
+    def __init__(
+        self, model_cls: type, max_iter: int = 81, eta: int = 3, **kwargs
+    ):
+        super(Hyperband, self).__init__(
+            model_cls, max_iter=max_iter, eta=eta, **kwargs
+        )
+        return
+
+    @property
+    def brackets(self) -> List[tuple]:
+        """list: Number of candidates and initial iterations per bracket.
+        """
+        s_max = 0
+        while self._eta ** (s_max + 1) <= self._max_iter:
+            s_max += 1
+        ret = list()
+        for s in reversed(range(s_max + 1)):
+            n = int(math.ceil((s_max + 1) * self._eta ** s / (s + 1)))
+            ret.append((n, max(self._max_iter // self._eta ** s, 1)))
+        return ret
+
+    def _schedule(self, executor, token: str) -> Iterator[SearchResult]:
+        for i, (n, n_iter) in enumerate(self.brackets):
+            configs = [self._sample() for _ in range(n)]
+            yield from self._bracket(
+                executor, token, configs, n_iter, 'hb%d' % i
+            )
+            if self._stopped():
+                break
+        return
@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized hyper-parameter search spaces.
+"""
+#
+#   Imports
+#
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+import numpy as np
+
+from ..parameters.base import HyperParameter
+from ..parameters.mixins import get_step_count
+from ..parameters.mixins import get_step_index
+from .base import SearchException
+from .utils import get_bounds
+from .utils import get_hyper_parameters
+from .utils import is_integral
+
+
+#
+#   Constants
+#
+
+SAMPLING_METHODS = ('uniform', 'lhs', 'sobol')
+
+_HASH_PRIME = np.uint64(0x100000001b3)
+
+_SOBOL_BITS = 32
+
+# Primitive polynomial degree (s), coefficients (a) and initial direction
+# numbers (m) for dimensions 2+ of the Sobol sequence (Joe & Kuo, 2008).
+_SOBOL_PARAMS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+
+
+#
+#   Classes
+#
+
+class SearchSpace(object):
+    """
+    Vectorized search space over a model's hyper-parameters
+
+    Candidates are generated in batches as columnar arrays (a
+    :obj:`dict` of hyper-parameter name to :obj:`numpy.ndarray`), which
+    can be checked against all of the hyper-parameter specifications and
+    de-duplicated at once.
+
+    Parameters
+    ----------
+    model_cls : type
+        The :class:`Model` class (or an instance of it) to get the
+        hyper-parameters from.
+    space : dict, optional
+        Explicit values to use for (some of) the hyper-parameters, which
+        take precedence over the model's hyper-parameter specifications.
+
+    """
+
+    def __init__(
+        self, model_cls: type, space: [Dict[str, list], None] = None
+    ):
+        self._params = get_hyper_parameters(model_cls)
+        self._space = {k: list(v) for k, v in (space or dict()).items()}
+        return
+
+    def __repr__(self):
+        return '<%s [%s]>' % (self.__class__.__name__, ', '.join(self.names))
+
+    def __len__(self) -> int:
+        return len(self._params)
+
+    @property
+    def names(self) -> List[str]:
+        """list: Names of the hyper-parameters in this space."""
+        return list(self._params.keys())
+
+    def sample(
+        self, n: int, method: str = 'uniform', seed: [int, None] = None
+    ) -> Dict[str, np.ndarray]:
+        """Generates a batch of candidates from this space
+
+        Parameters
+        ----------
+        n : int
+            Number of candidates to generate.
+        method : str, optional
+            Sampling design to use: ``'uniform'`` (default) for
+            independent random draws, ``'lhs'`` for a Latin hypercube or
+            ``'sobol'`` for a (randomly shifted) Sobol sequence.
+        seed : int, optional
+            Seed for the random number generator.
+
+        Returns
+        -------
+        :obj:`dict` of :obj:`str`, :obj:`numpy.ndarray`
+            Columns of hyper-parameter values for the candidates.  Values
+            are drawn log-uniformly for log-scale hyper-parameters.
+
+        Raises
+        ------
+        ValueError
+            If the `method` given is not valid.
+
+        """
+        rng = np.random.default_rng(seed)
+        units = unit_sample(n, len(self._params), method=method, rng=rng)
+        return {
+            k: self._from_unit(k, v, units[:, i])
+            for i, (k, v) in enumerate(self._params.items())
+        }
+
+    def check(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Checks candidates against the hyper-parameter specifications
+
+        Parameters
+        ----------
+        columns : dict
+            Columns of hyper-parameter values to check.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the candidates which are valid.
+
+        """
+        ret = None
+        for k, v in self._params.items():
+            valid = self._check_column(k, v, np.asarray(columns[k]))
+            ret = valid if ret is None else ret & valid
+        return ret
+
+    @staticmethod
+    def unique(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Removes duplicate candidates
+
+        Parameters
+        ----------
+        columns : dict
+            Columns of hyper-parameter values.
+
+        Returns
+        -------
+        dict
+            Columns of the unique candidates, in order of first
+            occurrence.
+
+        """
+        if not columns:
+            return columns
+        keys = list()
+        hashes = np.zeros(len(next(iter(columns.values()))), dtype=np.uint64)
+        for v in columns.values():
+            v = np.asarray(v)
+            if v.dtype.kind in 'biuf':
+                key = v.astype(np.float64).view(np.uint64)
+            else:
+                key = np.unique(v, return_inverse=True)[1].ravel()
+                key = key.astype(np.uint64)
+            keys.append(key)
+            hashes = (hashes * _HASH_PRIME) ^ _mix(key)
+
+        # Stable sort by row hash, so equal rows are adjacent and the
+        # first of each group is the first occurrence
+        order = np.argsort(hashes, kind='stable')
+        same = hashes[order][1:] == hashes[order][:-1]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ~same
+        collided = False
+        for key in keys:
+            key = key[order]
+            differs = key[1:] != key[:-1]
+            collided = collided or bool(np.any(same & differs))
+            first[1:] |= differs
+        if collided:
+            # Distinct rows share a hash, so equal rows may not be
+            # adjacent: fall back to (stable) sorting on the full rows
+            order = np.lexsort(keys[::-1])
+            first[1:] = False
+            for key in keys:
+                key = key[order]
+                first[1:] |= key[1:] != key[:-1]
+        idx = np.sort(order[first])
+        return {k: v[idx] for k, v in columns.items()}
+
+    @staticmethod
+    def rows(columns: Dict[str, np.ndarray]) -> Iterator[Dict[str, object]]:
+        """Iterates over candidates as individual hyper-parameter sets
+
+        Parameters
+        ----------
+        columns : dict
+            Columns of hyper-parameter values.
+
+        Yields
+        ------
+        dict
+            Hyper-parameter values (as Python objects) of each candidate.
+
+        """
+        names = list(columns.keys())
+        for values in zip(*(v.tolist() for v in columns.values())):
+            yield dict(zip(names, values))
+
+    def _from_unit(
+        self, name: str, param: HyperParameter, units: np.ndarray
+    ) -> np.ndarray:
+        """Maps unit-interval samples to hyper-parameter values"""
+        choices = self._space.get(name, getattr(param, 'choices', None))
+        if choices is not None:
+            idx = np.minimum((units * len(choices)).astype(np.int64),
+                             len(choices) - 1)
+            return _as_array(choices)[idx]
+
+        intervals = getattr(param, 'intervals', None)
+        if intervals is not None:
+            lows = np.array([x[0] for x in intervals], dtype=float)
+            widths = np.array([x[1] - x[0] for x in intervals], dtype=float)
+            cum = np.cumsum(widths)
+            offsets = units * cum[-1]
+            idx = np.minimum(
+                np.searchsorted(cum, offsets, side='right'),
+                len(intervals) - 1
+            )
+            return lows[idx] + offsets - (cum[idx] - widths[idx])
+
+        low, high = get_bounds(param)
+        if low is None or high is None:
+            if param.default is not None:
+                return _as_array([param.default])[
+                    np.zeros(len(units), dtype=np.int64)
+                ]
+            raise SearchException(
+                "Cannot determine values to sample for: %s" % name
+            )
+
+        step = getattr(param, 'step', None)
+        if step is not None or is_integral(param):
+            step = step or 1
+            size = get_step_count(low, high, step)
+            idx = np.minimum((units * size).astype(np.int64), size - 1)
+            return np.minimum(low + step * idx, high)
+        elif getattr(param, 'log', False):
+            log_low, log_high = np.log(low), np.log(high)
+            return np.exp(log_low + units * (log_high - log_low))
+        return low + units * (high - low)
+
+    def _check_column(
+        self, name: str, param: HyperParameter, values: np.ndarray
+    ) -> np.ndarray:
+        """Checks a column of values against a hyper-parameter's spec"""
+        if name in self._space:
+            return np.isin(values, _as_array(self._space[name]))
+
+        choices = getattr(param, 'choices', None)
+        if choices is not None:
+            return np.isin(values, _as_array(choices))
+
+        ret = np.ones(len(values), dtype=bool)
+        intervals = getattr(param, 'intervals', None)
+        if intervals is not None:
+            lows = np.array([x[0] for x in intervals], dtype=float)
+            highs = np.array([x[1] for x in intervals], dtype=float)
+            idx = np.searchsorted(lows, values, side='right') - 1
+            ret &= (idx >= 0) & (values <= highs[np.maximum(idx, 0)])
+
+        for attr, check in (('minimum', np.greater), ('maximum', np.less),
+                            ('low', np.greater_equal),
+                            ('high', np.less_equal)):
+            bound = getattr(param, attr, None)
+            if bound is not None:
+                ret &= check(values, bound)
+
+        step = getattr(param, 'step', None)
+        if step is not None:
+            origin = getattr(param, 'low', None) or 0
+            ret &= get_step_index(values, origin, step)[1]
+        if getattr(param, 'log', False):
+            ret &= values > 0
+        if is_integral(param):
+            ret &= np.equal(np.mod(values, 1), 0)
+        return ret
+
+
+#
+#   Functions
+#
+
+def unit_sample(
+    n: int, d: int, method: str = 'uniform',
+    rng: [np.random.Generator, None] = None
+) -> np.ndarray:
+    """Generates samples from the unit hypercube
+
+    Parameters
+    ----------
+    n : int
+        Number of samples to generate.
+    d : int
+        Number of dimensions of the hypercube.
+    method : str, optional
+        Sampling design to use: ``'uniform'`` (default), ``'lhs'`` (Latin
+        hypercube) or ``'sobol'`` (Sobol sequence, with a random digital
+        shift).
+    rng : numpy.random.Generator, optional
+        Random number generator to use.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``(n, d)`` of samples in ``[0, 1)``.
+
+    Raises
+    ------
+    ValueError
+        If the `method` given is not valid, or if there are more
+        dimensions than are supported for Sobol sampling.
+
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if method == 'uniform':
+        return rng.random((n, d))
+    elif method == 'lhs':
+        ret = rng.random((n, d))
+        for i in range(d):
+            ret[:, i] = (rng.permutation(n) + ret[:, i]) / n
+        return ret
+    elif method == 'sobol':
+        return sobol_sample(n, d, rng=rng)
+    raise ValueError(
+        "Invalid sampling method: %s (must be one of: %s)" % (
+            method, ', '.join(SAMPLING_METHODS)
+        )
+    )
+
+
+def sobol_sample(
+    n: int, d: int, rng: [np.random.Generator, None] = None
+) -> np.ndarray:
+    """Generates points from a Sobol sequence
+
+    Parameters
+    ----------
+    n : int
+        Number of points to generate.
+    d : int
+        Number of dimensions (at most 21).
+    rng : numpy.random.Generator, optional
+        Random number generator to use for a random digital shift of the
+        points, if any (the first point is otherwise always zero).
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape ``(n, d)`` of points in ``[0, 1)``.
+
+    Raises
+    ------
+    ValueError
+        If there are more dimensions than are supported.
+
+    """
+    if d > len(_SOBOL_PARAMS) + 1:
+        raise ValueError(
+            "Sobol sampling supports at most %d dimensions" % (
+                len(_SOBOL_PARAMS) + 1
+            )
+        )
+    directions = np.vstack([
+        np.zeros((1, d), dtype=np.uint64), _sobol_directions(d)
+    ])
+    # Gray-code ordering: point i differs from point i - 1 by the
+    # direction number of the lowest set bit of i
+    idx = np.arange(n, dtype=np.int64)
+    lowest = np.log2(idx & -idx, where=idx > 0, out=np.full(n, -1.0))
+    ret = np.bitwise_xor.accumulate(
+        directions[lowest.astype(np.int64) + 1], axis=0
+    )
+    if rng is not None:
+        ret ^= rng.integers(
+            0, 2 ** _SOBOL_BITS, size=d, dtype=np.uint64
+        )
+    return ret / float(2 ** _SOBOL_BITS)
+
+
+def _sobol_directions(d: int) -> np.ndarray:
+    """Gets the Sobol direction numbers for the first `d` dimensions"""
+    ret = np.zeros((_SOBOL_BITS, d), dtype=np.uint64)
+    for k in range(_SOBOL_BITS):
+        ret[k, 0] = 1 << (_SOBOL_BITS - 1 - k)
+    for j in range(1, d):
+        s, a, m_init = _SOBOL_PARAMS[j - 1]
+        m = list(m_init)
+        for k in range(s, _SOBOL_BITS):
+            new = m[k - s] ^ (m[k - s] << s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    new ^= m[k - i] << i
+            m.append(new)
+        for k in range(_SOBOL_BITS):
+            ret[k, j] = m[k] << (_SOBOL_BITS - 1 - k)
+    return ret
+
+
+def _mix(key: np.ndarray) -> np.ndarray:
+    """Scrambles the bits of the given keys (SplitMix64 finalizer)"""
+    with np.errstate(over='ignore'):
+        key = (key ^ (key >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+        key = (key ^ (key >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return key ^ (key >> np.uint64(31))
+
+
+def _as_array(values: list) -> np.ndarray:
+    """Converts a list of values to an array (of objects if needed)"""
+    ret = np.asarray(values)
+    if ret.dtype.kind not in 'biufUS':
+        ret = np.empty(len(values), dtype=object)
+        ret[:] = values
+    return ret
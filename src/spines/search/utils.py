@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Utilities for the search subpackage.
+"""
+#
+#   Imports
+#
+import math
+from random import Random
+from typing import Dict
+from typing import List
+
+from ..core.utils import get_class_parameters
+from ..parameters.base import HyperParameter
+from ..parameters.mixins import get_step_count
+from .base import SearchException
+
+
+#
+#   Functions
+#
+
+def get_hyper_parameters(model_cls: type) -> Dict[str, HyperParameter]:
+    """Gets the hyper-parameter specifications for a model class
+
+    Parameters
+    ----------
+    model_cls : type
+        Model class to get the hyper-parameters of.
+
+    Returns
+    -------
+    :obj:`dict` of :obj:`str`, :obj:`HyperParameter`
+        Hyper-parameter names and specifications for the model class.
+
+    """
+    if not isinstance(model_cls, type):
+        model_cls = model_cls.__class__
+    return get_class_parameters(model_cls, HyperParameter)
+
+
+def get_bounds(param: HyperParameter) -> tuple:
+    """Gets the lower and upper bounds of a hyper-parameter
+
+    Inclusive (``low``/``high``) bounds are used if set, otherwise the
+    exclusive ``minimum``/``maximum`` bounds are used (adjusted inwards
+    by one for integer parameters).
+
+    Parameters
+    ----------
+    param : HyperParameter
+        Hyper-parameter to get the bounds for.
+
+    Returns
+    -------
+    tuple
+        Lower and upper bound for the parameter's values (either of
+        which may be :obj:`None` if not bounded).
+
+    """
+    low = getattr(param, 'low', None)
+    high = getattr(param, 'high', None)
+    integral = is_integral(param)
+    if low is None:
+        low = getattr(param, 'minimum', None)
+        if low is not None and integral:
+            low = math.floor(low) + 1
+    if high is None:
+        high = getattr(param, 'maximum', None)
+        if high is not None and integral:
+            high = math.ceil(high) - 1
+    return low, high
+
+
+def is_integral(param: HyperParameter) -> bool:
+    """Whether or not the given parameter only takes integer values
+
+    Parameters
+    ----------
+    param : HyperParameter
+        Hyper-parameter to check.
+
+    Returns
+    -------
+    bool
+        Whether or not the parameter's values are integers.
+
+    """
+    return all(issubclass(x, int) for x in param.value_type)
+
+
+def grid_values(param: HyperParameter, num: int = 5) -> List:
+    """Gets the values of a hyper-parameter to search over on a grid
+
+    Parameters
+    ----------
+    param : HyperParameter
+        Hyper-parameter to get the grid of values for.
+    num : int, optional
+        Number of values to use for continuous parameters (default is
+        5).
+
+    Returns
+    -------
+    list
+        Values of the parameter to search over.
+
+    Raises
+    ------
+    SearchException
+        If a grid of values can't be determined for the parameter.
+
+    """
+    choices = getattr(param, 'choices', None)
+    if choices is not None:
+        return list(choices)
+
+    intervals = getattr(param, 'intervals', None)
+    if intervals is not None:
+        width = param.measure / num
+        return [
+            _interval_value(intervals, width * (i + 0.5)) for i in range(num)
+        ]
+
+    low, high = get_bounds(param)
+    if low is None or high is None:
+        if param.default is not None:
+            return [param.default]
+        raise SearchException(
+            "Cannot determine values to search for: %s" % param.name
+        )
+
+    step = getattr(param, 'step', None)
+    if step is not None:
+        return list(_step_range(low, high, step))
+    elif is_integral(param):
+        n = high - low + 1
+        if n <= num:
+            return list(range(low, high + 1))
+        return sorted(set(
+            low + round(i * (n - 1) / max(num - 1, 1)) for i in range(num)
+        ))
+    elif getattr(param, 'log', False):
+        ratio = (high / low) ** (1.0 / max(num - 1, 1))
+        return [low * ratio ** i for i in range(num)]
+    elif getattr(param, 'low', None) is None:
+        width = (high - low) / num
+        return [low + width * (i + 0.5) for i in range(num)]
+    width = (high - low) / max(num - 1, 1)
+    return [low + width * i for i in range(num)]
+
+
+def sample_value(param: HyperParameter, rng: Random):
+    """Draws a random value for a hyper-parameter
+
+    Parameters
+    ----------
+    param : HyperParameter
+        Hyper-parameter to draw a value for.
+    rng : Random
+        Random number generator to use.
+
+    Returns
+    -------
+    object
+        Random value for the parameter.
+
+    Raises
+    ------
+    SearchException
+        If the parameter can't be sampled from.
+
+    """
+    choices = getattr(param, 'choices', None)
+    if choices is not None:
+        return rng.choice(choices)
+
+    intervals = getattr(param, 'intervals', None)
+    if intervals is not None:
+        return _interval_value(intervals, rng.uniform(0, param.measure))
+
+    low, high = get_bounds(param)
+    if low is None or high is None:
+        if param.default is not None:
+            return param.default
+        raise SearchException(
+            "Cannot determine values to sample for: %s" % param.name
+        )
+
+    step = getattr(param, 'step', None)
+    if step is not None:
+        idx = rng.randint(0, get_step_count(low, high, step) - 1)
+        return min(low + step * idx, high)
+    elif is_integral(param):
+        return rng.randint(low, high)
+    elif getattr(param, 'log', False):
+        return math.exp(rng.uniform(math.log(low), math.log(high)))
+    return rng.uniform(low, high)
+
+
+def _step_range(low, high, step):
+    """Generates the values from low to high (inclusive) by step"""
+    for i in range(get_step_count(low, high, step)):
+        yield min(low + i * step, high)
+
+
+def _interval_value(intervals, offset):
+    """Maps an offset into the total length of the intervals to a value
+    """
+    for low, high in intervals:
+        if offset <= high - low:
+            return low + offset
+        offset -= high - low
+    return intervals[-1][1]
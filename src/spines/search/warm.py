@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Warm-starting of model fits from previously fitted neighbours.
+"""
+#
+#   Imports
+#
+from collections import OrderedDict
+import math
+import numbers
+import threading
+from typing import Dict
+from typing import Tuple
+
+import numpy as np
+
+from ..parameters.base import HyperParameter
+from .cache import get_hyper_hash
+from .utils import get_bounds
+from .utils import get_hyper_parameters
+
+
+#
+#   Classes
+#
+
+class WarmStartIndex(object):
+    """
+    Index of recently fitted models for warm-starting new fits
+
+    Stores the fitted parameter values for the most recently fitted
+    hyper-parameter configurations of a model class, and finds the
+    nearest of them to a new configuration.  Hyper-parameters are
+    compared on a common scale: bounded numeric values are mapped onto
+    the unit interval (log-scaled for log-scale parameters) and
+    categorical values (choices) count as a distance of one when they
+    differ.
+
+    Parameters
+    ----------
+    model_cls : type
+        The :class:`Model` class the fitted models are for.
+    space : dict, optional
+        Explicit values used for (some of) the hyper-parameters, as for
+        the searches, used to scale those hyper-parameters.
+    maxsize : int, optional
+        Maximum number of fitted models to keep (default is 128), the
+        least recently added are dropped first.
+
+    """
+
+    def __init__(
+        self, model_cls: type, space: [Dict[str, list], None] = None,
+        maxsize: int = 128
+    ):
+        if maxsize < 1:
+            raise ValueError("The maximum size must be at least 1")
+        self._scales = {
+            k: _get_scale(v, (space or dict()).get(k))
+            for k, v in get_hyper_parameters(model_cls).items()
+        }
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._matrix = None
+        self._lock = threading.Lock()
+        return
+
+    def __repr__(self):
+        return '<%s size=%s/%s>' % (
+            self.__class__.__name__, len(self), self._maxsize
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        return
+
+    @property
+    def maxsize(self) -> int:
+        """int: Maximum number of fitted models kept."""
+        return self._maxsize
+
+    def add(self, hyper_params: Dict[str, object],
+            params: Dict[str, object]) -> None:
+        """Adds a fitted model to the index
+
+        Parameters
+        ----------
+        hyper_params : dict
+            Hyper-parameter values the model was fitted with.
+        params : dict
+            Fitted parameter values of the model.
+
+        """
+        key = get_hyper_hash(hyper_params)
+        entry = (dict(hyper_params), dict(params), self._encode(hyper_params))
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+            self._matrix = None
+        return
+
+    def nearest(self, hyper_params: Dict[str, object]) -> [Tuple, None]:
+        """Finds the nearest fitted model to the given hyper-parameters
+
+        Parameters
+        ----------
+        hyper_params : dict
+            Hyper-parameter values to find the nearest fitted model to.
+
+        Returns
+        -------
+        tuple
+            The hyper-parameter values, fitted parameter values and
+            distance of the nearest fitted model (ties are broken by the
+            most recently added), or :obj:`None` if the index is empty.
+
+        """
+        numeric, labels = self._encode(hyper_params)
+        with self._lock:
+            if not self._entries:
+                return None
+            if self._matrix is None:
+                entries = list(self._entries.values())
+                self._matrix = (
+                    entries,
+                    np.array([x[2][0] for x in entries], dtype=float),
+                    [x[2][1] for x in entries],
+                )
+            entries, matrix, entry_labels = self._matrix
+
+        dists = np.nansum(
+            (matrix - np.array(numeric, dtype=float)) ** 2, axis=1
+        ) if numeric else np.zeros(len(entries))
+        dists += np.array([
+            sum(a != b for a, b in zip(x, labels)) for x in entry_labels
+        ], dtype=float)
+        idx = len(dists) - 1 - int(np.argmin(dists[::-1]))
+        hyper, params, _ = entries[idx]
+        return hyper, params, math.sqrt(dists[idx])
+
+    def clear(self) -> None:
+        """Removes all of the fitted models from the index"""
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+        return
+
+    def _encode(self, hyper_params: Dict[str, object]) -> Tuple[list, list]:
+        """Encodes hyper-parameter values as numeric and label values"""
+        numeric, labels = list(), list()
+        for k, scale in self._scales.items():
+            value = hyper_params.get(k)
+            if scale is None:
+                labels.append(value)
+            elif value is None:
+                numeric.append(np.nan)
+            else:
+                offset, width, log = scale
+                if log:
+                    value = math.log(value)
+                numeric.append((value - offset) / width)
+        return numeric, labels
+
+
+#
+#   Functions
+#
+
+def _get_scale(param: HyperParameter, values: [list, None] = None
+               ) -> [Tuple[float, float, bool], None]:
+    """Gets the offset, width and whether or not to log-scale a
+    hyper-parameter's values (or :obj:`None` if they're categorical)"""
+    choices = values if values is not None else getattr(param, 'choices', None)
+    if choices is not None:
+        if not all(isinstance(x, numbers.Real) for x in choices):
+            return None
+        low, high = min(choices), max(choices)
+    else:
+        intervals = getattr(param, 'intervals', None)
+        if intervals is not None:
+            low, high = intervals[0][0], intervals[-1][1]
+        else:
+            low, high = get_bounds(param)
+        if not all(issubclass(x, numbers.Real) for x in param.value_type):
+            return None
+
+    if low is None or high is None or high <= low:
+        return 0.0, 1.0, False
+    if getattr(param, 'log', False) and low > 0:
+        return math.log(low), math.log(high) - math.log(low), True
+    return low, high - low, False
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+Model serving subpackage for spines.
+"""
+from .batching import BatchingMetrics
+from .batching import BatchingPredictor
+from .server import ModelServer
+from .server import ModelSource
+
+__all__ = [
+    # Predictors
+    'BatchingPredictor',
+    # Servers
+    'ModelServer',
+    'ModelSource',
+    # Metrics
+    'BatchingMetrics',
+]
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-batching of individual prediction requests.
+"""
+#
+#   Imports
+#
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+import statistics
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Type
+
+import numpy as np
+
+from ..model import Model
+
+
+#
+#   Classes
+#
+
+class BatchingMetrics(object):
+    """
+    Running metrics for a :class:`BatchingPredictor`
+
+    Parameters
+    ----------
+    window : int, optional
+        Number of the most recent requests to compute latency statistics
+        over (default is 10000).
+
+    """
+
+    def __init__(self, window: int = 10000):
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.max_batch_size = 0
+        self._latencies = deque(maxlen=window)
+
+    def __repr__(self):
+        return '<%s requests=%s batches=%s>' % (
+            self.__class__.__name__, self.requests, self.batches
+        )
+
+    @property
+    def mean_batch_size(self) -> float:
+        """float: Mean number of requests per batch."""
+        if not self.batches:
+            return 0.0
+        return self.requests / self.batches
+
+    def latency(self, quantile: float = 0.5) -> [float, None]:
+        """Gets a quantile of the recent request latencies
+
+        Parameters
+        ----------
+        quantile : float, optional
+            Quantile to get (default is 0.5, the median).
+
+        Returns
+        -------
+        float
+            Latency (in seconds) from each request being made to its
+            result being available, or :obj:`None` if there have been no
+            requests.
+
+        """
+        if not self._latencies:
+            return None
+        return float(np.quantile(self._latencies, quantile))
+
+    def record(self, latencies: List[float], failed: bool = False) -> None:
+        """Records the metrics for a batch
+
+        Parameters
+        ----------
+        latencies : list
+            Latency (in seconds) of each request in the batch.
+        failed : bool, optional
+            Whether or not the batch failed.
+
+        """
+        self.requests += len(latencies)
+        self.batches += 1
+        self.errors += int(failed)
+        self.max_batch_size = max(self.max_batch_size, len(latencies))
+        self._latencies.extend(latencies)
+        return
+
+    def to_dict(self) -> Dict[str, float]:
+        """Gets a summary of the metrics
+
+        Returns
+        -------
+        dict
+            The request, batch and error counts, mean and maximum batch
+            size and the mean, median and 99th percentile latency.
+
+        """
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'errors': self.errors,
+            'mean_batch_size': self.mean_batch_size,
+            'max_batch_size': self.max_batch_size,
+            'mean_latency': (
+                statistics.mean(self._latencies) if self._latencies
+                else None
+            ),
+            'p50_latency': self.latency(0.5),
+            'p99_latency': self.latency(0.99),
+        }
+
+
+class BatchingPredictor(object):
+    """
+    Collects concurrent prediction requests into batches
+
+    Each request (``await predictor(x)``) is for a single input.  The
+    requests made while the previous batch is being predicted are
+    gathered into the next batch (of up to `max_batch_size`, waiting at
+    most `max_wait` seconds after the first request for more), which is
+    predicted with a single vectorized call and each result is returned
+    to the request it's for.
+
+    Parameters
+    ----------
+    model : Model
+        The (fitted) model to make predictions with.
+    max_batch_size : int, optional
+        Maximum number of requests in each batch (default is 64).
+    max_wait : float, optional
+        Maximum time (in seconds) to wait to fill a batch after its
+        first request (default is 0.005).
+    executor : Executor, optional
+        Executor to run the model's predictions in, if any (default is
+        to run them in the event loop's thread).
+    collate : callable, optional
+        Function to combine the inputs of a batch into the input for the
+        model's ``predict`` (default is :func:`numpy.asarray`).
+    kwargs : optional
+        Additional keyword-arguments to pass to each ``predict`` call.
+
+    """
+
+    def __init__(
+        self, model: Type[Model], max_batch_size: int = 64,
+        max_wait: float = 0.005, executor: [Executor, None] = None,
+        collate: Callable = np.asarray, **kwargs
+    ):
+        if max_batch_size < 1:
+            raise ValueError("The maximum batch size must be at least 1")
+        self._model = model
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._executor = executor
+        self._collate = collate
+        self._kwargs = kwargs
+        self._metrics = BatchingMetrics()
+        self._queue = None
+        self._worker = None
+        return
+
+    def __repr__(self):
+        return '<%s model=%s max_batch_size=%s>' % (
+            self.__class__.__name__, self._model, self._max_batch_size
+        )
+
+    async def __call__(self, x):
+        """Predicts the output for a single input
+
+        Parameters
+        ----------
+        x
+            Input to predict the output for.
+
+        Returns
+        -------
+        object
+            Predicted output for the input.
+
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((x, future, time.perf_counter()))
+        return await future
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+        return
+
+    @property
+    def model(self) -> Type[Model]:
+        """Model: The model predictions are made with."""
+        return self._model
+
+    @property
+    def metrics(self) -> BatchingMetrics:
+        """BatchingMetrics: Metrics for the batches predicted so far."""
+        return self._metrics
+
+    async def close(self) -> None:
+        """Stops batching requests
+
+        Any requests which haven't yet been predicted are cancelled.
+
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait()[1].cancel()
+        return
+
+    async def _run(self) -> None:
+        """Gathers and predicts batches of requests until cancelled"""
+        batch = list()
+        try:
+            while True:
+                await self._fill_batch(batch)
+                await self._predict(batch)
+                batch.clear()
+        finally:
+            for _, future, _ in batch:
+                future.cancel()
+
+    async def _fill_batch(self, batch: List[tuple]) -> None:
+        """Waits for the next batch of requests"""
+        batch.append(await self._queue.get())
+        deadline = time.perf_counter() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), remaining)
+                )
+            except asyncio.TimeoutError:
+                break
+        return
+
+    async def _predict(self, batch: List[tuple]) -> None:
+        """Predicts a batch and returns the results to their requests"""
+        failed = False
+        try:
+            inputs = self._collate([x[0] for x in batch])
+            if self._executor is None:
+                outputs = self._predict_helper(inputs, len(batch))
+            else:
+                outputs = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._predict_helper, inputs, len(batch)
+                )
+        except Exception as ex:
+            failed = True
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(ex)
+        else:
+            for (_, future, _), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+
+        now = time.perf_counter()
+        self._metrics.record([now - x[2] for x in batch], failed=failed)
+        return
+
+    def _predict_helper(self, inputs, n: int):
+        """Runs the model's prediction for a batch of inputs"""
+        outputs = self._model.predict(inputs, **self._kwargs)
+        if len(outputs) != n:
+            raise ValueError(
+                "Output for a batch must be the same length as the batch"
+            )
+        return outputs
@@ -0,0 +1,538 @@
+# -*- coding: utf-8 -*-
+"""
+Pre-forking HTTP server for saved models.
+"""
+#
+#   Imports
+#
+import gc
+from http.server import BaseHTTPRequestHandler
+import json
+import logging
+import os
+import signal
+import socket
+import socketserver
+import stat
+import threading
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Type
+
+import numpy as np
+
+from ..model import Model
+from ..utils.concurrency import get_worker_count
+
+
+#
+#   Constants
+#
+
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tar.bz2', '.tar.xz')
+
+_POLL_INTERVAL = 0.1
+
+_LOGGER = logging.getLogger(__name__)
+
+
+#
+#   Classes
+#
+
+class ModelSource(object):
+    """
+    Loads (and re-loads) a model from a saved archive
+
+    Parameters
+    ----------
+    path : str
+        Path to the model archive to serve, or to a directory of model
+        archives (in which case the most recently modified one is
+        served).
+
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._key = None
+        self._current = (None, 0, None)
+        return
+
+    def __repr__(self):
+        return '<%s path="%s" version=%s>' % (
+            self.__class__.__name__, self._path, self.version
+        )
+
+    @property
+    def path(self) -> str:
+        """str: Path to the archive (or directory of archives) served."""
+        return self._path
+
+    @property
+    def current(self) -> Tuple[Type[Model], int, str]:
+        """tuple: The current model, its version and archive path."""
+        return self._current
+
+    @property
+    def model(self) -> [Type[Model], None]:
+        """Model: The currently loaded model."""
+        return self._current[0]
+
+    @property
+    def version(self) -> int:
+        """int: Number of times a model has been loaded (0 if none)."""
+        return self._current[1]
+
+    @property
+    def archive(self) -> [str, None]:
+        """str: Path to the archive the current model was loaded from."""
+        return self._current[2]
+
+    def check(self) -> bool:
+        """Loads the model again if the archive has changed
+
+        Returns
+        -------
+        bool
+            Whether or not a new model was loaded.
+
+        Raises
+        ------
+        FileNotFoundError
+            If there's no model archive at the path.
+
+        """
+        archive = find_archive(self._path)
+        info = os.stat(archive)
+        key = (archive, info.st_mtime_ns, info.st_size)
+        if key == self._key:
+            return False
+        model = Model.load(archive)
+        self._current = (model, self.version + 1, archive)
+        self._key = key
+        return True
+
+    def reload(self) -> bool:
+        """Checks for a new model, logging (rather than raising) errors
+
+        Returns
+        -------
+        bool
+            Whether or not a new model was loaded.
+
+        """
+        try:
+            ret = self.check()
+        except Exception:
+            _LOGGER.exception("Failed to load model from %s", self._path)
+            return False
+        if ret:
+            _LOGGER.info(
+                "Loaded model version %s from %s", self.version, self.archive
+            )
+        return ret
+
+
+class ModelServer(object):
+    """
+    HTTP server for making predictions with a saved model
+
+    The model is loaded once by the parent process, which then forks the
+    given number of `workers` to handle requests on a shared listening
+    socket (the loaded model is shared copy-on-write, with the garbage
+    collector's tracked objects frozen before forking so that collections
+    in the workers don't touch them).  The parent checks the archive
+    every `reload_interval` seconds and, when a new version is found,
+    loads it and forks a new set of workers before gracefully stopping
+    the old ones (which finish any requests they've accepted), so no
+    requests are dropped while swapping models.
+
+    The server responds to:
+
+    * ``POST /predict`` with a JSON body of ``{"inputs": [...]}`` (or
+      just the list of inputs), returning ``{"outputs": [...],
+      "version": ...}``.
+    * ``GET /health``, returning the status and the version and path of
+      the model being served.
+
+    Parameters
+    ----------
+    path : str
+        Path to the model archive to serve, or to a directory of model
+        archives (in which case the most recently modified is served).
+    host : str, optional
+        Host to listen on (default is ``'127.0.0.1'``).
+    port : int, optional
+        Port to listen on (default is 8000, use 0 for any free port).
+    socket_path : str, optional
+        Path to listen on as a Unix socket instead of `host` and `port`.
+    workers : int, optional
+        Number of worker processes to fork (default is the number of CPUs
+        available), or 0 to serve requests in this process (and thread).
+    reload_interval : float, optional
+        Time (in seconds) between checks for a new model version (default
+        is 1.0), or :obj:`None` to never reload.
+
+    """
+
+    def __init__(
+        self, path: str, host: str = '127.0.0.1', port: int = 8000,
+        socket_path: [str, None] = None, workers: [int, None] = None,
+        reload_interval: [float, None] = 1.0
+    ):
+        if workers is None:
+            workers = get_worker_count(workers)
+        if workers < 0:
+            raise ValueError("The number of workers can't be negative")
+        if workers and not hasattr(os, 'fork'):
+            raise ValueError(
+                "Forking workers isn't supported on this platform"
+            )
+        self._source = ModelSource(path)
+        self._source.check()
+        self._workers = workers
+        self._reload_interval = reload_interval
+        self._socket_path = socket_path
+        self._socket = create_socket(host, port, socket_path)
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._reload_now = False
+        self._server = None
+        self._children = dict()
+        return
+
+    def __repr__(self):
+        return '<%s address=%s workers=%s>' % (
+            self.__class__.__name__, self.address, self._workers
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.server_close()
+        return
+
+    @property
+    def address(self) -> [Tuple[str, int], str]:
+        """tuple or str: Address (or socket path) being listened on."""
+        return self._socket.getsockname()
+
+    @property
+    def source(self) -> ModelSource:
+        """ModelSource: Source of the model being served."""
+        return self._source
+
+    def serve_forever(self) -> None:
+        """Serves requests until :meth:`shutdown` is called
+
+        When forking workers, this must be called from the main thread
+        (the parent process stops on ``SIGTERM`` or ``SIGINT`` and checks
+        for a new model version immediately on ``SIGHUP``).
+
+        """
+        self._stop.clear()
+        if self._workers:
+            self._serve_forked()
+        else:
+            self._serve_inline()
+        return
+
+    def shutdown(self) -> None:
+        """Stops serving requests"""
+        self._stop.set()
+        self._wake.set()
+        if self._server is not None:
+            self._server.shutdown()
+        return
+
+    def server_close(self) -> None:
+        """Closes the listening socket"""
+        self._socket.close()
+        if self._socket_path and os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        return
+
+    def _serve_inline(self) -> None:
+        """Serves requests in this process, reloading on a thread"""
+        self._server = _HTTPServer(self._socket, self._source)
+        watcher = None
+        if self._reload_interval is not None:
+            watcher = threading.Thread(target=self._watch, daemon=True)
+            watcher.start()
+        try:
+            self._server.serve_forever(poll_interval=_POLL_INTERVAL)
+        finally:
+            self._stop.set()
+            self._server = None
+            if watcher is not None:
+                watcher.join()
+        return
+
+    def _watch(self) -> None:
+        """Checks for new model versions until stopped"""
+        while not self._stop.wait(self._reload_interval):
+            self._source.reload()
+        return
+
+    def _serve_forked(self) -> None:
+        """Serves requests on forked worker processes"""
+        self._socket.setblocking(False)
+        handlers = {
+            signal.SIGTERM: signal.signal(signal.SIGTERM, self._on_stop),
+            signal.SIGINT: signal.signal(signal.SIGINT, self._on_stop),
+            signal.SIGHUP: signal.signal(signal.SIGHUP, self._on_reload),
+        }
+        try:
+            self._spawn(self._workers)
+            while not self._stop.is_set():
+                self._wake.wait(self._reload_interval or _POLL_INTERVAL)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                self._reap()
+                if self._reload_interval is None and not self._reload_now:
+                    continue
+                self._reload_now = False
+                if self._source.reload():
+                    old = list(self._children)
+                    self._spawn(self._workers)
+                    self._terminate(old)
+        finally:
+            self._terminate(list(self._children))
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        return
+
+    def _on_stop(self, signum, frame) -> None:
+        """Signal handler to stop the server"""
+        self._stop.set()
+        self._wake.set()
+        return
+
+    def _on_reload(self, signum, frame) -> None:
+        """Signal handler to check for a new model version"""
+        self._reload_now = True
+        self._wake.set()
+        return
+
+    def _spawn(self, n: int) -> List[int]:
+        """Forks new worker processes for the current model"""
+        gc.collect()
+        gc.freeze()
+        try:
+            ret = [self._fork() for _ in range(n)]
+        finally:
+            gc.unfreeze()
+        return ret
+
+    def _fork(self) -> int:
+        """Forks a single worker process"""
+        pid = os.fork()
+        if pid:
+            self._children[pid] = self._source.version
+            return pid
+        status = 1
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            server = _HTTPServer(self._socket, self._source, os.getppid())
+            signal.signal(
+                signal.SIGTERM, lambda *args: threading.Thread(
+                    target=server.shutdown, daemon=True
+                ).start()
+            )
+            server.serve_forever(poll_interval=_POLL_INTERVAL)
+            status = 0
+        except BaseException:
+            _LOGGER.exception("Worker %s failed", os.getpid())
+        finally:
+            os._exit(status)
+
+    def _reap(self) -> None:
+        """Replaces any workers for the current model which have died"""
+        for pid in list(self._children):
+            if os.waitpid(pid, os.WNOHANG)[0]:
+                version = self._children.pop(pid)
+                if version == self._source.version:
+                    _LOGGER.warning("Worker %s died, restarting it", pid)
+                    self._spawn(1)
+        return
+
+    def _terminate(self, pids: List[int]) -> None:
+        """Gracefully stops the given workers and waits for them"""
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            self._children.pop(pid, None)
+        return
+
+
+class _HTTPServer(socketserver.TCPServer):
+    """
+    Serves requests on an existing listening socket
+    """
+
+    def __init__(self, sock: socket.socket, source: ModelSource,
+                 parent: [int, None] = None):
+        socketserver.BaseServer.__init__(
+            self, sock.getsockname(), _RequestHandler
+        )
+        self.socket = sock
+        self.source = source
+        self._parent = parent
+
+    def get_request(self):
+        conn, addr = self.socket.accept()
+        conn.setblocking(True)
+        return conn, addr
+
+    def service_actions(self):
+        if self._parent is not None and os.getppid() != self._parent:
+            threading.Thread(target=self.shutdown, daemon=True).start()
+        return
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles prediction and health-check requests
+    """
+
+    def do_GET(self):
+        if self.path != '/health':
+            return self._respond(404, {'error': 'Not found'})
+        source = self.server.source
+        return self._respond(200, {
+            'status': 'ok',
+            'version': source.version,
+            'archive': source.archive,
+            'pid': os.getpid(),
+        })
+
+    def do_POST(self):
+        if self.path != '/predict':
+            return self._respond(404, {'error': 'Not found'})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'null')
+            if isinstance(body, dict):
+                body = body['inputs']
+            if not isinstance(body, list):
+                raise ValueError("The inputs must be a list")
+        except (KeyError, ValueError) as ex:
+            return self._respond(400, {'error': 'Invalid request: %s' % ex})
+
+        model, version, _ = self.server.source.current
+        try:
+            outputs = model.predict(np.asarray(body))
+        except Exception as ex:
+            return self._respond(500, {'error': str(ex)})
+        return self._respond(200, {'outputs': outputs, 'version': version})
+
+    def log_message(self, format, *args):
+        _LOGGER.debug(format, *args)
+        return
+
+    def _respond(self, code: int, content: Dict[str, object]) -> None:
+        """Sends a JSON response"""
+        data = json.dumps(content, default=_to_json).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        return
+
+
+#
+#   Functions
+#
+
+def find_archive(path: str) -> str:
+    """Finds the model archive to serve
+
+    Parameters
+    ----------
+    path : str
+        Path to a model archive, or to a directory of model archives.
+
+    Returns
+    -------
+    str
+        The `path` itself, if it's a file, otherwise the most recently
+        modified archive in the directory.
+
+    Raises
+    ------
+    FileNotFoundError
+        If there's no archive at the given path.
+
+    """
+    if not os.path.isdir(path):
+        if not os.path.isfile(path):
+            raise FileNotFoundError("No model archive at: %s" % path)
+        return path
+    archives = [
+        os.path.join(path, x) for x in os.listdir(path)
+        if x.endswith(ARCHIVE_EXTENSIONS)
+    ]
+    if not archives:
+        raise FileNotFoundError("No model archives in: %s" % path)
+    return max(archives, key=lambda x: (os.stat(x).st_mtime_ns, x))
+
+
+def create_socket(host: str = '127.0.0.1', port: int = 8000,
+                  socket_path: [str, None] = None) -> socket.socket:
+    """Creates a listening socket
+
+    Parameters
+    ----------
+    host : str, optional
+        Host to listen on (default is ``'127.0.0.1'``).
+    port : int, optional
+        Port to listen on (default is 8000, use 0 for any free port).
+    socket_path : str, optional
+        Path to listen on as a Unix socket instead of `host` and `port`.
+
+    Returns
+    -------
+    socket.socket
+        The bound and listening socket.
+
+    """
+    if socket_path is not None:
+        if (os.path.exists(socket_path)
+                and stat.S_ISSOCK(os.stat(socket_path).st_mode)):
+            os.unlink(socket_path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = socket_path
+    else:
+        family = socket.AF_INET6 if ':' in host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        address = (host, port)
+    try:
+        sock.bind(address)
+        sock.listen(socket.SOMAXCONN)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def _to_json(obj):
+    """Converts numpy values to JSON serializable values"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(
+        "Object of type %s is not JSON serializable" % type(obj).__name__
+    )
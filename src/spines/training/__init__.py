@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Model training subpackage for spines.
+"""
+from .checkpoint import load_checkpoint
+from .checkpoint import save_checkpoint
+from .core import Trainer
+from .core import TrainingResult
+from .parallel import ParallelTrainer
+from .sources import ArraySource
+from .sources import CSVSource
+from .sources import DataSource
+from .sources import IterableSource
+from .sources import NpySource
+from .sources import get_source
+from .stopping import Patience
+from .stopping import StoppingCriterion
+from .stopping import TimeBudget
+from .stopping import Tolerance
+
+__all__ = [
+    # Trainers
+    'Trainer',
+    'ParallelTrainer',
+    'TrainingResult',
+    # Data sources
+    'DataSource',
+    'ArraySource',
+    'CSVSource',
+    'IterableSource',
+    'NpySource',
+    # Stopping criteria
+    'StoppingCriterion',
+    'Patience',
+    'TimeBudget',
+    'Tolerance',
+    # Functions
+    'get_source',
+    'load_checkpoint',
+    'save_checkpoint',
+]
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoints for resuming training runs.
+"""
+#
+#   Imports
+#
+import os
+import pickle
+import random
+import tempfile
+from typing import Dict
+
+import numpy as np
+
+
+#
+#   Constants
+#
+
+CHECKPOINT_VERSION = 1
+
+
+#
+#   Functions
+#
+
+def save_checkpoint(path: str, state: Dict[str, object]) -> str:
+    """Saves a training checkpoint, atomically
+
+    The checkpoint is written to a temporary file (in the same
+    directory) which is then renamed to the `path`, so an interrupted
+    write never leaves a partial checkpoint in place of the last
+    complete one.
+
+    Parameters
+    ----------
+    path : str
+        Path to save the checkpoint to.
+    state : dict
+        The training state to save.
+
+    Returns
+    -------
+    str
+        Path of the saved checkpoint.
+
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    state = dict(state, version=CHECKPOINT_VERSION)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix='.%s-' % os.path.basename(path), suffix='.tmp', dir=directory
+    )
+    try:
+        with os.fdopen(fd, 'wb') as fout:
+            pickle.dump(state, fout, protocol=pickle.HIGHEST_PROTOCOL)
+            fout.flush()
+            os.fsync(fout.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return path
+
+
+def load_checkpoint(path: str) -> Dict[str, object]:
+    """Loads a training checkpoint
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint to load.
+
+    Returns
+    -------
+    dict
+        The training state saved.
+
+    Raises
+    ------
+    ValueError
+        If the file isn't a (supported) training checkpoint.
+
+    """
+    with open(path, 'rb') as fin:
+        state = pickle.load(fin)
+    if not isinstance(state, dict) or 'version' not in state:
+        raise ValueError("Not a training checkpoint: %s" % path)
+    if state['version'] > CHECKPOINT_VERSION:
+        raise ValueError(
+            "Unsupported checkpoint version: %s" % state['version']
+        )
+    return state
+
+
+def get_rng_state() -> Dict[str, object]:
+    """Gets the state of the global random number generators
+
+    Returns
+    -------
+    dict
+        States of the :mod:`random` and :mod:`numpy.random` generators.
+
+    """
+    return {'random': random.getstate(), 'numpy': np.random.get_state()}
+
+
+def set_rng_state(state: Dict[str, object]) -> None:
+    """Restores the state of the global random number generators
+
+    Parameters
+    ----------
+    state : dict
+        States to restore (from :func:`get_rng_state`).
+
+    """
+    random.setstate(state['random'])
+    np.random.set_state(state['numpy'])
+    return
@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+"""
+Core classes for training models on chunked data.
+"""
+#
+#   Imports
+#
+import os
+import time
+from typing import List
+from typing import Mapping
+from typing import Tuple
+from typing import Type
+
+import numpy as np
+
+from ..utils.batching import iter_prefetched
+from .checkpoint import get_rng_state
+from .checkpoint import load_checkpoint
+from .checkpoint import save_checkpoint
+from .checkpoint import set_rng_state
+from .sources import DataSource
+from .sources import get_source
+from .stopping import StoppingCriterion
+
+
+#
+#   Classes
+#
+
+class TrainingResult(object):
+    """
+    Summary of a model's training run
+
+    Attributes
+    ----------
+    epochs : int
+        Number of complete passes made over the data.
+    steps : int
+        Number of chunks the model was fitted on.
+    samples : int
+        Number of rows (over all the chunks) the model was fitted on.
+    duration : float
+        Time taken (in seconds) to train the model.
+    errors : list
+        Step and validation error of each evaluation (if evaluated).
+    best_error : float
+        Lowest validation error of any evaluation (if evaluated).
+    best_step : int
+        Step at which the lowest validation error was found (if
+        evaluated).
+    stopped_by : StoppingCriterion
+        The criterion which stopped training early (if any).
+
+    """
+
+    def __init__(self):
+        self.epochs = 0
+        self.steps = 0
+        self.samples = 0
+        self.duration = 0.0
+        self.errors = list()
+        self.best_error = None
+        self.best_step = None
+        self.stopped_by = None
+        self._start = time.perf_counter()
+
+    def __repr__(self):
+        return '<%s epochs=%s steps=%s samples=%s>' % (
+            self.__class__.__name__, self.epochs, self.steps, self.samples
+        )
+
+    @property
+    def elapsed(self) -> float:
+        """float: Time (in seconds) since training started."""
+        return time.perf_counter() - self._start
+
+    @property
+    def error(self) -> [float, None]:
+        """float: Validation error of the latest evaluation (if any)."""
+        if not self.errors:
+            return None
+        return self.errors[-1][1]
+
+
+class Trainer(object):
+    """
+    Trains models incrementally on chunks of data
+
+    Each epoch, the chunks of the data source are passed (in order) to
+    the model's ``partial_fit`` method (or, for models which don't
+    implement it, ``fit``), while the following chunks are read on a
+    background thread.  Parameter values set during an epoch are written
+    without validation (see :meth:`ParameterStore.trusted`) and the
+    model's parameters are validated and finalized once, at the end of
+    each epoch.
+
+    Given `validation` data, the model's ``error`` on it is evaluated
+    every `eval_every` steps and a snapshot of the parameters with the
+    lowest error is kept (copied only when the error improves), which
+    the model is restored to at the end of training.  Training stops
+    early once any of the `stopping` criteria are met.
+
+    Given a `checkpoint` path, the state of the training run (the
+    model's parameter and hyper-parameter values, its training state
+    from ``get_train_state``, the position in the data, the progress so
+    far, the stopping criteria and the global random number generators'
+    states) is saved there at the end of each epoch and, optionally,
+    every `checkpoint_every` steps or `checkpoint_interval` seconds, so
+    that an interrupted run can be resumed from where it stopped.
+
+    Parameters
+    ----------
+    epochs : int, optional
+        Number of passes to make over the data (default is 1).
+    chunk_size : int, optional
+        Maximum number of rows in each chunk (default is 10000), for
+        data which isn't already a chunked :class:`DataSource`.
+    prefetch : int, optional
+        Number of chunks to read ahead on a background thread (default is
+        1), or 0 to read them in the training thread.
+    validation : tuple, optional
+        Data (e.g. inputs and outputs) to evaluate the model's error on.
+    stopping : StoppingCriterion or list, optional
+        Criteria for stopping training early.
+    eval_every : int, optional
+        Number of steps between evaluations (default is 1).
+    restore_best : bool, optional
+        Whether or not to restore the parameters with the lowest
+        validation error at the end of training (default is
+        :obj:`True`).
+    checkpoint : str, optional
+        Path to save checkpoints of the training run to.
+    checkpoint_every : int, optional
+        Number of steps between checkpoints (within an epoch).
+    checkpoint_interval : float, optional
+        Time (in seconds) between checkpoints (within an epoch).
+
+    """
+
+    def __init__(
+        self, epochs: int = 1, chunk_size: [int, None] = None,
+        prefetch: int = 1, validation: [Tuple, None] = None,
+        stopping: [StoppingCriterion, List[StoppingCriterion], None] = None,
+        eval_every: int = 1, restore_best: bool = True,
+        checkpoint: [str, None] = None, checkpoint_every: [int, None] = None,
+        checkpoint_interval: [float, None] = None
+    ):
+        if epochs < 0:
+            raise ValueError("The number of epochs can't be negative")
+        if eval_every < 1:
+            raise ValueError("Must evaluate at least every step")
+        if stopping is None:
+            stopping = list()
+        elif isinstance(stopping, StoppingCriterion):
+            stopping = [stopping]
+        if validation is not None and not isinstance(validation, tuple):
+            validation = (validation,)
+        self.epochs = epochs
+        self.chunk_size = chunk_size
+        self.prefetch = prefetch
+        self.validation = validation
+        self.stopping = list(stopping)
+        self.eval_every = eval_every
+        self.restore_best = restore_best
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        return
+
+    def __repr__(self):
+        return '<%s epochs=%s prefetch=%s>' % (
+            self.__class__.__name__, self.epochs, self.prefetch
+        )
+
+    def train(self, model: Type['Model'], data, resume: [str, bool] = None,
+              **kwargs) -> TrainingResult:
+        """Trains a model on the given data
+
+        Parameters
+        ----------
+        model : Model
+            The model to train.
+        data
+            The data to train on, a :class:`DataSource` or anything which
+            can be made into one (see :func:`get_source`).
+        resume : str or bool, optional
+            Path of a checkpoint to resume training from, or :obj:`True`
+            to resume from this trainer's `checkpoint` (if it exists,
+            otherwise training starts from the beginning).
+        kwargs : optional
+            Additional keyword-arguments to pass to each ``partial_fit``
+            (or ``fit``) call.
+
+        Returns
+        -------
+        TrainingResult
+            Summary of the training run.
+
+        Raises
+        ------
+        InvalidParameterException
+            If any of the parameter values set during an epoch are not
+            valid, in which case the parameters are restored to what
+            they were at the start of the epoch.
+        ValueError
+            If resuming from a checkpoint of a different model.
+
+        """
+        source = get_source(data, chunk_size=self.chunk_size)
+        if hasattr(model.partial_fit, '__is_overridden'):
+            step = model.partial_fit
+        else:
+            step = model.fit
+        for criterion in self.stopping:
+            criterion.reset()
+
+        result = TrainingResult()
+        self._best = None
+        self._position = 0
+        if resume is True:
+            resume = self.checkpoint
+            if resume is not None and not os.path.exists(resume):
+                resume = None
+        if resume:
+            if self._restore(model, load_checkpoint(resume), result):
+                return result
+        self._saved = (result.steps, time.perf_counter())
+        try:
+            while result.epochs < self.epochs:
+                done = self._train_epoch(model, step, source, result, kwargs)
+                if not done:
+                    break
+                result.epochs += 1
+                self._position = 0
+                if result.epochs < self.epochs:
+                    self._save(model, result)
+            if self.restore_best and self._best is not None:
+                model.parameters.update(self._best)
+                model.parameters.finalize()
+            self._save(model, result, finished=True)
+        finally:
+            self._best = None
+            result.duration = result.elapsed
+        return result
+
+    def _train_epoch(self, model: Type['Model'], step, source: DataSource,
+                     result: TrainingResult, kwargs: dict) -> bool:
+        """Fits the model on each chunk of the data, once"""
+        chunks = source.iter_from(self._position)
+        if self.prefetch > 0:
+            chunks = iter_prefetched(chunks, self.prefetch)
+        params = model.parameters
+        done = True
+        try:
+            with params.trusted():
+                for chunk in chunks:
+                    updates = step(*chunk, **kwargs)
+                    if updates:
+                        params.update(updates)
+                    result.steps += 1
+                    result.samples += len(chunk[0])
+                    self._position += 1
+                    if self._should_stop(model, result):
+                        done = False
+                        break
+                    if self._checkpoint_due(result):
+                        self._save(model, result)
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+        params.finalize()
+        return done
+
+    def _checkpoint_due(self, result: TrainingResult) -> bool:
+        """Whether or not it's time to save a checkpoint"""
+        if self.checkpoint is None:
+            return False
+        steps, saved = self._saved
+        if (self.checkpoint_every is not None
+                and result.steps - steps >= self.checkpoint_every):
+            return True
+        return (self.checkpoint_interval is not None and
+                time.perf_counter() - saved >= self.checkpoint_interval)
+
+    def _save(self, model: Type['Model'], result: TrainingResult,
+              finished: bool = False) -> None:
+        """Saves a checkpoint of the training run (if checkpointing)"""
+        if self.checkpoint is None:
+            return
+        cls = type(model)
+        save_checkpoint(self.checkpoint, {
+            'model': '%s.%s' % (cls.__module__, cls.__qualname__),
+            'params': model.parameters.values,
+            'hyper_params': model.get_hyper_params(),
+            'train_state': model.get_train_state(),
+            'rng': get_rng_state(),
+            'epoch': result.epochs,
+            'position': self._position,
+            'result': {
+                'steps': result.steps,
+                'samples': result.samples,
+                'errors': result.errors,
+                'best_error': result.best_error,
+                'best_step': result.best_step,
+                'elapsed': result.elapsed,
+            },
+            'best': self._best,
+            'stopping': self.stopping,
+            'finished': finished,
+        })
+        self._saved = (result.steps, time.perf_counter())
+        return
+
+    def _restore(self, model: Type['Model'], state: dict,
+                 result: TrainingResult) -> bool:
+        """Restores a training run from a checkpoint"""
+        cls = type(model)
+        if state['model'] != '%s.%s' % (cls.__module__, cls.__qualname__):
+            raise ValueError(
+                "Checkpoint is for a different model: %s" % state['model']
+            )
+        model.set_hyper_params(**state['hyper_params'])
+        model.parameters.update(state['params'])
+        model.parameters.finalize()
+        model.set_train_state(state['train_state'])
+        set_rng_state(state['rng'])
+
+        for k, v in state['result'].items():
+            if k == 'elapsed':
+                result._start = time.perf_counter() - v
+            else:
+                setattr(result, k, v)
+        result.epochs = state['epoch']
+        self._position = state['position']
+        self._best = state['best']
+        for criterion, saved in zip(self.stopping, state['stopping']):
+            if type(criterion) is type(saved):
+                criterion.__dict__.update(saved.__dict__)
+
+        if state['finished']:
+            result.duration = result.elapsed
+            return True
+        return False
+
+    def _should_stop(self, model: Type['Model'],
+                     result: TrainingResult) -> bool:
+        """Checks the stopping criteria (evaluating the model if due)"""
+        for criterion in self.stopping:
+            if criterion.on_step(result):
+                result.stopped_by = criterion
+                return True
+        if result.steps % self.eval_every:
+            return False
+
+        params = model.parameters.values
+        if self.validation is not None:
+            self._evaluate(model, result, params)
+        for criterion in self.stopping:
+            if criterion.on_evaluate(result, params):
+                result.stopped_by = criterion
+                return True
+        return False
+
+    def _evaluate(self, model: Type['Model'], result: TrainingResult,
+                  params: Mapping[str, object]) -> None:
+        """Evaluates the model's error on the validation data"""
+        error = model.error(*self.validation)
+        if error is None:
+            raise ValueError(
+                "Validation requires a model with an error (or score)"
+            )
+        error = float(error)
+        result.errors.append((result.steps, error))
+        if result.best_error is None or error < result.best_error:
+            result.best_error = error
+            result.best_step = result.steps
+            self._best = {
+                k: v.copy() if isinstance(v, np.ndarray) else v
+                for k, v in params.items()
+            }
+        return
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+Data-parallel training of models over worker processes.
+"""
+#
+#   Imports
+#
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Type
+from uuid import uuid4
+
+import numpy as np
+
+from ..utils.batching import iter_chunks
+from ..utils.concurrency import get_executor
+from ..utils.concurrency import get_worker_count
+from ..utils.shared import SharedArray
+from ..utils.shared import share_array
+from .core import TrainingResult
+
+
+#
+#   Variables
+#
+
+_WORKER_DATA = dict()
+
+
+#
+#   Classes
+#
+
+class ParallelTrainer(object):
+    """
+    Trains models data-parallel, reducing the parameters each round
+
+    The data is split into one contiguous shard per worker.  Each round,
+    every worker sets its clone of the model to the current parameter
+    values, calls ``fit`` on its shard and the parameter values each
+    returns (or, if ``fit`` returns :obj:`None`, the clone's fitted
+    parameters) are reduced into the model's parameters.
+
+    The data is placed in shared memory once (when using processes), the
+    model is sent to each worker once (when it starts) and, after the
+    first round, numeric parameter values are exchanged through shared
+    memory buffers, so only small task descriptions are pickled each
+    round.
+
+    Parameters
+    ----------
+    rounds : int, optional
+        Number of rounds of fitting and reducing (default is 1).
+    workers : int, optional
+        Number of workers (and shards) to use (default is the number of
+        CPUs available).
+    reduce : str or callable or dict, optional
+        How to combine the workers' parameter values: ``'mean'``
+        (default, the mean weighted by the size of each shard, rounded
+        for integer values),
+        ``'sum'``, or a function taking the stacked values (along the
+        first axis) and the shard sizes and returning the combined
+        value.  Can also be a dictionary of reductions to use for each
+        parameter (with ``'mean'`` used for any not given).
+    executor : str, optional
+        Type of worker pool to use, ``'process'`` (default) or
+        ``'thread'``.
+
+    """
+
+    def __init__(
+        self, rounds: int = 1, workers: [int, None] = None,
+        reduce: [str, Callable, Dict[str, object]] = 'mean',
+        executor: str = 'process'
+    ):
+        if rounds < 0:
+            raise ValueError("The number of rounds can't be negative")
+        if isinstance(reduce, dict):
+            for v in reduce.values():
+                get_reducer(v)
+        else:
+            get_reducer(reduce)
+        self.rounds = rounds
+        self.workers = workers
+        self.reduce = reduce
+        self.executor = executor
+        return
+
+    def __repr__(self):
+        return '<%s rounds=%s workers=%s>' % (
+            self.__class__.__name__, self.rounds, self.workers
+        )
+
+    def train(self, model: Type['Model'], *data, **kwargs) -> TrainingResult:
+        """Trains a model on the given data
+
+        Parameters
+        ----------
+        model : Model
+            The model to train, whose parameter values are updated after
+            each round.
+        data : array_like
+            Data to split into shards and fit on (e.g. the inputs and the
+            outputs), which must all be the same length.
+        kwargs : optional
+            Additional keyword-arguments to pass to each ``fit`` call.
+
+        Returns
+        -------
+        TrainingResult
+            Summary of the training run (each round counts as an epoch).
+
+        """
+        data = [np.asarray(x) for x in data]
+        if not data:
+            raise ValueError("No data to train on")
+        n = len(data[0])
+        if any(len(x) != n for x in data):
+            raise ValueError("The data must all be the same length")
+        workers = min(get_worker_count(self.workers), max(n, 1))
+        bounds = list(iter_chunks(n, -(-n // workers)))
+        sizes = np.array([stop - start for start, stop in bounds])
+
+        result = TrainingResult()
+        t_start = time.perf_counter()
+        token = uuid4().hex
+        buffers = _ParameterBuffers(len(bounds))
+        shared = list()
+        try:
+            if self.executor == 'process':
+                data = [share_array(x, shared) for x in data]
+            pool = get_executor(
+                self.executor, len(bounds), initializer=_initialize,
+                initargs=(token, model.clone(), tuple(data), bounds)
+            )
+            with pool:
+                for _ in range(self.rounds):
+                    spec = buffers.broadcast(model.get_params())
+                    results = list(pool.map(
+                        _fit_shard, [token] * len(bounds),
+                        range(len(bounds)), [spec] * len(bounds),
+                        [kwargs] * len(bounds)
+                    ))
+                    model.parameters.update(
+                        self._reduce(buffers.gather(results), sizes)
+                    )
+                    model.parameters.finalize()
+                    result.epochs += 1
+                    result.steps += len(bounds)
+                    result.samples += n
+        finally:
+            buffers.unlink()
+            for x in shared:
+                x.unlink()
+            _WORKER_DATA.pop(token, None)
+            result.duration = time.perf_counter() - t_start
+        return result
+
+    def _reduce(self, values: Dict[str, np.ndarray],
+                sizes: np.ndarray) -> Dict[str, object]:
+        """Reduces the stacked parameter values from each worker"""
+        ret = dict()
+        for name, stacked in values.items():
+            reduce = self.reduce
+            if isinstance(reduce, dict):
+                reduce = reduce.get(name, 'mean')
+            value = get_reducer(reduce)(stacked, sizes)
+            if isinstance(value, np.ndarray) and value.ndim == 0:
+                value = value.item()
+            elif isinstance(value, np.generic):
+                value = value.item()
+            ret[name] = value
+        return ret
+
+
+class _ParameterBuffers(object):
+    """
+    Shared memory buffers for exchanging parameter values with workers
+    """
+
+    def __init__(self, n: int):
+        self._n = n
+        self._inputs = dict()
+        self._outputs = dict()
+
+    def broadcast(self, params: Dict[str, object]) -> Tuple[Dict, Dict]:
+        """Writes parameter values to share and gets their description"""
+        inputs = dict()
+        for name, value in params.items():
+            array = _as_numeric(value)
+            if array is None:
+                inputs[name] = ('value', value)
+                continue
+            buffer = self._get(self._inputs, name, array.shape, array.dtype)
+            buffer.array[...] = array
+            inputs[name] = ('shared',) + buffer.spec
+        outputs = {k: v.spec for k, v in self._outputs.items()}
+        return inputs, outputs
+
+    def gather(self, results: List[Tuple[Dict, set]]) -> Dict[str, object]:
+        """Gets the stacked parameter values from each worker"""
+        names = set()
+        for values, written in results:
+            names.update(values)
+            names.update(written)
+        ret = dict()
+        for name in names:
+            if all(name in written for _, written in results):
+                ret[name] = self._outputs[name].array.copy()
+                continue
+            stacked = np.stack([
+                self._outputs[name].array[i] if name in written
+                else np.asarray(values[name])
+                for i, (values, written) in enumerate(results)
+            ])
+            ret[name] = stacked
+            if not stacked.dtype.hasobject:
+                self._get(
+                    self._outputs, name, stacked.shape[1:], stacked.dtype
+                )
+        return ret
+
+    def unlink(self) -> None:
+        """Frees all of the buffers"""
+        for buffers in (self._inputs, self._outputs):
+            for x in buffers.values():
+                x.unlink()
+            buffers.clear()
+        return
+
+    def _get(self, buffers: Dict[str, SharedArray], name: str,
+             shape: Tuple[int, ...], dtype: np.dtype) -> SharedArray:
+        """Gets (or re-creates) the buffer of the given type and shape"""
+        if buffers is self._outputs:
+            shape = (self._n,) + tuple(shape)
+        buffer = buffers.get(name)
+        if (buffer is None or buffer.shape != shape
+                or buffer.array.dtype != dtype):
+            if buffer is not None:
+                buffer.unlink()
+            buffer = buffers[name] = SharedArray(np.zeros(shape, dtype))
+        return buffer
+
+
+#
+#   Functions
+#
+
+def get_reducer(reduce: [str, Callable]) -> Callable:
+    """Gets the function to combine parameter values with
+
+    Parameters
+    ----------
+    reduce : str or callable
+        Either ``'mean'`` (weighted by shard size), ``'sum'`` or a
+        function taking the stacked values and the shard sizes.
+
+    Returns
+    -------
+    callable
+        The reducing function.
+
+    Raises
+    ------
+    ValueError
+        If the given `reduce` isn't a known reduction or callable.
+
+    """
+    if callable(reduce):
+        return reduce
+    elif reduce == 'mean':
+        return _reduce_mean
+    elif reduce == 'sum':
+        return _reduce_sum
+    raise ValueError("Unknown reduction: %s" % reduce)
+
+
+def _reduce_mean(values: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Mean of the values, weighted by shard size"""
+    ret = np.average(values, axis=0, weights=sizes)
+    if values.dtype.kind in 'biu':
+        ret = np.rint(ret).astype(values.dtype)
+    return ret
+
+
+def _reduce_sum(values: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    """Sum of the values"""
+    return np.sum(values, axis=0)
+
+
+def _as_numeric(value) -> [np.ndarray, None]:
+    """Gets a value as a numeric array, if it is one"""
+    if isinstance(value, (bool, str, bytes)) or value is None:
+        return None
+    array = np.asarray(value)
+    if array.dtype.kind not in 'biufc':
+        return None
+    return array
+
+
+def _initialize(token: str, model: Type['Model'], data: Tuple,
+                bounds: List[Tuple[int, int]]) -> None:
+    """Initializes a worker with the model and data to fit"""
+    _WORKER_DATA[token] = {
+        'model': model, 'data': data, 'bounds': bounds, 'attached': dict(),
+    }
+    return
+
+
+def _attach(state: dict, spec: Tuple[str, Tuple, str]) -> np.ndarray:
+    """Gets a shared buffer (attaching to it the first time)"""
+    attached = state['attached']
+    buffer = attached.get(spec[0])
+    if buffer is None:
+        buffer = attached[spec[0]] = SharedArray.attach(*spec)
+    return buffer.array
+
+
+def _fit_shard(token: str, index: int, spec: Tuple[Dict, Dict],
+               kwargs: dict) -> Tuple[Dict[str, object], set]:
+    """Fits a worker's model on its shard of the data for one round"""
+    state = _WORKER_DATA[token]
+    inputs, outputs = spec
+    params = dict()
+    for name, value in inputs.items():
+        if value[0] == 'shared':
+            array = _attach(state, value[1:])
+            value = array.item() if array.ndim == 0 else array.copy()
+        else:
+            value = value[1]
+        params[name] = value
+
+    model = state['model'].clone()
+    if params:
+        model.set_params(**params)
+    start, stop = state['bounds'][index]
+    data = [
+        (x.array if isinstance(x, SharedArray) else x)[start:stop]
+        for x in state['data']
+    ]
+    updates = model.fit(*data, **kwargs)
+    if updates is None:
+        updates = model.get_params()
+
+    ret, written = dict(), set()
+    for name, value in updates.items():
+        array = _as_numeric(value)
+        spec = outputs.get(name)
+        if array is not None and spec is not None:
+            target = _attach(state, spec)
+            if target.shape[1:] == array.shape and np.can_cast(
+                    array.dtype, target.dtype, casting='same_kind'):
+                target[index] = array
+                written.add(name)
+                continue
+        ret[name] = value
+    return ret, written
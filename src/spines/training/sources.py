@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+Sources of chunked training data.
+"""
+#
+#   Imports
+#
+from abc import ABC
+from abc import abstractmethod
+from itertools import islice
+import os
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+from ..utils.batching import iter_chunks
+
+
+#
+#   Constants
+#
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+#
+#   Classes
+#
+
+class DataSource(ABC):
+    """
+    Re-iterable source of chunks of data
+
+    Iterating over a data source yields each chunk (a tuple of arrays,
+    e.g. the inputs and outputs for a model, of the same length) in
+    turn, and each iteration (epoch) starts again from the beginning.
+
+    Parameters
+    ----------
+    chunk_size : int, optional
+        Maximum number of rows in each chunk (default is 10000).
+
+    """
+
+    def __init__(self, chunk_size: [int, None] = None):
+        if chunk_size is None:
+            chunk_size = DEFAULT_CHUNK_SIZE
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least 1")
+        self._chunk_size = int(chunk_size)
+        return
+
+    def __repr__(self):
+        return '<%s chunk_size=%s>' % (
+            self.__class__.__name__, self._chunk_size
+        )
+
+    @property
+    def chunk_size(self) -> int:
+        """int: Maximum number of rows in each chunk."""
+        return self._chunk_size
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, ...]]:
+        pass
+
+    def iter_from(self, start: int) -> Iterator[Tuple[np.ndarray, ...]]:
+        """Iterates over the chunks, starting part-way through
+
+        Used to resume training part-way through an epoch, sources which
+        can skip to a chunk without reading the ones before it should
+        override this.
+
+        Parameters
+        ----------
+        start : int
+            Number of chunks to skip.
+
+        Yields
+        ------
+        tuple
+            Each of the remaining chunks.
+
+        """
+        return islice(iter(self), start, None)
+
+
+class ArraySource(DataSource):
+    """
+    Data source for arrays (including memory-mapped arrays)
+
+    Chunks are consecutive slices of the arrays, so for in-memory arrays
+    no data is copied.
+
+    Parameters
+    ----------
+    arrays : array_like
+        Arrays to split into chunks (along their first axis), which must
+        all be the same length.
+    chunk_size : int, optional
+        Maximum number of rows in each chunk (default is 10000).
+
+    """
+
+    def __init__(self, *arrays, chunk_size: [int, None] = None):
+        super(ArraySource, self).__init__(chunk_size=chunk_size)
+        if not arrays:
+            raise ValueError("At least one array is required")
+        self._arrays = [
+            x if isinstance(x, np.ndarray) else np.asarray(x) for x in arrays
+        ]
+        if any(len(x) != len(self._arrays[0]) for x in self._arrays):
+            raise ValueError("The arrays must all be the same length")
+        return
+
+    def __len__(self):
+        return len(self._arrays[0])
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, ...]]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int) -> Iterator[Tuple[np.ndarray, ...]]:
+        offset = start * self._chunk_size
+        for i, j in iter_chunks(len(self) - offset, self._chunk_size):
+            yield tuple(
+                _read(x[offset + i:offset + j]) for x in self._arrays
+            )
+
+
+class NpySource(DataSource):
+    """
+    Data source for arrays saved in ``.npy`` files
+
+    The files are memory-mapped, so only the chunk being read (and any
+    being prefetched) are held in memory at once.
+
+    Parameters
+    ----------
+    paths : str
+        Paths to the ``.npy`` files (e.g. of the inputs and outputs),
+        which must all hold arrays of the same length.
+    chunk_size : int, optional
+        Maximum number of rows in each chunk (default is 10000).
+
+    """
+
+    def __init__(self, *paths: str, chunk_size: [int, None] = None):
+        super(NpySource, self).__init__(chunk_size=chunk_size)
+        if not paths:
+            raise ValueError("At least one file is required")
+        self._paths = paths
+        return
+
+    def __repr__(self):
+        return '<%s paths=%s chunk_size=%s>' % (
+            self.__class__.__name__, list(self._paths), self._chunk_size
+        )
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, ...]]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int) -> Iterator[Tuple[np.ndarray, ...]]:
+        arrays = [np.load(x, mmap_mode='r') for x in self._paths]
+        source = ArraySource(*arrays, chunk_size=self._chunk_size)
+        return source.iter_from(start)
+
+
+class CSVSource(DataSource):
+    """
+    Data source for numeric data in a delimited text file
+
+    The file is read lazily, `chunk_size` lines at a time.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file to read.
+    target : int or str or list, optional
+        Column(s) (by position, or name if the file has a `header`) to
+        split out as the second array of each chunk (e.g. the outputs
+        for a model), if any.
+    chunk_size : int, optional
+        Maximum number of rows in each chunk (default is 10000).
+    header : bool, optional
+        Whether or not the first line of the file has the column names
+        (default is :obj:`False`).
+    delimiter : str, optional
+        Delimiter between columns (default is ``','``).
+    dtype : optional
+        Type of the data (default is :obj:`float`).
+
+    """
+
+    def __init__(
+        self, path: str, target: [int, str, List, None] = None,
+        chunk_size: [int, None] = None, header: bool = False,
+        delimiter: str = ',', dtype=float
+    ):
+        super(CSVSource, self).__init__(chunk_size=chunk_size)
+        self._path = path
+        self._target = target
+        self._header = header
+        self._delimiter = delimiter
+        self._dtype = dtype
+        return
+
+    def __repr__(self):
+        return '<%s path="%s" chunk_size=%s>' % (
+            self.__class__.__name__, self._path, self._chunk_size
+        )
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, ...]]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int) -> Iterator[Tuple[np.ndarray, ...]]:
+        with open(self._path, 'r') as fin:
+            columns = None
+            if self._header:
+                columns = [
+                    x.strip() for x in next(fin, '').split(self._delimiter)
+                ]
+            target = self._get_target_index(columns)
+            for _ in islice(fin, start * self._chunk_size):
+                pass
+            while True:
+                lines = list(islice(fin, self._chunk_size))
+                if not lines:
+                    return
+                data = np.loadtxt(
+                    lines, delimiter=self._delimiter, dtype=self._dtype,
+                    ndmin=2
+                )
+                if target is None:
+                    yield (data,)
+                    continue
+                mask = np.ones(data.shape[1], dtype=bool)
+                mask[target] = False
+                y = data[:, target]
+                yield data[:, mask], y
+
+    def _get_target_index(self, columns: [List[str], None]):
+        """Gets the position(s) of the target column(s)"""
+        target = self._target
+        if target is None:
+            return None
+        if isinstance(target, (list, tuple)):
+            return [self._get_column(x, columns) for x in target]
+        return self._get_column(target, columns)
+
+    @staticmethod
+    def _get_column(name: [int, str], columns: [List[str], None]) -> int:
+        """Gets the position of a column"""
+        if isinstance(name, str):
+            if columns is None:
+                raise ValueError(
+                    "Columns can only be given by name with a header"
+                )
+            return columns.index(name)
+        return name
+
+
+class IterableSource(DataSource):
+    """
+    Data source for chunks generated by a function (or an iterable)
+
+    Parameters
+    ----------
+    chunks : callable or iterable
+        Function returning a new iterable of chunks for each epoch (e.g.
+        a generator function), or an iterable of chunks.  If given a
+        one-shot iterator (e.g. a generator) it can only be used for a
+        single epoch.  Each chunk may be a single array or a tuple of
+        arrays.
+
+    """
+
+    def __init__(self, chunks: [Callable[[], Iterable], Iterable]):
+        super(IterableSource, self).__init__()
+        self._chunks = chunks
+        self._used = False
+        return
+
+    def __repr__(self):
+        return '<%s chunks=%s>' % (self.__class__.__name__, self._chunks)
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, ...]]:
+        chunks = self._chunks
+        if callable(chunks):
+            chunks = chunks()
+        elif iter(chunks) is chunks:
+            if self._used:
+                raise ValueError(
+                    "An iterator can only be used as a data source once"
+                )
+            self._used = True
+        for chunk in chunks:
+            if not isinstance(chunk, tuple):
+                chunk = (chunk,)
+            yield chunk
+
+
+#
+#   Functions
+#
+
+def get_source(
+    data: Union[DataSource, str, np.ndarray, Tuple, Callable, Iterable],
+    chunk_size: [int, None] = None
+) -> DataSource:
+    """Gets the data source for the given data
+
+    Parameters
+    ----------
+    data
+        The data, either a :class:`DataSource`, a path to a ``.npy`` or
+        ``.csv`` file, an array or tuple of arrays (or of ``.npy`` file
+        paths), or a function or iterable generating chunks.
+    chunk_size : int, optional
+        Maximum number of rows in each chunk (default is 10000), for
+        sources which split the data into chunks.
+
+    Returns
+    -------
+    DataSource
+        Source of chunks of the data.
+
+    Raises
+    ------
+    ValueError
+        If the data is a path to an unsupported type of file.
+
+    """
+    if isinstance(data, DataSource):
+        return data
+    if isinstance(data, (str, os.PathLike)):
+        data = os.fspath(data)
+        if data.endswith('.npy'):
+            return NpySource(data, chunk_size=chunk_size)
+        elif data.endswith('.csv'):
+            return CSVSource(data, chunk_size=chunk_size)
+        raise ValueError("Unsupported data file type: %s" % data)
+    if isinstance(data, np.ndarray):
+        return ArraySource(data, chunk_size=chunk_size)
+    if isinstance(data, tuple):
+        if all(isinstance(x, (str, os.PathLike)) for x in data):
+            return NpySource(*data, chunk_size=chunk_size)
+        return ArraySource(*data, chunk_size=chunk_size)
+    return IterableSource(data)
+
+
+def _read(array: np.ndarray) -> np.ndarray:
+    """Reads a memory-mapped array (slice) into memory"""
+    if isinstance(array, np.memmap):
+        return np.array(array)
+    return array
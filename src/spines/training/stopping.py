@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Criteria for stopping training early.
+"""
+#
+#   Imports
+#
+from abc import ABC
+import math
+from typing import Mapping
+
+import numpy as np
+
+
+#
+#   Classes
+#
+
+class StoppingCriterion(ABC):
+    """
+    Base class for criteria to stop training early
+
+    Criteria are checked by the :class:`Trainer` after every step (with
+    :meth:`on_step`, which should be cheap) and after each evaluation of
+    the validation data (with :meth:`on_evaluate`), and training stops
+    once any of them returns :obj:`True`.
+    """
+
+    def __repr__(self):
+        return '<%s>' % self.__class__.__name__
+
+    def reset(self) -> None:
+        """Resets the criterion's state, at the start of training"""
+        return
+
+    def on_step(self, result) -> bool:
+        """Checks whether or not to stop after a step
+
+        Parameters
+        ----------
+        result : TrainingResult
+            Progress of the training run so far.
+
+        Returns
+        -------
+        bool
+            Whether or not to stop training.
+
+        """
+        return False
+
+    def on_evaluate(self, result, params: Mapping[str, object]) -> bool:
+        """Checks whether or not to stop after an evaluation
+
+        Parameters
+        ----------
+        result : TrainingResult
+            Progress of the training run so far, including the latest
+            validation error (if there's validation data).
+        params : Mapping
+            Read-only snapshot of the model's current parameter values.
+
+        Returns
+        -------
+        bool
+            Whether or not to stop training.
+
+        """
+        return False
+
+
+class Patience(StoppingCriterion):
+    """
+    Stops once the validation error hasn't improved for a while
+
+    Parameters
+    ----------
+    patience : int, optional
+        Number of evaluations without an improvement to allow (default
+        is 5).
+    min_delta : float, optional
+        Minimum decrease in the error to count as an improvement (default
+        is 0.0).
+
+    """
+
+    def __init__(self, patience: int = 5, min_delta: float = 0.0):
+        if patience < 1:
+            raise ValueError("The patience must be at least 1")
+        self.patience = patience
+        self.min_delta = min_delta
+        self.reset()
+
+    def __repr__(self):
+        return '<%s patience=%s>' % (self.__class__.__name__, self.patience)
+
+    def reset(self) -> None:
+        self._best = math.inf
+        self._waited = 0
+        return
+
+    def on_evaluate(self, result, params: Mapping[str, object]) -> bool:
+        if result.error is None:
+            return False
+        if result.error < self._best - self.min_delta:
+            self._best = result.error
+            self._waited = 0
+            return False
+        self._waited += 1
+        return self._waited >= self.patience
+
+
+class Tolerance(StoppingCriterion):
+    """
+    Stops once the parameters have (relatively) stopped changing
+
+    The change is measured between consecutive evaluations, as the norm
+    of the change in the numeric parameter values relative to the norm
+    of the previous values.
+
+    Parameters
+    ----------
+    rtol : float, optional
+        Relative change below which to stop (default is 1e-4).
+
+    """
+
+    def __init__(self, rtol: float = 1e-4):
+        self.rtol = rtol
+        self.reset()
+
+    def __repr__(self):
+        return '<%s rtol=%s>' % (self.__class__.__name__, self.rtol)
+
+    def reset(self) -> None:
+        self._previous = None
+        return
+
+    def on_evaluate(self, result, params: Mapping[str, object]) -> bool:
+        previous, self._previous = self._previous, {
+            k: v.copy() if isinstance(v, np.ndarray) else v
+            for k, v in params.items()
+        }
+        if previous is None:
+            return False
+        change, norm = 0.0, 0.0
+        for name, value in params.items():
+            if not _is_numeric(value):
+                continue
+            old = previous.get(name)
+            if not _is_numeric(old) or np.shape(old) != np.shape(value):
+                return False
+            norm += float(np.vdot(old, old).real)
+            if old is not value:
+                diff = np.subtract(value, old, dtype=float)
+                change += float(np.vdot(diff, diff).real)
+        return math.sqrt(change) <= self.rtol * max(math.sqrt(norm), 1e-12)
+
+
+class TimeBudget(StoppingCriterion):
+    """
+    Stops once the training has run for a given (wall-clock) time
+
+    Parameters
+    ----------
+    seconds : float
+        Time budget for the training run, in seconds.
+
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def __repr__(self):
+        return '<%s seconds=%s>' % (self.__class__.__name__, self.seconds)
+
+    def on_step(self, result) -> bool:
+        return result.elapsed >= self.seconds
+
+
+#
+#   Functions
+#
+
+def _is_numeric(value) -> bool:
+    """Whether or not a parameter value is numeric"""
+    if isinstance(value, np.ndarray):
+        return value.dtype.kind in 'biufc'
+    return isinstance(value, (int, float, np.number)) and not isinstance(
+        value, bool
+    )
@@ -4,8 +4,12 @@ Transforms subpackage for spines.
 """
 from .base import Transform
 from .core import Pass
+from .core import Pipeline
+from .graph import TransformGraph
 
 __all__ = [
     'Transform',
     'Pass',
+    'Pipeline',
+    'TransformGraph',
 ]
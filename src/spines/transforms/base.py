@@ -7,9 +7,20 @@ Base classes for transforms subpackage.
 #
 from abc import ABCMeta
 from abc import abstractmethod
+from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+
+import numpy as np
 
 from ..core.base import BaseObject
+from ..utils.batching import map_chunks
+from ..utils.batching import map_stream
+from ..utils.memo import DEFAULT_MAX_BYTES
+from ..utils.memo import MemoCache
+from ..utils.memo import memoize
 
 
 #
@@ -20,6 +31,8 @@ class Transform(BaseObject, metaclass=ABCMeta):
     """
     Base Transform class
     """
+    _memo = None
+    _memo_method = 'transform'
 
     def __init__(self, *args, **kwargs):
         return super().__init__(*args, **kwargs)
@@ -95,3 +108,175 @@ class Transform(BaseObject, metaclass=ABCMeta):
 
         """
         pass
+
+    @property
+    def memo_cache(self) -> [MemoCache, None]:
+        """MemoCache: Cache of memoized results (if memoizing)."""
+        return self._memo
+
+    def memoize(self, max_bytes: int = DEFAULT_MAX_BYTES) -> MemoCache:
+        """Memoizes the results of this object's transform calls
+
+        Results are cached by a fingerprint of the inputs, so repeated
+        calls with the same inputs return the stored result without
+        computing it again.  The cache is cleared whenever this object's
+        parameters change (values modified in-place, without being set,
+        are not detected) and isn't used while they're being set without
+        validation (see :meth:`ParameterStore.trusted`).
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            Maximum (approximate) size of the results to store, in bytes
+            (default is 64 MiB), the least recently used results are
+            evicted once full.
+
+        Returns
+        -------
+        MemoCache
+            The (new) cache of results, which also tracks the hit rate.
+
+        See Also
+        --------
+        unmemoize
+
+        """
+        self.unmemoize()
+        self._memo = MemoCache(max_bytes)
+        self._apply_memo()
+        return self._memo
+
+    def unmemoize(self) -> None:
+        """Stops memoizing results (and discards any stored)
+
+        See Also
+        --------
+        memoize
+
+        """
+        memo = self._memo
+        if memo is None:
+            return
+        for store in self._memo_stores():
+            try:
+                store.unsubscribe(memo.clear)
+            except ValueError:
+                pass
+        func = getattr(self, self._memo_method)
+        if getattr(func, 'cache', None) is memo:
+            func = func.__wrapped__
+            if (getattr(func, '__self__', None) is self
+                    and func.__func__ is getattr(
+                        type(self), self._memo_method)):
+                delattr(self, self._memo_method)
+            else:
+                setattr(self, self._memo_method, func)
+        self._memo = None
+        return
+
+    def transform_batch(
+        self, data, chunk_size: [int, None] = None,
+        workers: [int, None] = None, executor: str = 'thread', **kwargs
+    ) -> np.ndarray:
+        """Transforms a large array of data in chunks, in parallel
+
+        The `data` is split into chunks (along its first axis) which are
+        each passed to :meth:`transform` concurrently, and the outputs are
+        gathered into a single (pre-allocated) output array.  Works for
+        any transform which operates on array chunks.
+
+        Parameters
+        ----------
+        data : array_like
+            Data to transform.
+        chunk_size : int, optional
+            Number of rows in each chunk (default is to use four chunks
+            per worker).
+        workers : int, optional
+            Number of workers to use (default is the number of CPUs
+            available).
+        executor : str, optional
+            Type of worker pool to use, ``'thread'`` (default) or
+            ``'process'``.
+        kwargs : optional
+            Additional keyword arguments to use in each transform call.
+
+        Returns
+        -------
+        numpy.ndarray
+            Transformed data, in order.
+
+        See Also
+        --------
+        transform
+
+        """
+        return map_chunks(
+            self.transform, data, chunk_size=chunk_size, workers=workers,
+            executor=executor, **kwargs
+        )
+
+    def transform_stream(
+        self, iterable: Iterable, batch_size: int = 1024,
+        read_ahead: int = 0, collate: [Callable, None] = np.asarray,
+        **kwargs
+    ) -> Iterator:
+        """Transforms a stream of records in batches
+
+        Records are lazily grouped into batches of up to `batch_size`
+        which are each passed to :meth:`transform`, so memory use is
+        proportional to the batch size rather than the whole stream.
+
+        Parameters
+        ----------
+        iterable : iterable
+            Records to transform (e.g. from a generator).
+        batch_size : int, optional
+            Maximum number of records in each batch (default is 1024).
+        read_ahead : int, optional
+            Number of batches to read ahead on a background thread, to
+            overlap reading the records with transforming them (default
+            is 0).
+        collate : callable, optional
+            Function to combine each batch of records into the input for
+            :meth:`transform` (default is :func:`numpy.asarray`), or
+            :obj:`None` to pass the list of records.
+        kwargs : optional
+            Additional keyword arguments to use in each transform call.
+
+        Yields
+        ------
+        object
+            The transformed output for each record, in order.
+
+        See Also
+        --------
+        transform, transform_batch
+
+        """
+        return map_stream(
+            self.transform, iterable, batch_size=batch_size,
+            read_ahead=read_ahead, collate=collate, **kwargs
+        )
+
+    def _modify_methods(self, *args, **kwargs) -> None:
+        """Modifies the transform's methods in-place on object creation"""
+        super(Transform, self)._modify_methods(*args, **kwargs)
+        if self._memo is not None:
+            self._apply_memo()
+        return
+
+    def _apply_memo(self) -> None:
+        """Wraps the memoized method and subscribes to changes"""
+        stores = self._memo_stores()
+        setattr(self, self._memo_method, memoize(
+            getattr(self, self._memo_method), self._memo,
+            bypass=lambda: any(x.trusting for x in stores)
+        ))
+        for store in stores:
+            store.subscribe(self._memo.clear)
+        return
+
+    def _memo_stores(self) -> List:
+        """Gets the parameter stores the memoized results depend on"""
+        return [self._params]
@@ -5,7 +5,16 @@ Core Transform classes for manipulating data.
 #
 #   Imports
 #
+import inspect
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Type
+
+import numpy as np
+
 from ..parameters.base import Parameter
+from ..utils.batching import iter_chunks
 from .base import Transform
 
 
@@ -42,3 +51,167 @@ class Pass(Transform):
                 return args[0]
             return args
         return self.output(*args, **kwargs)
+
+
+class Pipeline(Transform):
+    """
+    Transform chaining a sequence of transforms (and models)
+
+    The output of each step is the input to the next, and the output of
+    the last step is the output of the pipeline.  Steps are fit in
+    sequence, each on the (transformed) output of the steps before it.
+
+    Steps whose ``transform`` accepts an ``out`` keyword argument must
+    write their output to it, and give an output of the same shape and
+    type as their input: the pipeline passes such steps one of two
+    buffers (alternating between them) rather than having every step
+    allocate a new array for its output.
+
+    Given a `chunk_size`, the data is transformed a chunk (of rows) at a
+    time, each chunk passing through every step before the next one
+    starts, so the intermediate outputs are only ever the size of a
+    chunk (and the buffers are reused for every chunk).
+
+    Parameters
+    ----------
+    steps : Transform
+        The transforms (or models) to chain, in order.
+
+    """
+    steps = Parameter(list)
+
+    def __init__(self, *steps: Transform, **kwargs):
+        super(Pipeline, self).__init__(**kwargs)
+        if steps:
+            self.steps = list(steps)
+        return
+
+    def clone(self) -> 'Pipeline':
+        """Creates a new, unfitted, copy of this pipeline
+
+        Returns
+        -------
+        Pipeline
+            New pipeline of (unfitted) clones of each of the steps.
+
+        """
+        ret = super(Pipeline, self).clone()
+        if self.steps is not None:
+            ret.steps = [x.clone() for x in self.steps]
+        return ret
+
+    def fit(self, data, *args, chunk_size: [int, None] = None,
+            **kwargs) -> None:
+        """Fits each of the steps, in sequence
+
+        Parameters
+        ----------
+        data
+            Input data to the first step.
+        args : optional
+            Additional data (e.g. outputs) to pass to each step's
+            ``fit``.
+        chunk_size : int, optional
+            Number of rows to transform at a time, when transforming the
+            data for the next step (default is all at once).
+        kwargs : optional
+            Additional keyword-arguments to pass to each step's ``fit``.
+
+        """
+        steps = self._get_steps()
+        for i, step in enumerate(steps):
+            updates = step.fit(data, *args, **kwargs)
+            if updates:
+                step.set_params(**updates)
+            if i < len(steps) - 1:
+                data = self._run(steps[i:i + 1], data, chunk_size)
+        return
+
+    def transform(self, data, chunk_size: [int, None] = None):
+        """Transforms the data with each of the steps, in sequence
+
+        Parameters
+        ----------
+        data
+            Input data to the first step.
+        chunk_size : int, optional
+            Number of rows to pass through all the steps at a time
+            (default is all at once).
+
+        Returns
+        -------
+        object
+            Output of the last step.
+
+        """
+        return self._run(self._get_steps(), data, chunk_size)
+
+    def _get_steps(self) -> List[Transform]:
+        """Gets (and checks) the steps of this pipeline"""
+        steps = self.steps
+        if not steps:
+            raise ValueError("The pipeline has no steps")
+        for step in steps:
+            if not isinstance(step, Transform):
+                raise TypeError("Not a Transform: %r" % (step,))
+        return steps
+
+    def _run(self, steps: List[Transform], data,
+             chunk_size: [int, None]):
+        """Passes the data (or each chunk of it) through the steps"""
+        if chunk_size is None:
+            return _apply(steps, data, dict())
+
+        data = np.asarray(data)
+        n = len(data)
+        buffers = dict()
+        output = None
+        for start, stop in iter_chunks(n, max(int(chunk_size), 1)):
+            result = np.asarray(_apply(steps, data[start:stop], buffers))
+            if len(result) != stop - start:
+                raise ValueError(
+                    "Output for a chunk must be the same length as the chunk"
+                )
+            if output is None:
+                output = np.empty((n,) + result.shape[1:], result.dtype)
+            output[start:stop] = result
+        if output is None:
+            return _apply(steps, data, buffers)
+        return output
+
+
+#
+#   Functions
+#
+
+def _apply(steps: List[Transform], data,
+           buffers: Dict[Tuple, List[np.ndarray]]):
+    """Passes data through each of the steps"""
+    for step in steps:
+        if (_writes_out(step) and isinstance(data, np.ndarray)
+                and not data.dtype.hasobject):
+            data = step.transform(data, out=_get_buffer(buffers, data))
+        else:
+            data = step.transform(data)
+    return data
+
+
+def _writes_out(step: Type[Transform]) -> bool:
+    """Whether or not a step can write its output to a given buffer"""
+    try:
+        params = inspect.signature(step.transform).parameters
+    except (TypeError, ValueError):
+        return False
+    return 'out' in params
+
+
+def _get_buffer(buffers: Dict[Tuple, List[np.ndarray]],
+                data: np.ndarray) -> np.ndarray:
+    """Gets a buffer like the data (which doesn't overlap it)"""
+    pool = buffers.setdefault((data.shape, data.dtype.str), list())
+    for buffer in pool:
+        if not np.may_share_memory(buffer, data):
+            return buffer
+    buffer = np.empty_like(data)
+    pool.append(buffer)
+    return buffer
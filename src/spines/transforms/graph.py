@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Graphs of transforms, run with independent branches in parallel.
+"""
+#
+#   Imports
+#
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+from typing import Type
+
+from ..parameters.base import Parameter
+from ..utils.concurrency import get_executor
+from .base import Transform
+
+
+#
+#   Classes
+#
+
+class TransformGraph(Transform):
+    """
+    Transform made of a graph of transforms (and models)
+
+    Each node of the graph is a transform, called with the outputs of
+    the nodes (or the inputs to the graph) it has edges from, in the
+    order the edges were added.  Nodes without any edges into them are
+    called with all of the graph's inputs.  The output of the graph is
+    the output of its `outputs` nodes (by default the nodes with no
+    edges out of them).
+
+    Nodes are run (and fit) in a topological order, with each node
+    submitted to a pool of workers as soon as all of its inputs are
+    ready, so independent branches of the graph run concurrently.  The
+    output of each node is discarded as soon as all of the nodes using
+    it are done.
+
+    Parameters
+    ----------
+    inputs : str or list, optional
+        Name(s) of the inputs to the graph (default is ``'input'``).
+    outputs : str or list, optional
+        Name(s) of the nodes whose outputs are the output of the graph
+        (default is the nodes which aren't the input to any others).
+
+    """
+    inputs = Parameter(list)
+    outputs = Parameter(list)
+    nodes = Parameter(dict)
+    edges = Parameter(list)
+
+    def __init__(self, inputs: [str, List[str], None] = None,
+                 outputs: [str, List[str], None] = None, **kwargs):
+        super(TransformGraph, self).__init__(**kwargs)
+        self.inputs = _as_list(inputs or 'input')
+        self.outputs = _as_list(outputs or [])
+        self.nodes = dict()
+        self.edges = list()
+        return
+
+    def clone(self) -> 'TransformGraph':
+        """Creates a new, unfitted, copy of this graph
+
+        Returns
+        -------
+        TransformGraph
+            New graph of (unfitted) clones of each of the nodes.
+
+        """
+        ret = super(TransformGraph, self).clone()
+        ret.inputs = list(self.inputs)
+        ret.outputs = list(self.outputs)
+        ret.nodes = {k: v.clone() for k, v in self.nodes.items()}
+        ret.edges = list(self.edges)
+        return ret
+
+    def add_node(self, name: str, transform: Transform,
+                 inputs: [str, Iterable[str], None] = None) -> None:
+        """Adds a node to the graph
+
+        Parameters
+        ----------
+        name : str
+            Name of the node.
+        transform : Transform
+            The transform (or model) of the node.
+        inputs : str or list, optional
+            Name(s) of the nodes (or graph inputs) to add edges from.
+
+        Raises
+        ------
+        ValueError
+            If there's already a node or input with the same `name`.
+
+        """
+        if not isinstance(transform, Transform):
+            raise TypeError("Not a Transform: %r" % (transform,))
+        if name in self.nodes or name in self.inputs:
+            raise ValueError("Name already used in the graph: %s" % name)
+        self.nodes = dict(self.nodes, **{name: transform})
+        for source in _as_list(inputs or []):
+            self.add_edge(source, name)
+        return
+
+    def add_edge(self, source: str, target: str) -> None:
+        """Adds an edge to the graph
+
+        Parameters
+        ----------
+        source : str
+            Name of the node (or graph input) whose output to use.
+        target : str
+            Name of the node to pass the output to (as its next
+            argument).
+
+        Raises
+        ------
+        ValueError
+            If either of the nodes don't exist.
+
+        """
+        if source not in self.nodes and source not in self.inputs:
+            raise ValueError("Unknown node or input: %s" % source)
+        if target not in self.nodes:
+            raise ValueError("Unknown node: %s" % target)
+        self.edges = self.edges + [(source, target)]
+        return
+
+    def get_order(self) -> List[str]:
+        """Gets the nodes in the order they're run (without concurrency)
+
+        Returns
+        -------
+        list
+            Names of the nodes, in a topological order.
+
+        Raises
+        ------
+        ValueError
+            If the graph has a cycle.
+
+        """
+        targets = self._get_targets()
+        waiting = {
+            k: len([x for x in v if x in self.nodes])
+            for k, v in self._get_sources().items()
+        }
+        ready = deque(k for k, v in waiting.items() if not v)
+        ret = list()
+        while ready:
+            name = ready.popleft()
+            ret.append(name)
+            for target in targets.get(name, ()):
+                waiting[target] -= 1
+                if not waiting[target]:
+                    ready.append(target)
+        if len(ret) != len(self.nodes):
+            raise ValueError("The graph has a cycle")
+        return ret
+
+    def fit(self, *data, executor: [str, None] = 'thread',
+            workers: [int, None] = None, **kwargs) -> None:
+        """Fits each of the nodes, on the outputs of the nodes before it
+
+        Parameters
+        ----------
+        data
+            The inputs to the graph, followed by any additional data
+            (e.g. outputs) to pass to each node's ``fit``.
+        executor : str, optional
+            Type of worker pool to use, ``'thread'`` (default) or
+            ``'process'``, or :obj:`None` to fit each node in turn.
+        workers : int, optional
+            Number of workers to use (default is the number of CPUs
+            available).
+        kwargs : optional
+            Additional keyword-arguments to pass to each node's ``fit``.
+
+        """
+        n = len(self.inputs)
+        if len(data) < n:
+            raise ValueError("Requires each of the graph's inputs")
+        targets = self._get_targets()
+        fitted = dict()
+
+        def submit(name: str, values: List[object]) -> Tuple:
+            return _fit_node, (
+                self.nodes[name], values, data[n:], kwargs,
+                bool(targets.get(name))
+            )
+
+        def complete(name: str, result: Tuple[Transform, object]):
+            fitted[name], output = result
+            return output
+
+        self._run(data[:n], submit, complete, executor, workers)
+        self.nodes = dict(self.nodes, **fitted)
+        return
+
+    def transform(self, *data, executor: [str, None] = 'thread',
+                  workers: [int, None] = None):
+        """Transforms the data with the graph
+
+        Parameters
+        ----------
+        data
+            The inputs to the graph.
+        executor : str, optional
+            Type of worker pool to use, ``'thread'`` (default) or
+            ``'process'``, or :obj:`None` to run each node in turn.
+        workers : int, optional
+            Number of workers to use (default is the number of CPUs
+            available).
+
+        Returns
+        -------
+        object
+            Output of the graph's output node (or a tuple of the outputs
+            if there's more than one).
+
+        """
+        if len(data) != len(self.inputs):
+            raise ValueError(
+                "Requires %d input(s), got %d" % (len(self.inputs), len(data))
+            )
+
+        def submit(name: str, values: List[object]) -> Tuple:
+            return _transform_node, (self.nodes[name], values)
+
+        values = self._run(
+            data, submit, lambda name, output: output, executor, workers
+        )
+        outputs = self._get_outputs()
+        if len(outputs) == 1:
+            return values[outputs[0]]
+        return tuple(values[x] for x in outputs)
+
+    def _get_sources(self) -> Dict[str, List[str]]:
+        """Gets the inputs of each node, in order"""
+        ret = {k: list() for k in self.nodes}
+        for source, target in self.edges:
+            ret[target].append(source)
+        for k, v in ret.items():
+            if not v:
+                ret[k] = list(self.inputs)
+        return ret
+
+    def _get_targets(self) -> Dict[str, List[str]]:
+        """Gets the nodes using the output of each node (or input)"""
+        ret = dict()
+        for target, sources in self._get_sources().items():
+            for source in sources:
+                ret.setdefault(source, list()).append(target)
+        return ret
+
+    def _get_outputs(self) -> List[str]:
+        """Gets the names of the output nodes"""
+        if self.outputs:
+            return self.outputs
+        targets = self._get_targets()
+        return [k for k in self.nodes if not targets.get(k)]
+
+    def _run(self, data: Tuple, submit: Callable, complete: Callable,
+             executor: [str, None], workers: [int, None]) -> Dict:
+        """Runs each of the nodes (concurrently, where possible)"""
+        order = self.get_order()
+        if not order:
+            raise ValueError("The graph has no nodes")
+        sources = self._get_sources()
+        targets = self._get_targets()
+        keep = set(self._get_outputs())
+        values = dict(zip(self.inputs, data))
+        uses = {k: len(v) for k, v in targets.items()}
+        waiting = {
+            k: len([x for x in v if x in self.nodes])
+            for k, v in sources.items()
+        }
+
+        def finish(name: str, output) -> List[str]:
+            values[name] = output
+            for source in sources[name]:
+                uses[source] -= 1
+                if not uses[source] and source not in keep:
+                    del values[source]
+            if not targets.get(name) and name not in keep:
+                del values[name]
+            ready = list()
+            for target in targets.get(name, ()):
+                waiting[target] -= 1
+                if not waiting[target]:
+                    ready.append(target)
+            return ready
+
+        def start(name: str):
+            return submit(name, [values[x] for x in sources[name]])
+
+        if executor is None or workers == 1:
+            for name in order:
+                func, args = start(name)
+                finish(name, complete(name, func(*args)))
+            return values
+
+        ready = deque(x for x in order if not waiting[x])
+        with get_executor(executor, workers) as pool:
+            pending = dict()
+            try:
+                while ready or pending:
+                    while ready:
+                        name = ready.popleft()
+                        func, args = start(name)
+                        pending[pool.submit(func, *args)] = name
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = pending.pop(future)
+                        ready.extend(
+                            finish(name, complete(name, future.result()))
+                        )
+            finally:
+                for future in pending:
+                    future.cancel()
+        return values
+
+
+#
+#   Functions
+#
+
+def _as_list(value: [str, Iterable[str]]) -> List[str]:
+    """Gets a name (or names) as a list of names"""
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _fit_node(transform: Type[Transform], values: List[object],
+              args: Tuple, kwargs: dict,
+              output: bool) -> Tuple[Transform, object]:
+    """Fits a node (and gets its output, if used by other nodes)"""
+    updates = transform.fit(*values, *args, **kwargs)
+    if updates:
+        transform.set_params(**updates)
+    if not output:
+        return transform, None
+    return transform, transform.transform(*values)
+
+
+def _transform_node(transform: Type[Transform], values: List[object]):
+    """Gets the output of a node"""
+    return transform.transform(*values)
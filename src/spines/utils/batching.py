@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+Utilities for applying functions to data in batches.
+"""
+#
+#   Imports
+#
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import wait
+from functools import partial
+from itertools import islice
+import queue
+import threading
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from uuid import uuid4
+
+import numpy as np
+
+from .concurrency import get_executor
+from .concurrency import get_worker_count
+
+
+#
+#   Variables
+#
+
+_WORKER_DATA = dict()
+
+_END = object()
+
+_POLL_INTERVAL = 0.1
+
+
+#
+#   Functions
+#
+
+def iter_chunks(n: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """Generates the bounds of consecutive chunks of a sequence
+
+    Parameters
+    ----------
+    n : int
+        Length of the sequence to split.
+    chunk_size : int
+        Maximum length of each chunk.
+
+    Yields
+    ------
+    tuple
+        Start and stop position of each chunk.
+
+    """
+    for start in range(0, n, chunk_size):
+        yield start, min(start + chunk_size, n)
+
+
+def iter_batches(iterable: Iterable, batch_size: int) -> Iterator[List]:
+    """Groups the items of an iterable into batches
+
+    Parameters
+    ----------
+    iterable : iterable
+        Items to group (which are read lazily).
+    batch_size : int
+        Maximum number of items in each batch.
+
+    Yields
+    ------
+    list
+        The next batch of items, in order.
+
+    """
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least 1")
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def map_stream(
+    func: Callable, iterable: Iterable, batch_size: int = 1024,
+    read_ahead: int = 0, collate: [Callable, None] = np.asarray, **kwargs
+) -> Iterator:
+    """Applies a function to the items of an iterable in batches
+
+    Items are lazily grouped into batches of up to `batch_size`, which
+    are each (collated and) passed to `func`, and the outputs for each
+    item are yielded in order.  Only a bounded number of batches are held
+    in memory at once.
+
+    Parameters
+    ----------
+    func : callable
+        Function to apply, which must return an output of the same
+        length as the batch it's given.
+    iterable : iterable
+        Items to apply the function to.
+    batch_size : int, optional
+        Maximum number of items in each batch (default is 1024).
+    read_ahead : int, optional
+        Number of batches to read ahead on a background thread while the
+        current batch is processed (default is 0, read in the calling
+        thread).
+    collate : callable, optional
+        Function to combine the items of each batch into the input to
+        `func` (default is :func:`numpy.asarray`), or :obj:`None` to pass
+        the list of items.
+    kwargs : optional
+        Additional keyword-arguments to pass to each `func` call.
+
+    Yields
+    ------
+    object
+        The output for each item, in order.
+
+    Raises
+    ------
+    ValueError
+        If the output for a batch isn't the same length as the batch.
+
+    """
+    batches = iter_batches(iterable, batch_size)
+    if read_ahead > 0:
+        batches = iter_prefetched(batches, read_ahead)
+    try:
+        for batch in batches:
+            n = len(batch)
+            if collate is not None:
+                batch = collate(batch)
+            output = func(batch, **kwargs)
+            if len(output) != n:
+                raise ValueError(
+                    "Output for a batch must be the same length as the batch"
+                )
+            yield from output
+    finally:
+        batches.close()
+    return
+
+
+def map_chunks(
+    func: Callable, data, chunk_size: [int, None] = None,
+    workers: [int, None] = None, executor: str = 'thread', **kwargs
+) -> np.ndarray:
+    """Applies a function to chunks of an array, in parallel
+
+    The `data` is split into chunks along its first axis and `func` is
+    called on each chunk (concurrently, on a pool of workers).  The
+    output for the first chunk determines the type and shape of the
+    output array, which is allocated once and filled in with each
+    chunk's output.
+
+    When using processes, `func` (e.g. a bound method of a model) is sent
+    to each worker once and the `data` is placed in shared memory, so
+    only the positions of each chunk (and the outputs) are sent between
+    processes.
+
+    Parameters
+    ----------
+    func : callable
+        Function to apply, which must return an array-like output of the
+        same length as the input chunk it's given.
+    data : array_like
+        Data to split into chunks (along the first axis).
+    chunk_size : int, optional
+        Number of rows in each chunk (default is to split the data into
+        four chunks per worker).
+    workers : int, optional
+        Number of workers to use (default is the number of CPUs
+        available).
+    executor : str, optional
+        Type of worker pool to use, ``'thread'`` (default) or
+        ``'process'``.
+    kwargs : optional
+        Additional keyword-arguments to pass to each `func` call.
+
+    Returns
+    -------
+    numpy.ndarray
+        The outputs for all of the data, in order.
+
+    Raises
+    ------
+    ValueError
+        If the output for a chunk isn't the same length as the chunk.
+
+    """
+    if kwargs:
+        func = partial(func, **kwargs)
+    data = np.asarray(data)
+    n = len(data)
+    workers = get_worker_count(workers)
+    if chunk_size is None:
+        chunk_size = -(-n // (4 * workers))
+    chunk_size = max(int(chunk_size), 1)
+
+    chunks = iter_chunks(n, chunk_size)
+    start, stop = next(chunks, (0, 0))
+    first = _check_output(func(data[start:stop]), stop - start)
+    output = np.empty((n,) + first.shape[1:], dtype=first.dtype)
+    output[start:stop] = first
+    if stop >= n:
+        return output
+
+    token = uuid4().hex
+    shared = None
+    source, target = data, None
+    if executor == 'thread':
+        target = output
+    elif not data.dtype.hasobject:
+        # Imported here since shared memory needs Python 3.8+
+        from .shared import SharedArray
+        shared = source = SharedArray(data)
+    try:
+        pool = get_executor(
+            executor, min(workers, -(-(n - stop) // chunk_size)),
+            initializer=_initialize, initargs=(token, func, source, target)
+        )
+        with pool:
+            pending = dict()
+            try:
+                for bounds in chunks:
+                    pending[pool.submit(_apply, token, *bounds)] = bounds
+                    if len(pending) >= 2 * workers:
+                        _collect(pending, output, target)
+                while pending:
+                    _collect(pending, output, target)
+            finally:
+                for future in pending:
+                    future.cancel()
+    finally:
+        if shared is not None:
+            shared.unlink()
+        _WORKER_DATA.pop(token, None)
+    return output
+
+
+def iter_prefetched(iterator: Iterator, size: int) -> Iterator:
+    """Reads items from an iterator ahead of time on a background thread
+
+    Parameters
+    ----------
+    iterator : iterator
+        Items to read (which must be safe to read from another thread).
+    size : int
+        Maximum number of items to read ahead of the consumer.
+
+    Yields
+    ------
+    object
+        The items of the `iterator`, in order.  Any exception raised
+        while reading is re-raised here, and closing the generator stops
+        the background thread.
+
+    """
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((_END, None))
+        except BaseException as ex:
+            put((_END, ex))
+        return
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, ex = items.get()
+            if ex is not None:
+                raise ex
+            if item is _END:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+    return
+
+
+def _collect(pending: dict, output: np.ndarray,
+             target: [np.ndarray, None]) -> None:
+    """Waits for at least one pending chunk and stores its output"""
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        start, stop = pending.pop(future)
+        result = future.result()
+        if target is None:
+            output[start:stop] = result
+    return
+
+
+def _initialize(token: str, func: Callable, source, target) -> None:
+    """Initializes a worker with the function and data to apply it to"""
+    _WORKER_DATA[token] = (func, source, target)
+    return
+
+
+def _apply(token: str, start: int, stop: int) -> [np.ndarray, None]:
+    """Applies the function to a chunk of the data"""
+    func, source, target = _WORKER_DATA[token]
+    if not isinstance(source, np.ndarray):
+        source = source.array
+    result = _check_output(func(source[start:stop]), stop - start)
+    if target is None:
+        return result
+    target[start:stop] = result
+    return None
+
+
+def _check_output(output, n: int) -> np.ndarray:
+    """Checks the output for a chunk is the right length"""
+    output = np.asarray(output)
+    if output.ndim == 0 or len(output) != n:
+        raise ValueError(
+            "Output for a chunk must be the same length as the chunk"
+        )
+    return output
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrency utilities for spines.
+"""
+#
+#   Imports
+#
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import Callable
+from typing import Tuple
+
+
+#
+#   Constants
+#
+
+EXECUTOR_TYPES = ('thread', 'process')
+
+
+#
+#   Functions
+#
+
+def get_worker_count(workers: [int, None] = None) -> int:
+    """Gets the number of workers to use
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of workers requested (default is :obj:`None`, which uses
+        the number of CPUs available).
+
+    Returns
+    -------
+    int
+        Number of workers to use.
+
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return max(int(workers), 1)
+
+
+def get_executor(
+    executor: str = 'process',
+    workers: [int, None] = None,
+    initializer: [Callable, None] = None,
+    initargs: Tuple = ()
+) -> Executor:
+    """Creates a pool executor of the given type
+
+    Parameters
+    ----------
+    executor : str, optional
+        Type of executor to create, either ``'thread'`` or ``'process'``
+        (default).
+    workers : int, optional
+        Maximum number of workers in the pool (default is :obj:`None`,
+        which uses the number of CPUs available).
+    initializer : callable, optional
+        Function to call at the start of each worker.
+    initargs : tuple, optional
+        Arguments to pass to the `initializer`.
+
+    Returns
+    -------
+    Executor
+        The executor to use.
+
+    Raises
+    ------
+    ValueError
+        If the given `executor` type is not valid.
+
+    """
+    workers = get_worker_count(workers)
+    if executor == 'thread':
+        return ThreadPoolExecutor(
+            workers, initializer=initializer, initargs=initargs
+        )
+    elif executor == 'process':
+        return ProcessPoolExecutor(
+            workers, initializer=initializer, initargs=initargs
+        )
+    raise ValueError(
+        "Invalid executor type: %s (must be one of: %s)" % (
+            executor, ', '.join(EXECUTOR_TYPES)
+        )
+    )
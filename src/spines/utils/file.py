@@ -8,10 +8,14 @@ File utilities for spines.
 import os
 import pickle
 import tarfile
+from typing import Dict
 from typing import List
 from typing import Tuple
 import zipfile
 
+import numpy as np
+from xxhash import xxh3_128
+
 
 #
 #   Constants
@@ -71,6 +75,121 @@ def load_pickle(*path: Tuple[str]) -> object:
     return ret
 
 
+def save_shared_pickle(
+    obj, arrays: Dict[str, np.ndarray], *path: Tuple[str]
+) -> str:
+    """Save a single object, pickled, storing its arrays separately
+
+    Each (non-object) numpy array in the object is replaced, in the
+    pickle, by a key for its contents and added to the given `arrays`,
+    so arrays with the same contents (within the object, or across each
+    object saved with the same `arrays`) are only stored once.  The
+    `arrays` should then be saved with :func:`save_arrays`.
+
+    Parameters
+    ----------
+    obj
+        Object to save in pickled format.
+    arrays : dict
+        Arrays stored so far, by key, to add this object's arrays to.
+    path : str
+        Path of the file to save to.
+
+    Returns
+    -------
+    str
+        The path of the file created.
+
+    See Also
+    --------
+    load_shared_pickle, save_arrays
+
+    """
+    file = os.path.join(*path)
+    if not file.endswith('.pkl'):
+        file += '.pkl'
+    with open(file, 'wb') as fout:
+        _SharedPickler(fout, arrays).dump(obj)
+    return file
+
+
+def load_shared_pickle(
+    arrays: Dict[str, np.ndarray], *path: Tuple[str]
+) -> object:
+    """Load a single object saved with :func:`save_shared_pickle`
+
+    Arrays with the same contents (in the object) are loaded as the same,
+    read-only, array object, so the memory for them is shared.
+
+    Parameters
+    ----------
+    arrays : dict
+        The arrays saved with the object (see :func:`load_arrays`).
+    path : str
+        Path of the file to load.
+
+    Returns
+    -------
+    object
+        Object loaded from file.
+
+    """
+    file = os.path.join(*path)
+    if not file.endswith('.pkl'):
+        file += '.pkl'
+    with open(file, 'rb') as fin:
+        unpickler = _SharedUnpickler(fin, arrays)
+        ret = unpickler.load()
+    for key, count in unpickler.counts.items():
+        if count > 1:
+            arrays[key].flags.writeable = False
+    return ret
+
+
+def save_arrays(arrays: Dict[str, np.ndarray], *path: Tuple[str]) -> str:
+    """Save a set of arrays, by key, to a single (uncompressed) file
+
+    Parameters
+    ----------
+    arrays : dict
+        Arrays to save, by key.
+    path : str
+        Path of the file to save to.
+
+    Returns
+    -------
+    str
+        The path of the file created.
+
+    """
+    file = os.path.join(*path)
+    if not file.endswith('.npz'):
+        file += '.npz'
+    np.savez(file, **arrays)
+    return file
+
+
+def load_arrays(*path: Tuple[str]) -> Dict[str, np.ndarray]:
+    """Load a set of arrays saved with :func:`save_arrays`
+
+    Parameters
+    ----------
+    path : str
+        Path of the file to load.
+
+    Returns
+    -------
+    dict
+        Arrays loaded from file, by key.
+
+    """
+    file = os.path.join(*path)
+    if not file.endswith('.npz'):
+        file += '.npz'
+    with np.load(file, allow_pickle=False) as data:
+        return {k: data[k] for k in data.files}
+
+
 def get_archive_extension(fmt: str) -> str:
     """Gets the file extension based on format given
 
@@ -121,13 +240,48 @@ def save_archive(
 
     file_ext = get_archive_extension(fmt)
     if not path.endswith(file_ext):
-        path = os.path.join(path, file_ext)
+        path += file_ext
 
     if fmt == 'zip':
         return _save_zip_archive(path, files)
     return _save_tar_archive(path, files, fmt=fmt)
 
 
+class _SharedPickler(pickle.Pickler):
+    """Pickler storing numpy arrays separately, by contents"""
+
+    def __init__(self, file, arrays: Dict[str, np.ndarray]):
+        super(_SharedPickler, self).__init__(
+            file, protocol=pickle.HIGHEST_PROTOCOL
+        )
+        self._arrays = arrays
+
+    def persistent_id(self, obj):
+        if type(obj) is not np.ndarray or obj.dtype.hasobject:
+            return None
+        m = xxh3_128()
+        m.update(obj.dtype.str.encode())
+        m.update(repr(obj.shape).encode())
+        m.update(np.ascontiguousarray(obj).data)
+        key = 'a%s' % m.hexdigest()
+        if key not in self._arrays:
+            self._arrays[key] = obj
+        return key
+
+
+class _SharedUnpickler(pickle.Unpickler):
+    """Unpickler for objects saved with a :class:`_SharedPickler`"""
+
+    def __init__(self, file, arrays: Dict[str, np.ndarray]):
+        super(_SharedUnpickler, self).__init__(file)
+        self._arrays = arrays
+        self.counts = dict()
+
+    def persistent_load(self, pid):
+        self.counts[pid] = self.counts.get(pid, 0) + 1
+        return self._arrays[pid]
+
+
 def _save_zip_archive(path: str, files: List[str]) -> str:
     """Saves the given `files` as a zip archive at the given `path`"""
     with _get_zip_archive(path, 'w') as archive:
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+Utilities for memoizing function calls.
+"""
+#
+#   Imports
+#
+from collections import OrderedDict
+from functools import wraps
+import pickle
+import sys
+import threading
+from typing import Callable
+from typing import Dict
+
+import numpy as np
+from xxhash import xxh3_128
+
+
+#
+#   Constants
+#
+
+DEFAULT_MAX_BYTES = 64 * 1024 ** 2
+
+_KEY_BYTES = 16
+
+_MISSING = object()
+
+
+#
+#   Classes
+#
+
+class MemoCache(object):
+    """
+    Least-recently-used cache of results, bounded by size in bytes
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum (approximate) total size of the results stored, in bytes
+        (default is 64 MiB).  The least recently used results are evicted
+        to make room for new ones, and results larger than this are never
+        stored.
+
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError("The maximum size can't be negative")
+        self._max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        return
+
+    def __getstate__(self) -> dict:
+        return {'max_bytes': self._max_bytes}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['max_bytes'])
+        return
+
+    def __repr__(self):
+        return '<%s entries=%s nbytes=%s hit_rate=%.3f>' % (
+            self.__class__.__name__, len(self), self._nbytes, self.hit_rate
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def max_bytes(self) -> int:
+        """int: Maximum total size of the results stored."""
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """int: Total size of the results currently stored."""
+        return self._nbytes
+
+    @property
+    def generation(self) -> int:
+        """int: Number of times this cache has been cleared."""
+        return self._generation
+
+    @property
+    def hit_rate(self) -> float:
+        """float: Fraction of lookups which were found in the cache."""
+        total = self.hits + self.misses
+        if not total:
+            return 0.0
+        return self.hits / total
+
+    def get(self, key, default=None):
+        """Gets a stored result, marking it as recently used
+
+        Parameters
+        ----------
+        key
+            Key of the result to get.
+        default : optional
+            Value to return if there's no result for the `key`.
+
+        Returns
+        -------
+        object
+            The result stored, or the `default` if there isn't one.
+
+        """
+        with self._lock:
+            try:
+                value, _ = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def put(self, key, value, generation: [int, None] = None) -> bool:
+        """Stores a result
+
+        Numpy arrays are stored as read-only copies, so that results
+        returned from the cache can't be modified by callers.
+
+        Parameters
+        ----------
+        key
+            Key to store the result under.
+        value
+            The result to store.
+        generation : int, optional
+            The :attr:`generation` of the cache when the result was
+            computed, if given the result is only stored if the cache
+            hasn't been cleared since (so results computed concurrently
+            with a change aren't stored).
+
+        Returns
+        -------
+        bool
+            Whether or not the result was stored (it's not if it's larger
+            than the maximum size of the cache).
+
+        """
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.flags.writeable = False
+        size = get_size(value) + _KEY_BYTES
+        if size > self._max_bytes:
+            return False
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._nbytes -= old[1]
+            self._entries[key] = (value, size)
+            self._nbytes += size
+            while self._nbytes > self._max_bytes:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self._nbytes -= old_size
+                self.evictions += 1
+        return True
+
+    def clear(self, *args) -> None:
+        """Removes all of the stored results
+
+        Accepts (and ignores) any arguments, so that it can be used
+        directly as a :meth:`ParameterStore.subscribe` callback.
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._generation += 1
+        return
+
+    def reset_stats(self) -> None:
+        """Resets the hit, miss and eviction counts"""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+        return
+
+    def stats(self) -> Dict[str, float]:
+        """Gets a summary of this cache's usage
+
+        Returns
+        -------
+        dict
+            The number of entries, bytes used, hits, misses, evictions
+            and hit rate.
+
+        """
+        return {
+            'entries': len(self),
+            'nbytes': self._nbytes,
+            'max_bytes': self._max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+        }
+
+
+#
+#   Functions
+#
+
+def memoize(func: Callable, cache: MemoCache,
+            bypass: [Callable[[], bool], None] = None) -> Callable:
+    """Wraps a function to store (and re-use) its results in a cache
+
+    Results are keyed by a fingerprint of the arguments (see
+    :func:`get_call_key`), calls with arguments which can't be
+    fingerprinted are always computed.
+
+    Parameters
+    ----------
+    func : callable
+        The function to memoize.
+    cache : MemoCache
+        Cache to store the results in.
+    bypass : callable, optional
+        Function called (with no arguments) before each call, if it
+        returns :obj:`True` the result is computed without using (or
+        storing it in) the cache.
+
+    Returns
+    -------
+    callable
+        The wrapped function, with the original available as its
+        ``__wrapped__`` attribute and the cache as ``cache``.
+
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if bypass is not None and bypass():
+            return func(*args, **kwargs)
+        key = get_call_key(args, kwargs)
+        if key is None:
+            return func(*args, **kwargs)
+        generation = cache.generation
+        ret = cache.get(key, _MISSING)
+        if ret is _MISSING:
+            ret = func(*args, **kwargs)
+            cache.put(key, ret, generation=generation)
+        return ret
+    wrapper.cache = cache
+    return wrapper
+
+
+def get_call_key(args: tuple, kwargs: dict) -> [bytes, None]:
+    """Gets a fingerprint of the arguments to a function call
+
+    Unlike :func:`spines.search.cache.fingerprint` values are
+    distinguished by type (e.g. ``1`` and ``1.0`` differ), since the
+    result of a call may depend on it.  Arrays are hashed by their type,
+    shape and contents, and other objects by their pickled
+    representation.
+
+    Parameters
+    ----------
+    args : tuple
+        Positional arguments of the call.
+    kwargs : dict
+        Keyword arguments of the call.
+
+    Returns
+    -------
+    bytes
+        Fingerprint of the arguments, or :obj:`None` if they can't be
+        fingerprinted (e.g. if one of them can't be pickled).
+
+    """
+    m = xxh3_128()
+    try:
+        for x in args:
+            _update_key(m, x)
+        for k in sorted(kwargs):
+            m.update(b'k:%d:' % len(k))
+            m.update(k.encode())
+            _update_key(m, kwargs[k])
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+    return m.digest()
+
+
+def get_size(obj) -> int:
+    """Gets the (approximate) size of an object in memory
+
+    Parameters
+    ----------
+    obj
+        Object to get the size of.
+
+    Returns
+    -------
+    int
+        Size of the object (including the items in any lists, tuples or
+        dictionaries) in bytes.
+
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject:
+            return obj.nbytes + sum(get_size(x) for x in obj.flat)
+        return obj.nbytes + sys.getsizeof(np.empty(0))
+    ret = sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        ret += sum(get_size(x) for x in obj)
+    elif isinstance(obj, dict):
+        ret += sum(get_size(k) + get_size(v) for k, v in obj.items())
+    return ret
+
+
+def _update_key(m, obj) -> None:
+    """Updates the given hash with an argument"""
+    if isinstance(obj, np.ndarray) and not obj.dtype.hasobject:
+        m.update(('a:%s:%s:' % (obj.dtype.str, obj.shape)).encode())
+        m.update(np.ascontiguousarray(obj).data)
+    else:
+        data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+        m.update(b'p:%d:' % len(data))
+        m.update(data)
+    return
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Utilities for sharing data between processes.
+"""
+#
+#   Imports
+#
+import sys
+from typing import List
+from typing import Tuple
+
+import numpy as np
+
+
+#
+#   Classes
+#
+
+class SharedArray(object):
+    """
+    Numpy array stored in shared memory
+
+    The array's data is copied into a block of shared memory once, after
+    which the :class:`SharedArray` can be sent to other processes (e.g.
+    as an argument to a task on a process pool) without copying the
+    data: only the name, shape and type of the block are pickled, and
+    the receiving process maps the same memory.
+
+    The process which creates the shared array owns the memory, and
+    should call :meth:`unlink` (or use the array as a context manager)
+    to free it once it's no longer needed.  Requires Python 3.8 or later.
+
+    Parameters
+    ----------
+    array : array_like
+        Data to copy into shared memory.
+
+    """
+
+    def __init__(self, array):
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise TypeError("Arrays of objects can't be shared")
+        self._shape = array.shape
+        self._dtype = array.dtype.str
+        self._shm = _get_shared_memory()(
+            create=True, size=max(array.nbytes, 1)
+        )
+        self._owner = True
+        self._array = self._create_array()
+        self._array[...] = array
+        return
+
+    def __repr__(self):
+        return '<%s name="%s" shape=%s dtype=%s>' % (
+            self.__class__.__name__, self.name, self._shape,
+            np.dtype(self._dtype)
+        )
+
+    def __len__(self):
+        return self._shape[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.unlink()
+        return
+
+    def __getstate__(self) -> dict:
+        return {
+            'name': self.name, 'shape': self._shape, 'dtype': self._dtype,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        self._shape = state['shape']
+        self._dtype = state['dtype']
+        self._shm = _attach(state['name'])
+        self._owner = False
+        self._array = self._create_array()
+        return
+
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, ...],
+               dtype: str) -> 'SharedArray':
+        """Attaches to a shared array created by another process
+
+        Parameters
+        ----------
+        name : str
+            Name of the shared memory block.
+        shape : tuple
+            Shape of the shared array.
+        dtype : str
+            Type of the shared array's data.
+
+        Returns
+        -------
+        SharedArray
+            View of the shared array (which this process doesn't own).
+
+        """
+        ret = cls.__new__(cls)
+        ret.__setstate__({'name': name, 'shape': shape, 'dtype': dtype})
+        return ret
+
+    @property
+    def spec(self) -> Tuple[str, Tuple[int, ...], str]:
+        """tuple: Name, shape and type needed to :meth:`attach` to this."""
+        return self.name, self._shape, self._dtype
+
+    @property
+    def name(self) -> str:
+        """str: Name of the shared memory block."""
+        return self._shm.name
+
+    @property
+    def array(self) -> np.ndarray:
+        """numpy.ndarray: View of the data in shared memory."""
+        return self._array
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """tuple: Shape of the shared array."""
+        return self._shape
+
+    def close(self) -> None:
+        """Closes this process's view of the shared memory"""
+        self._array = None
+        self._shm.close()
+        return
+
+    def unlink(self) -> None:
+        """Closes and frees the shared memory (if the owner)"""
+        self.close()
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+        return
+
+    def _create_array(self) -> np.ndarray:
+        """Creates the array view of the shared memory"""
+        return np.ndarray(
+            self._shape, dtype=np.dtype(self._dtype), buffer=self._shm.buf
+        )
+
+
+#
+#   Functions
+#
+
+def share_array(array: np.ndarray, shared: List[SharedArray]):
+    """Places an array in shared memory, if possible
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        Array to place in shared memory.
+    shared : list
+        List to add the new :class:`SharedArray` to, so that the caller
+        can :meth:`SharedArray.unlink` it once it's no longer needed.
+
+    Returns
+    -------
+    SharedArray or numpy.ndarray
+        The shared array, or the given `array` if it can't be shared
+        (i.e. if it's an array of objects).
+
+    """
+    if array.dtype.hasobject:
+        return array
+    ret = SharedArray(array)
+    shared.append(ret)
+    return ret
+
+
+def _get_shared_memory() -> type:
+    """Gets the shared memory class (only available on Python 3.8+)"""
+    try:
+        from multiprocessing.shared_memory import SharedMemory
+    except ImportError:
+        raise RuntimeError("Shared memory requires Python 3.8 or later")
+    return SharedMemory
+
+
+def _attach(name: str):
+    """Attaches to an existing block of shared memory
+
+    Worker processes share their parent's resource tracker, so (on
+    versions which always track shared memory) the block is still only
+    freed by the process which created it.
+
+    """
+    shared_memory = _get_shared_memory()
+    if sys.version_info >= (3, 13):
+        return shared_memory(name=name, track=False)
+    return shared_memory(name=name)
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+Model validation subpackage for spines.
+"""
+from .core import ValidationResult
+from .core import cross_validate
+from .utils import get_folds
+
+__all__ = [
+    # Functions
+    'cross_validate',
+    'get_folds',
+    # Results
+    'ValidationResult',
+]
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Core model validation functions.
+"""
+#
+#   Imports
+#
+import statistics
+import time
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Type
+from uuid import uuid4
+
+import numpy as np
+
+from ..model import Model
+from ..utils.concurrency import get_executor
+from ..utils.concurrency import get_worker_count
+from ..utils.shared import SharedArray
+from ..utils.shared import share_array
+from .utils import get_folds
+
+
+#
+#   Variables
+#
+
+_WORKER_DATA = dict()
+
+
+#
+#   Classes
+#
+
+class ValidationResult(object):
+    """
+    Results of validating a model on each of a number of folds
+
+    Attributes
+    ----------
+    scores : list
+        Score of the model on each held-out fold.
+    errors : list
+        Error of the model on each held-out fold (:obj:`None` for each if
+        the model doesn't implement ``error``).
+    parameters : list
+        Fitted parameter values of the model for each fold.
+    durations : list
+        Time taken (in seconds) to fit and evaluate each fold.
+
+    """
+
+    def __init__(
+        self, scores: List[float], errors: List[float],
+        parameters: List[Dict[str, object]], durations: List[float]
+    ):
+        self.scores = scores
+        self.errors = errors
+        self.parameters = parameters
+        self.durations = durations
+
+    def __repr__(self):
+        return '<%s folds=%s score=%s>' % (
+            self.__class__.__name__, len(self.scores), self.score
+        )
+
+    @property
+    def score(self) -> float:
+        """float: Mean score over the folds."""
+        return statistics.mean(self.scores)
+
+    @property
+    def score_std(self) -> float:
+        """float: Standard deviation of the scores over the folds."""
+        return statistics.pstdev(self.scores)
+
+    @property
+    def error(self) -> [float, None]:
+        """float: Mean error over the folds (if the model has errors)."""
+        if any(x is None for x in self.errors):
+            return None
+        return statistics.mean(self.errors)
+
+
+#
+#   Functions
+#
+
+def cross_validate(
+    model: [Type[Model], type], X, y=None, folds: int = 5,
+    workers: [int, None] = None, executor: str = 'process',
+    shuffle: bool = False, seed: [int, None] = None
+) -> ValidationResult:
+    """Cross-validates a model using k-fold cross-validation
+
+    A clone of the `model` (see :meth:`Model.clone`) is fit on all but
+    one of the folds of the data and then scored on the held-out fold,
+    for each fold, in parallel.  When using processes the data is copied
+    into shared memory once and only the positions of each fold are sent
+    to the workers.
+
+    Parameters
+    ----------
+    model : Model or type
+        The model (or model class) to validate, its hyper-parameter
+        values are used for each fold's model.
+    X : array_like
+        Input data for the model (split along the first axis).
+    y : array_like, optional
+        Output data for the model, if any.
+    folds : int, optional
+        Number of folds to use (default is 5).
+    workers : int, optional
+        Number of workers to use (default is the number of CPUs
+        available, at most one per fold).
+    executor : str, optional
+        Type of worker pool to use, ``'process'`` (default) or
+        ``'thread'``.
+    shuffle : bool, optional
+        Whether or not to shuffle the data before splitting it into
+        folds (default is :obj:`False`).
+    seed : int, optional
+        Seed to use when shuffling the data.
+
+    Returns
+    -------
+    ValidationResult
+        The results of each fold.
+
+    """
+    if isinstance(model, type):
+        model = model()
+    else:
+        model = model.clone()
+
+    data = [np.asarray(X)]
+    if y is not None:
+        data.append(np.asarray(y))
+    if any(len(x) != len(data[0]) for x in data):
+        raise ValueError("The inputs and outputs must be the same length")
+    order, bounds = get_folds(
+        len(data[0]), folds, shuffle=shuffle, seed=seed
+    )
+    if order is not None:
+        data.append(order)
+
+    token = uuid4().hex
+    shared = list()
+    try:
+        if executor == 'process':
+            data = [share_array(x, shared) for x in data]
+        workers = min(get_worker_count(workers), folds)
+        pool = get_executor(
+            executor, workers, initializer=_initialize,
+            initargs=(token, tuple(data), order is not None)
+        )
+        with pool:
+            results = list(pool.map(
+                _evaluate_fold, [token] * folds, [model] * folds,
+                [x[0] for x in bounds], [x[1] for x in bounds]
+            ))
+    finally:
+        for x in shared:
+            x.unlink()
+        _WORKER_DATA.pop(token, None)
+
+    return ValidationResult(*map(list, zip(*results)))
+
+
+def _initialize(token: str, data: Tuple, shuffled: bool) -> None:
+    """Initializes a worker with the data to validate on"""
+    _WORKER_DATA[token] = (data, shuffled)
+    return
+
+
+def _evaluate_fold(token: str, model: Type[Model], start: int,
+                   stop: int) -> Tuple:
+    """Fits a model on all but one fold and evaluates it on that fold"""
+    data, shuffled = _WORKER_DATA[token]
+    data = [x.array if isinstance(x, SharedArray) else x for x in data]
+    if shuffled:
+        order = data.pop()
+        test_idx = order[start:stop]
+        train_idx = np.concatenate((order[:start], order[stop:]))
+        train = [x[train_idx] for x in data]
+        test = [x[test_idx] for x in data]
+    else:
+        train = [np.concatenate((x[:start], x[stop:])) for x in data]
+        test = [x[start:stop] for x in data]
+
+    t_start = time.perf_counter()
+    model = model.clone()
+    model.fit(*train)
+    score = model.score(*test)
+    error = model.error(*test)
+    return (
+        score, error, model.get_params(), time.perf_counter() - t_start
+    )
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Utilities for the validation subpackage.
+"""
+#
+#   Imports
+#
+from typing import List
+from typing import Tuple
+
+import numpy as np
+
+
+#
+#   Functions
+#
+
+def get_folds(
+    n: int, folds: int = 5, shuffle: bool = False, seed: [int, None] = None
+) -> Tuple[[np.ndarray, None], List[Tuple[int, int]]]:
+    """Splits a number of samples into folds
+
+    Parameters
+    ----------
+    n : int
+        Number of samples to split.
+    folds : int, optional
+        Number of folds to split the samples into (default is 5).
+    shuffle : bool, optional
+        Whether or not to shuffle the samples before splitting them
+        (default is :obj:`False`, folds are contiguous).
+    seed : int, optional
+        Seed for the random number generator used to shuffle.
+
+    Returns
+    -------
+    tuple
+        The order of the samples (:obj:`None` if not shuffled) and the
+        start and stop position of each fold within that order.  Fold
+        sizes differ by at most one.
+
+    Raises
+    ------
+    ValueError
+        If there are fewer than two folds or fewer samples than folds.
+
+    """
+    if folds < 2:
+        raise ValueError("There must be at least two folds")
+    if n < folds:
+        raise ValueError(
+            "Cannot split %s samples into %s folds" % (n, folds)
+        )
+    order = None
+    if shuffle:
+        order = np.random.default_rng(seed).permutation(n)
+    sizes = np.full(folds, n // folds)
+    sizes[:n % folds] += 1
+    stops = np.cumsum(sizes)
+    return order, [(int(b - s), int(b)) for s, b in zip(sizes, stops)]
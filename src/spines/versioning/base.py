@@ -72,8 +72,8 @@ class BaseSignature(ABC):
         m.update(cls._get_bytes(obj))
         return m
 
-    @abstractmethod
     @classmethod
+    @abstractmethod
     def _get_bytes(cls, obj) -> bytes:
         """Gets the relevant bytes for a single object"""
         pass
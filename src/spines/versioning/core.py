@@ -5,8 +5,64 @@ Core classes for the spines versioning sub-package.
 #
 #   Imports
 #
+import inspect
+from types import FunctionType
+
+from ..parameters.base import Parameter
+from .base import BaseSignature
+from .utils import get_function_bytes
 
 
 #
 #   Classes
 #
+
+class ClassSignature(BaseSignature):
+    """
+    Signature of a class's code
+
+    The signature covers the code of each of the methods (and
+    properties) and the specifications of each of the parameters defined
+    on the class or any of its bases (other than :obj:`object`), so it
+    changes whenever any of the code which determines the behavior of
+    the class's instances does.  Docstrings and other attributes are
+    ignored.
+
+    Parameters
+    ----------
+    obj : object
+        The class (or an instance of the class) to get the signature of.
+
+    """
+
+    @classmethod
+    def _get_bytes(cls, obj) -> bytes:
+        ret = list()
+        for klass in inspect.getmro(obj):
+            if klass is object:
+                continue
+            ret.append(('class:%s.%s' % (
+                klass.__module__, klass.__qualname__
+            )).encode())
+            for k, v in sorted(vars(klass).items()):
+                v_bytes = cls._get_attr_bytes(v)
+                if v_bytes is not None:
+                    ret.append(k.encode() + b'=' + v_bytes)
+        return b';'.join(ret)
+
+    @classmethod
+    def _get_attr_bytes(cls, value) -> [bytes, None]:
+        """Gets the bytes for a single class attribute, if relevant"""
+        if isinstance(value, Parameter):
+            return repr(value).encode()
+        if isinstance(value, (classmethod, staticmethod)):
+            value = value.__func__
+        if isinstance(value, property):
+            return b'|'.join(
+                cls._get_attr_bytes(x) or b''
+                for x in (value.fget, value.fset, value.fdel)
+            )
+        value = inspect.unwrap(value) if callable(value) else value
+        if isinstance(value, FunctionType):
+            return get_function_bytes(value)
+        return None
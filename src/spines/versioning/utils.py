@@ -9,6 +9,7 @@ import difflib
 import inspect
 import re
 from textwrap import dedent
+from types import CodeType
 from types import FunctionType
 from typing import Dict
 from typing import List
@@ -155,15 +156,26 @@ def get_function_bytes(func: FunctionType):
     bytes
         Byte representation of the function.
     """
-    bytecode = func.__code__.co_code
-    consts = func.__code__.co_consts[1:]
-    dep_objs = func.__code__.co_names
-    all_vars = func.__code__.co_varnames
+    return _get_code_bytes(func.__code__)
+
+
+def _get_code_bytes(code: CodeType) -> bytes:
+    """Gets a byte-representation of a code object (and any nested code
+    objects, e.g. for inner functions, comprehensions or lambdas)"""
+    bytecode = code.co_code
+    consts = code.co_consts[1:]
+    dep_objs = code.co_names
+    all_vars = code.co_varnames
 
     ret = []
     for v in (consts, dep_objs, all_vars):
         for i_v in v:
-            ret.append('str:%s' % i_v)
+            if isinstance(i_v, CodeType):
+                ret.append('code:%s' % _get_code_bytes(i_v).hex())
+            elif isinstance(i_v, frozenset):
+                ret.append('set:%s' % sorted(repr(x) for x in i_v))
+            else:
+                ret.append('str:%s' % (i_v,))
     return bytecode + ','.join(ret).encode()
 
 
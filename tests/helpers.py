@@ -5,8 +5,16 @@ Helper functions and classes for unit tests.
 #
 #   Imports
 #
+import numpy as np
+
+from spines import HyperBounded
+from spines import HyperChoice
+from spines import HyperIntRange
+from spines import HyperIntervalSet
+from spines import HyperLogBounded
 from spines import Model
 from spines import Parameter
+from spines.parameters import ConcurrentParameterStore
 
 
 #
@@ -35,6 +43,166 @@ class LineModel(Model):
         return (y - pred_y) ** 2
 
 
+class ScaledLineModel(Model):
+    """
+    Test model class for a line through the origin, with hyper-parameters
+    """
+    m = Parameter(float)
+    shift = HyperIntRange(low=0, high=4, default=0)
+    scale = HyperChoice(choices=[0.5, 1.0, 2.0], default=1.0)
+
+    def fit(self, x, y):
+        """Fits the model"""
+        self.m = self.scale * y / (x + self.shift)
+
+    def predict(self, x):
+        """Get single prediction from fitted model"""
+        return self.m * x
+
+    def error(self, x, y):
+        """Mean squared error"""
+        return np.mean((y - self.predict(x)) ** 2)
+
+
+class GradientLineModel(Model):
+    """
+    Test model class for a line through the origin, fit iteratively
+    """
+    m = Parameter(float, default=0.0)
+    rate = HyperLogBounded(low=1e-3, high=1.0, default=0.1)
+
+    def fit(self, x, y):
+        """Single gradient descent step"""
+        self.m = self.m + self.rate * np.mean((y - self.m * x) * x)
+
+    def partial_fit(self, x, y):
+        """Single gradient descent step on a chunk of the data"""
+        self.m = self.m + self.rate * np.mean((y - self.m * x) * x)
+
+    def predict(self, x):
+        """Get single prediction from fitted model"""
+        return self.m * x
+
+    def error(self, x, y):
+        """Mean squared error"""
+        return np.mean((y - self.predict(x)) ** 2)
+
+    def loss(self, y, pred_y):
+        """Squared error of each prediction"""
+        return (y - pred_y) ** 2
+
+
+class ConcurrentLineModel(GradientLineModel):
+    """
+    Test model class for a line through the origin, fit iteratively, with
+    its parameters in a concurrent store
+    """
+    __param_store__ = ConcurrentParameterStore
+
+
+class MomentumLineModel(GradientLineModel):
+    """
+    Test model class for a line through the origin, fit with momentum on
+    randomly sampled rows
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(MomentumLineModel, self).__init__(*args, **kwargs)
+        self.velocity = 0.0
+
+    def partial_fit(self, x, y):
+        """Momentum gradient step on a random sample of the chunk"""
+        idx = np.random.randint(0, len(x), len(x))
+        grad = np.mean((y[idx] - self.m * x[idx]) * x[idx])
+        self.velocity = 0.9 * self.velocity + self.rate * grad
+        self.m = self.m + self.velocity
+
+    def get_train_state(self):
+        return {'velocity': self.velocity}
+
+    def set_train_state(self, state):
+        self.velocity = state['velocity']
+
+
+class LinearModel(Model):
+    """
+    Test model class for a least-squares line fit to arrays of data
+    """
+    m = Parameter(float)
+    b = Parameter(float)
+
+    def fit(self, x, y):
+        """Least-squares fit of the line"""
+        self.m, self.b = np.polyfit(x, y, 1)
+
+    def predict(self, x, scale=1.0):
+        """Get (scaled) predictions from fitted model"""
+        return scale * (self.m * x + self.b)
+
+    def error(self, x, y):
+        """Mean squared error"""
+        return float(np.mean((y - self.predict(x)) ** 2))
+
+
+class RunningMeanModel(Model):
+    """
+    Test model class predicting the mean output, fit incrementally
+    """
+    count = Parameter(int, default=0)
+    mean = Parameter(float, default=0.0)
+
+    def partial_fit(self, x, y):
+        """Updates the running mean with a chunk of outputs"""
+        count = self.count + len(y)
+        self.mean = self.mean + (np.sum(y) - len(y) * self.mean) / count
+        self.count = count
+
+    def predict(self, x):
+        """Predicts the mean for each input"""
+        return np.full(len(x), self.mean)
+
+
+class VectorModel(Model):
+    """
+    Test model class with an array parameter, stepped by each fit
+    """
+    w = Parameter(np.ndarray)
+
+    def fit(self, x, y):
+        """Adds one to each weight"""
+        return {'w': self.w + 1.0}
+
+    def predict(self, x):
+        """Linear combination of the inputs"""
+        return x @ self.w
+
+
+class MixedSpaceModel(Model):
+    """
+    Test model class with one of each kind of hyper-parameter
+    """
+    a = HyperLogBounded(low=1e-4, high=1.0, default=0.1)
+    b = HyperIntRange(low=0, high=100, step=5, default=0)
+    c = HyperChoice(choices=['x', 'y', 'z'], default='x')
+    d = HyperBounded(float, minimum=0.0, maximum=1.0, default=0.5)
+    e = HyperIntervalSet(intervals=[(0.0, 1.0), (2.0, 3.0)], default=0.5)
+
+    def predict(self, x):
+        """Returns the input given"""
+        return x
+
+
+class FloatStepModel(Model):
+    """
+    Test model class with a hyper-parameter on a grid of float steps
+    """
+    s = HyperIntRange(float, low=0.0, high=0.3, step=0.1, default=0.0)
+
+    def predict(self, x):
+        """Returns the input, scaled"""
+        return self.s * x
+
+
 #
 #   Factory functions
 #
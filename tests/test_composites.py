@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the composites subpackage.
+"""
+#
+#   Imports
+#
+import os
+
+import numpy as np
+import pytest
+
+from spines import Ensemble
+from spines import Model
+from spines import ModelArray
+from spines import Parameter
+from spines.utils.file import extract_archive
+from spines.utils.file import load_arrays
+
+from .helpers import LineModel
+from .helpers import LinearModel
+from .helpers import ScaledLineModel
+
+
+#
+#   Helpers
+#
+
+class ThresholdModel(Model):
+    """
+    Test classifier predicting whether inputs are above a threshold
+    """
+    t = Parameter(float)
+    w = Parameter(np.ndarray)
+
+    def fit(self, x, y):
+        """Fits the threshold as the midpoint of the classes' means"""
+        self.t = float(np.mean(x[y == 1]) + np.mean(x[y == 0])) / 2.0
+        self.w = np.ones(16)
+
+    def predict(self, x):
+        """Predicts the class of each input"""
+        return (x > self.t).astype(int)
+
+
+class LineModelArray(ModelArray):
+    """
+    Test array of line models, with a vectorized predict
+    """
+    __model__ = LineModel
+
+    def predict(self, x):
+        """Predicts the outputs of every model for the inputs"""
+        return self.m[:, np.newaxis] * x + self.b[:, np.newaxis]
+
+
+def _get_lines(n=100):
+    """Gets line models with different slopes and intercepts"""
+    ret = list()
+    for i in range(n):
+        model = LineModel()
+        model.fit(1.0, float(i), intercept=float(i % 7))
+        ret.append(model)
+    return ret
+
+
+def _get_data(n=200, seed=0):
+    """Gets random inputs and outputs of a noisy line"""
+    rng = np.random.RandomState(seed)
+    x = rng.uniform(0.0, 1.0, n)
+    return x, 2.0 * x + 1.0 + rng.normal(0.0, 0.1, n)
+
+
+#
+#   Unit tests
+#
+
+class TestEnsemble(object):
+    """
+    Tests for ensembles of models
+    """
+
+    def _get_ensemble(self, **hyper_params):
+        ret = Ensemble()
+        ret.set_hyper_params(model=LinearModel(), **hyper_params)
+        return ret
+
+    @pytest.mark.parametrize('executor', ['thread', 'process'])
+    def test_fit_predict(self, executor):
+        x, y = _get_data()
+        ensemble = self._get_ensemble(n_members=8, seed=1)
+        ensemble.fit(x, y, workers=2, executor=executor)
+
+        assert len(ensemble.members) == 8
+        assert len({m.m for m in ensemble.members}) == 8
+        assert ensemble.parameters.final
+
+        stacked = ensemble.predict_members(x)
+        assert stacked.shape == (8, len(x))
+        assert np.allclose(ensemble.predict(x), stacked.mean(axis=0))
+        assert np.allclose(
+            ensemble.predict_members(x, workers=2), stacked
+        )
+        assert np.mean((ensemble.predict(x) - y) ** 2) < 0.02
+
+    def test_reproducible(self):
+        x, y = _get_data()
+        a = self._get_ensemble(n_members=4, seed=3)
+        b = a.clone()
+        a.fit(x, y, workers=1)
+        b.fit(x, y, workers=2)
+        assert [m.m for m in a.members] == [m.m for m in b.members]
+
+        c = self._get_ensemble(n_members=4, bootstrap=False)
+        c.fit(x, y)
+        assert len({m.m for m in c.members}) == 1
+
+    def test_reducers(self):
+        x, y = _get_data()
+        ensemble = self._get_ensemble(n_members=5, reduce='weighted')
+        ensemble.fit(x, y)
+
+        weights = ensemble.weights
+        assert weights.shape == (5,)
+        assert len(set(weights)) == 5
+        stacked = ensemble.predict_members(x)
+        assert np.allclose(
+            ensemble.predict(x), np.average(stacked, axis=0, weights=weights)
+        )
+        assert np.allclose(
+            ensemble.reduce_predictions(stacked, 'median'),
+            np.median(stacked, axis=0)
+        )
+        assert np.allclose(
+            ensemble.reduce_predictions(stacked, lambda p, w: p.max(axis=0)),
+            stacked.max(axis=0)
+        )
+        with pytest.raises(ValueError):
+            ensemble.reduce_predictions(stacked, 'mode')
+
+    def test_vote(self):
+        predictions = np.array([
+            ['a', 'b', 'c'],
+            ['a', 'c', 'c'],
+            ['b', 'c', 'a'],
+        ])
+        ensemble = Ensemble.from_models(
+            [LinearModel()] * 3, reduce='vote'
+        )
+        votes = ensemble.reduce_predictions(predictions)
+        assert list(votes) == ['a', 'c', 'c']
+
+        ensemble.weights = np.array([1.0, 1.0, 3.0])
+        votes = ensemble.reduce_predictions(predictions)
+        assert list(votes) == ['b', 'c', 'a']
+
+        x = np.linspace(0.0, 1.0, 101)
+        ensemble = Ensemble()
+        ensemble.set_hyper_params(
+            model=ThresholdModel(), n_members=5, reduce='vote'
+        )
+        ensemble.fit(x, (x > 0.5).astype(int))
+        votes = ensemble.predict(x)
+        assert votes.dtype.kind == 'i'
+        assert np.mean(votes == (x > 0.5)) > 0.9
+
+    def test_from_models(self):
+        models = list()
+        for m in (1.0, 2.0, 3.0):
+            model = LinearModel()
+            model.m, model.b = m, 0.0
+            models.append(model)
+        ensemble = Ensemble.from_models(models, weights=[1.0, 0.0, 1.0])
+
+        assert ensemble.predict(np.ones(2)) == pytest.approx([2.0, 2.0])
+        ensemble.set_hyper_params(reduce='weighted')
+        assert ensemble.predict(np.ones(1)) == pytest.approx([2.0])
+        with pytest.raises(ValueError):
+            Ensemble.from_models(models, weights=[1.0])
+
+    def test_save_deduplicated(self, tmp_path):
+        x = np.linspace(0.0, 1.0, 101)
+        ensemble = Ensemble()
+        ensemble.set_hyper_params(model=ThresholdModel(), n_members=4)
+        ensemble.fit(x, (x > 0.5).astype(int))
+
+        path = ensemble.save(str(tmp_path / 'ensemble'))
+        extracted = tmp_path / 'extracted'
+        extract_archive(path, str(extracted))
+        arrays = load_arrays(str(extracted), 'arrays')
+        assert len(arrays) == 2
+        assert sorted(os.listdir(str(extracted))) == [
+            'arrays.npz', 'class.pkl', 'hyperparameters.pkl',
+            'parameters.pkl',
+        ]
+
+        loaded = Ensemble.load(path)
+        assert isinstance(loaded, Ensemble)
+        assert loaded.parameters.final
+        assert loaded.n_members == 4
+        assert np.array_equal(loaded.predict(x), ensemble.predict(x))
+        assert np.array_equal(loaded.weights, ensemble.weights)
+        shared = [m.w for m in loaded.members]
+        assert all(w is shared[0] for w in shared)
+        assert not shared[0].flags.writeable
+
+
+class TestModelArray(object):
+    """
+    Tests for arrays of models stored by parameter
+    """
+
+    def test_columns(self):
+        models = _get_lines()
+        array = LineModelArray.from_models(models)
+
+        assert len(array) == 100
+        assert array.model is LineModel
+        assert array.m.dtype == np.float64
+        assert np.array_equal(array.m, [m.m for m in models])
+        assert np.array_equal(array['b'], [m.b for m in models])
+        assert sorted(array.columns) == ['b', 'm']
+        with pytest.raises(AttributeError):
+            array.c
+        with pytest.raises(KeyError):
+            array['c']
+
+    def test_vectorized_predict(self):
+        models = _get_lines()
+        array = LineModelArray.from_models(models)
+        x = np.linspace(-1.0, 1.0, 11)
+
+        expected = np.stack([m.predict(x) for m in models])
+        assert np.allclose(array.predict(x), expected)
+        assert np.allclose(ModelArray.predict(array, x), expected)
+
+    def test_rows(self):
+        models = _get_lines(10)
+        array = ModelArray.from_models(models)
+        assert type(array) is ModelArray
+
+        model = array[3]
+        assert isinstance(model, LineModel)
+        assert model is not models[3]
+        assert (model.m, model.b) == (models[3].m, models[3].b)
+        assert array[-1].m == models[-1].m
+        with pytest.raises(IndexError):
+            array[10]
+
+        array[3] = models[0]
+        assert array.m[3] == models[0].m
+        with pytest.raises(TypeError):
+            array[3] = LinearModel()
+
+        assert [m.m for m in array.to_models()] == list(array.m)
+
+    def test_slicing(self):
+        array = LineModelArray.from_models(_get_lines(10))
+        view = array[2:5]
+        assert len(view) == 3
+        view['m'] = 0.0
+        assert np.array_equal(array.m[2:5], np.zeros(3))
+
+        subset = array[array.b > 3]
+        assert len(subset) == np.sum(array.b > 3)
+        assert np.all(subset.b > 3)
+
+    def test_growth(self):
+        array = LineModelArray()
+        models = _get_lines(50)
+        for model in models:
+            array.append(model)
+        assert len(array) == 50
+        assert np.array_equal(array.m, [m.m for m in models])
+
+        array.resize(60)
+        assert not array.is_set('m')[50:].any()
+        assert array.is_set('m')[:50].all()
+        new = array[55]
+        assert new.parameters.get('m', None) is None
+        array.resize(10)
+        assert len(array) == 10
+
+    def test_hyper_parameters(self):
+        models = list()
+        for shift in range(3):
+            model = ScaledLineModel()
+            model.set_hyper_params(shift=shift, scale=2.0)
+            model.fit(1.0, 3.0)
+            models.append(model)
+        array = ModelArray.from_models(models)
+
+        assert array.shift.dtype == np.int64
+        assert np.array_equal(array.shift, [0, 1, 2])
+        assert np.array_equal(array.scale, [2.0, 2.0, 2.0])
+        assert array[2].shift == 2
+        assert array[2].m == models[2].m
+
+    def test_object_columns(self):
+        x = np.linspace(0.0, 1.0, 11)
+        model = ThresholdModel()
+        model.fit(x, (x > 0.5).astype(int))
+        array = ModelArray.from_models([model, model])
+
+        assert array.w.dtype == object
+        assert np.array_equal(array[1].w, model.w)
+        with pytest.raises(TypeError):
+            ModelArray()
@@ -6,12 +6,17 @@ Unit tests for the Model class.
 #   Imports
 #
 import os
+import pickle
 import tempfile
 
+import numpy as np
 import pytest
 
 from spines import utils
 
+from .helpers import GradientLineModel
+from .helpers import LinearModel
+from .helpers import VectorModel
 from .helpers import get_line_model
 
 
@@ -42,6 +47,303 @@ class TestFitFunctions(object):
         assert lm.predict(x) == y
         assert lm.error(x, y) == 0.
 
+    def test_warm_start(self):
+        model = GradientLineModel()
+        model.warm_start({'m': 1.5, 'other': 2.0}, {'rate': 0.5})
+        model.fit(1.0, 2.0)
+
+        assert model.m == pytest.approx(1.55)
+        assert model.hyper_parameters['rate'] == 0.1
+
+    def test_warm_start_copies(self):
+        w = np.zeros(3)
+        model = VectorModel()
+        model.warm_start({'w': w})
+        model.w += 1.0
+
+        assert (model.w == 1.0).all()
+        assert (w == 0.0).all()
+
+    def test_pickle(self):
+        model = GradientLineModel()
+        model.set_hyper_params(rate=0.5)
+        model.fit(1.0, 2.0)
+        loaded = pickle.loads(pickle.dumps(model))
+
+        assert loaded.get_params() == {'m': 1.0}
+        assert loaded.get_hyper_params() == {'rate': 0.5}
+        assert loaded.score(1.0, 2.0) == model.score(1.0, 2.0)
+
+    def test_clone(self):
+        model = GradientLineModel()
+        model.set_hyper_params(rate=0.5)
+        model.fit(1.0, 2.0)
+        clone = model.clone()
+
+        assert clone.get_hyper_params() == {'rate': 0.5}
+        assert clone.get_params() == {}
+
+
+class TestBatchFunctions(object):
+    """
+    Tests for batched model prediction
+    """
+
+    @staticmethod
+    def _get_model():
+        model = LinearModel()
+        model.fit(np.array([0.0, 1.0]), np.array([1.0, 3.0]))
+        return model
+
+    @pytest.mark.parametrize('executor', ['thread', 'process'])
+    @pytest.mark.parametrize('chunk_size', [None, 7, 1000])
+    def test_predict_batch(self, executor, chunk_size):
+        model = self._get_model()
+        x = np.linspace(0.0, 1.0, 101)
+        ret = model.predict_batch(
+            x, chunk_size=chunk_size, workers=3, executor=executor
+        )
+
+        assert ret.shape == (101,)
+        assert np.allclose(ret, 2.0 * x + 1.0)
+
+    def test_predict_batch_2d(self):
+        model = self._get_model()
+        x = np.arange(20.0).reshape(10, 2)
+        ret = model.predict_batch(x, chunk_size=4, workers=2)
+
+        assert np.allclose(ret, 2.0 * x + 1.0)
+
+    def test_predict_batch_kwargs(self):
+        model = self._get_model()
+        ret = model.predict_batch(np.ones(10), chunk_size=3, scale=2.0)
+
+        assert np.allclose(ret, 6.0)
+
+    def test_predict_batch_bad_output(self):
+        model = self._get_model()
+        with pytest.raises(ValueError):
+            model.predict_batch(
+                np.ones(10), chunk_size=3, scale=np.ones((1, 1))
+            )
+
+    @pytest.mark.parametrize('read_ahead', [0, 2])
+    def test_predict_stream(self, read_ahead):
+        model = self._get_model()
+        batches = list()
+
+        def records():
+            for i in range(25):
+                yield float(i)
+
+        def collate(batch):
+            batches.append(len(batch))
+            return np.asarray(batch)
+
+        ret = list(model.predict_stream(
+            records(), batch_size=10, read_ahead=read_ahead, collate=collate
+        ))
+
+        assert ret == pytest.approx([2.0 * i + 1.0 for i in range(25)])
+        assert batches == [10, 10, 5]
+
+    def test_predict_stream_lazy(self):
+        model = self._get_model()
+        consumed = list()
+
+        def records():
+            for i in range(1000000):
+                consumed.append(i)
+                yield float(i)
+
+        stream = model.predict_stream(records(), batch_size=4)
+        assert next(stream) == pytest.approx(1.0)
+        stream.close()
+        assert len(consumed) == 4
+
+    def test_predict_stream_error(self):
+        def records():
+            yield 1.0
+            raise IOError("Connection lost")
+
+        stream = self._get_model().predict_stream(
+            records(), batch_size=1, read_ahead=1
+        )
+        with pytest.raises(IOError):
+            list(stream)
+
+
+class TestManyFunctions(object):
+    """
+    Tests for the multi-segment error and score functions
+    """
+
+    def _get_model(self):
+        model = GradientLineModel()
+        model.m = 1.5
+        return model
+
+    def _get_segments(self, n=20, seed=0):
+        rng = np.random.RandomState(seed)
+        ret = list()
+        for i in range(n):
+            x = rng.uniform(-1.0, 1.0, rng.randint(1, 50))
+            ret.append((x, 2.0 * x + rng.normal(0.0, 0.1 * i, len(x))))
+        return ret
+
+    def test_segment_list(self):
+        model = self._get_model()
+        segments = self._get_segments()
+        predict = model.predict
+        calls = list()
+        model.predict = lambda x: calls.append(len(x)) or predict(x)
+
+        errors = model.error_many(segments)
+        assert len(calls) == 1
+        assert errors == pytest.approx([model.error(*x) for x in segments])
+        assert model.score_many(segments) == pytest.approx(-errors)
+        assert len(model.error_many([])) == 0
+
+    def test_segment_ids(self):
+        model = self._get_model()
+        segments = self._get_segments()
+        x = np.concatenate([s[0] for s in segments])
+        y = np.concatenate([s[1] for s in segments])
+        ids = np.concatenate([
+            np.full(len(s[0]), 'seg-%02d' % i)
+            for i, s in enumerate(segments)
+        ])
+        shuffle = np.random.RandomState(1).permutation(len(x))
+
+        errors = model.error_many(
+            x[shuffle], y[shuffle], segments=ids[shuffle]
+        )
+        assert errors == pytest.approx([model.error(*x) for x in segments])
+
+    def test_error_fallback(self):
+        model = LinearModel()
+        model.m, model.b = 2.0, 0.0
+        segments = self._get_segments(5)
+        expected = [model.error(*x) for x in segments]
+        assert model.error_many(segments) == pytest.approx(expected)
+
+        x = np.concatenate([s[0] for s in segments])
+        y = np.concatenate([s[1] for s in segments])
+        ids = np.repeat(np.arange(5)[::-1], [len(s[0]) for s in segments])
+        errors = model.error_many(x, y, segments=ids)
+        assert errors == pytest.approx(expected[::-1])
+
+        errors = model.error_many(
+            segments, loss=lambda y, p: np.abs(y - p)
+        )
+        assert errors == pytest.approx([
+            np.mean(np.abs(y - model.predict(x))) for x, y in segments
+        ])
+        with pytest.raises(ValueError):
+            model.error_many(x, y)
+        with pytest.raises(NotImplementedError):
+            model.loss(y, y)
+
+
+class _CountingModel(LinearModel):
+    """Line model which counts its predict calls"""
+    calls = 0
+
+    def predict(self, x, scale=1.0):
+        self.calls += 1
+        return super(_CountingModel, self).predict(x, scale=scale)
+
+
+class TestMemoize(object):
+    """
+    Tests for memoizing Model predictions
+    """
+
+    @staticmethod
+    def _get_model():
+        model = _CountingModel()
+        model.fit(np.array([0.0, 1.0]), np.array([1.0, 3.0]))
+        return model
+
+    def test_repeat_calls(self):
+        model = self._get_model()
+        cache = model.memoize()
+        x = np.arange(5.0)
+
+        first = model.predict(x)
+        second = model.predict(x.copy())
+        assert model.calls == 1
+        assert (first == second).all()
+        assert not second.flags.writeable
+
+        model.predict(x, scale=2.0)
+        model.predict(x.astype(np.float32))
+        assert model.calls == 3
+        assert model.transform(x) is second
+        assert cache.hits == 2
+        assert cache.hit_rate == pytest.approx(0.4)
+
+    def test_invalidation(self):
+        model = self._get_model()
+        cache = model.memoize()
+        x = np.arange(3.0)
+
+        assert model.predict(x) == pytest.approx([1.0, 3.0, 5.0])
+        model.m = 3.0
+        assert len(cache) == 0
+        assert model.predict(x) == pytest.approx([1.0, 4.0, 7.0])
+        model.fit(np.array([0.0, 1.0]), np.array([0.0, 1.0]))
+        assert model.predict(x) == pytest.approx([0.0, 1.0, 2.0])
+        assert model.calls == 3
+
+    def test_trusted_not_cached(self):
+        model = self._get_model()
+        cache = model.memoize()
+        x = np.arange(3.0)
+        model.predict(x)
+
+        with model.parameters.trusted():
+            model.m = 3.0
+            assert model.predict(x) == pytest.approx([1.0, 4.0, 7.0])
+            model.m = 4.0
+            assert model.predict(x) == pytest.approx([1.0, 5.0, 9.0])
+        assert len(cache) == 0
+        assert model.predict(x) == pytest.approx([1.0, 5.0, 9.0])
+        assert model.calls == 4
+
+    def test_eviction(self):
+        model = self._get_model()
+        x = np.arange(100.0)
+        cache = model.memoize(max_bytes=3 * x.nbytes)
+
+        for i in range(4):
+            model.predict(x + i)
+        assert len(cache) == 2
+        assert cache.evictions == 2
+        assert cache.nbytes <= cache.max_bytes
+
+        model.predict(x + 3)
+        model.predict(x)
+        assert model.calls == 5
+
+    def test_unmemoize_and_pickle(self):
+        model = self._get_model()
+        model.memoize(max_bytes=1024)
+        model.predict(1.0)
+
+        loaded = pickle.loads(pickle.dumps(model))
+        assert loaded.memo_cache.max_bytes == 1024
+        assert len(loaded.memo_cache) == 0
+        loaded.predict(1.0)
+        loaded.m = 0.0
+        assert loaded.predict(1.0) == pytest.approx(1.0)
+
+        model.unmemoize()
+        assert model.memo_cache is None
+        model.predict(1.0)
+        model.predict(1.0)
+        assert model.calls == 3
+
 
 @pytest.mark.usefixtures('class_line_model')
 class TestFileFunctions(object):
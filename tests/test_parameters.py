@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the parameters subpackage.
+"""
+#
+#   Imports
+#
+import pickle
+import threading
+
+import numpy as np
+import pytest
+
+from spines.parameters import Bounded
+from spines.parameters import Choice
+from spines.parameters import ConcurrentParameterStore
+from spines.parameters import IntRange
+from spines.parameters import IntervalSet
+from spines.parameters import LogBounded
+from spines.parameters import InvalidParameterException
+from spines.parameters import Parameter
+from spines.parameters import ParameterStore
+from spines.parameters.mixins import get_step_index
+
+
+#
+#   Helpers
+#
+
+def _get_store(store_cls=ParameterStore):
+    """Gets a simple parameter store for testing"""
+    store = store_cls()
+    for name in ('a', 'b', 'c'):
+        param = Parameter(float)
+        param.__set_name__(None, name)
+        store.add(param)
+    return store
+
+
+def _named(param, name='x'):
+    """Sets the name of the given parameter"""
+    param.__set_name__(None, name)
+    return param
+
+
+#
+#   Unit tests
+#
+
+class TestParameterKinds(object):
+    """
+    Tests for the various Parameter classes
+    """
+
+    def test_bounded(self):
+        param = _named(Bounded(float, minimum=0.0, maximum=1.0))
+
+        assert param(0.5) == 0.5
+        assert not param.check(1.5)
+        with pytest.raises(InvalidParameterException):
+            param(-1.0)
+
+    @pytest.mark.parametrize('value, valid', [
+        ('a', True), ('c', True), ('d', False), (1, False)
+    ])
+    def test_choice(self, value, valid):
+        param = _named(Choice(choices=['a', 'b', 'c', 'a']))
+
+        assert param.value_type == (str,)
+        assert param.choices == ('a', 'b', 'c')
+        assert param.index('c') == 2
+        assert param.check(value) == valid
+
+    @pytest.mark.parametrize('value, valid', [
+        (1e-3, True), (10.0, True), (1e-5, False), (100.0, False),
+        (-1.0, False),
+    ])
+    def test_log_bounded(self, value, valid):
+        param = _named(LogBounded(low=1e-4, high=10.0))
+
+        assert param.log
+        assert param.check(value) == valid
+
+    @pytest.mark.parametrize('value, valid', [
+        (2, True), (8, True), (5, False), (10, False), (0, False)
+    ])
+    def test_int_range(self, value, valid):
+        param = _named(IntRange(low=2, high=9, step=2))
+
+        assert param.size == 4
+        assert param.check(value) == valid
+
+    @pytest.mark.parametrize('value, valid', [
+        (0.0, True), (0.3, True), (0.7, True), (1.0, True), (0.25, False),
+        (1.1, False),
+    ])
+    def test_float_step(self, value, valid):
+        param = _named(IntRange(float, low=0.0, high=1.0, step=0.1))
+
+        assert param.size == 11
+        assert param.check(value) == valid
+
+    @pytest.mark.parametrize('value, valid', [
+        (2001, False), (200001, False), (2000001, False), (2000000, True),
+        (2000001.0, False), (1e7 + 0.5, False), (1e7, True),
+    ])
+    def test_large_off_step(self, value, valid):
+        param = _named(IntRange(float, int, low=0, step=2))
+
+        assert param.check(value) == valid
+
+    def test_step_index_arrays(self):
+        index, on_grid = get_step_index(
+            np.array([4, 2001, 200001, 2000000]), 0, 2
+        )
+        assert index.tolist() == [2, 1000, 100000, 1000000]
+        assert on_grid.tolist() == [True, False, False, True]
+
+        index, on_grid = get_step_index(
+            np.array([0.3, 0.25, 1e6 + 0.1]), 0.0, 0.1
+        )
+        assert index.tolist() == [3, 2, 10000001]
+        assert on_grid.tolist() == [True, False, True]
+
+    @pytest.mark.parametrize('value, valid', [
+        (0.0, True), (1.5, True), (2.5, False), (3.0, True), (-1.0, False),
+        (6.0, False),
+    ])
+    def test_interval_set(self, value, valid):
+        param = _named(
+            IntervalSet(intervals=[(3.0, 5.0), (0.0, 1.0), (0.5, 2.0)])
+        )
+
+        assert param.intervals == ((0.0, 2.0), (3.0, 5.0))
+        assert param.measure == 4.0
+        assert param.check(value) == valid
+
+
+class TestStoreNotifications(object):
+    """
+    Tests for the ParameterStore change notifications
+    """
+
+    def test_single_change(self):
+        store = _get_store()
+        calls = list()
+        store.subscribe(lambda s, changed: calls.append(changed))
+
+        store['a'] = 1.0
+
+        assert calls == [frozenset({'a'})]
+
+    def test_update_coalesced(self):
+        store = _get_store()
+        calls = list()
+        store.subscribe(lambda s, changed: calls.append(changed))
+
+        store.update({'a': 1.0, 'b': 2.0})
+
+        assert calls == [frozenset({'a', 'b'})]
+
+    def test_nested_batch(self):
+        store = _get_store()
+        calls = list()
+        store.subscribe(lambda s, changed: calls.append(changed))
+
+        with store.batch():
+            store['a'] = 1.0
+            with store.batch():
+                store['b'] = 2.0
+                store['a'] = 3.0
+            assert not calls
+            del store['a']
+
+        assert calls == [frozenset({'a', 'b'})]
+        assert not store.final
+
+    def test_unsubscribe(self):
+        store = _get_store()
+        calls = list()
+
+        def callback(s, changed):
+            calls.append(changed)
+
+        store.subscribe(callback)
+        store.unsubscribe(callback)
+        store['c'] = 1.0
+
+        assert not calls
+        with pytest.raises(ValueError):
+            store.unsubscribe(callback)
+
+    def test_pickle_drops_subscribers(self):
+        store = _get_store()
+        store.subscribe(lambda s, changed: None)
+        store['a'] = 1.0
+
+        loaded = pickle.loads(pickle.dumps(store))
+
+        assert loaded['a'] == 1.0
+        assert not loaded._subscribers
+
+
+class TestDefaultFactory(object):
+    """
+    Tests for Parameters with default factories
+    """
+
+    def test_not_required(self):
+        param = Parameter(list, default_factory=list)
+        assert not param.required
+
+    def test_default_conflict(self):
+        with pytest.raises(ValueError):
+            Parameter(list, default=[1], default_factory=list)
+
+    def test_lazy_and_not_shared(self):
+        calls = list()
+
+        def factory():
+            calls.append(1)
+            return [0.0] * 4
+
+        param = Parameter(list, default_factory=factory)
+        param.__set_name__(None, 'table')
+        store_a, store_b = ParameterStore(), ParameterStore()
+        store_a.add(param)
+        store_b.add(param)
+        assert not calls
+
+        table = store_a['table']
+        assert store_a['table'] is table
+        assert len(calls) == 1
+
+        store_b.finalize()
+        assert len(calls) == 2
+        assert store_b['table'] is not table
+
+    def test_set_value_skips_factory(self):
+        calls = list()
+        param = Parameter(list, default_factory=lambda: calls.append(1))
+        param.__set_name__(None, 'table')
+        store = ParameterStore()
+        store.add(param)
+        store['table'] = [1, 2]
+        store.finalize()
+
+        assert store['table'] == [1, 2]
+        assert not calls
+
+    @pytest.mark.parametrize('store_cls', [
+        ParameterStore, ConcurrentParameterStore
+    ])
+    def test_plain_default_not_stored(self, store_cls):
+        store = store_cls()
+        store.add(_named(Parameter(float, default=1.0), 'b'))
+
+        assert store['b'] == 1.0
+        assert store.get('b') == 1.0
+        assert 'b' not in store
+        assert len(store) == 0
+        store.finalize()
+        assert store.values == {'b': 1.0}
+
+
+class TestConcurrentStore(object):
+    """
+    Tests for the ConcurrentParameterStore
+    """
+
+    def test_mapping(self):
+        store = _get_store(ConcurrentParameterStore)
+        store['a'] = 1.0
+        store.update(b=2.0, c=3)
+
+        assert store.values == {'a': 1.0, 'b': 2.0, 'c': 3.0}
+        del store['c']
+        assert 'c' not in store
+
+    def test_snapshot_immutable(self):
+        store = _get_store(ConcurrentParameterStore)
+        store.update(a=1.0, b=2.0)
+        snapshot = store.snapshot()
+        store['a'] = 5.0
+
+        assert snapshot['a'] == 1.0
+        assert store['a'] == 5.0
+        with pytest.raises(TypeError):
+            snapshot['a'] = 2.0
+
+    def test_failed_update_not_applied(self):
+        store = _get_store(ConcurrentParameterStore)
+        store.update(a=1.0, b=2.0)
+
+        with pytest.raises(InvalidParameterException):
+            store.update(a=3.0, b='not a float')
+
+        assert store.values == {'a': 1.0, 'b': 2.0}
+
+    @pytest.mark.parametrize('store_cls', [
+        ParameterStore, ConcurrentParameterStore
+    ])
+    def test_batch_reads_own_writes(self, store_cls):
+        store = _get_store(store_cls)
+        store['a'] = 1.0
+
+        with store.batch():
+            store['a'] = store['a'] + 1
+            store['a'] = store['a'] + 1
+            store['c'] = 0.0
+            assert 'c' in store
+            assert len(store) == 2
+            assert store.values == {'a': 3.0, 'c': 0.0}
+
+        assert store['a'] == 3.0
+
+    @pytest.mark.parametrize('store_cls', [
+        ParameterStore, ConcurrentParameterStore
+    ])
+    def test_batch_validates_own_writes(self, store_cls):
+        store = _get_store(store_cls)
+        store.add(_named(Parameter(float), 'd'))
+
+        with store.batch():
+            store.update(a=1.0, b=2.0, c=3.0)
+            assert not store.valid
+            store['d'] = 4.0
+            assert store.valid
+
+        assert store.valid
+
+    def test_batch_hidden_from_readers(self):
+        store = _get_store(ConcurrentParameterStore)
+        store['a'] = 1.0
+        seen = list()
+
+        def reader():
+            seen.append((store['a'], 'b' in store))
+
+        with store.batch():
+            store.update(a=2.0, b=2.0)
+            thread = threading.Thread(target=reader)
+            thread.start()
+            thread.join()
+
+        assert seen == [(1.0, False)]
+        assert store.values == {'a': 2.0, 'b': 2.0}
+
+    def test_consistent_reads(self):
+        store = _get_store(ConcurrentParameterStore)
+        store.update(a=0.0, b=0.0)
+        stop = threading.Event()
+        errors = list()
+
+        def reader():
+            while not stop.is_set():
+                values = store.snapshot()
+                if values['a'] != -values['b']:
+                    errors.append(dict(values))
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(2000):
+            store.update(a=float(i), b=float(-i))
+        stop.set()
+        for t in threads:
+            t.join()
+
+        assert not errors
+
+    def test_trusted_hidden_from_readers(self):
+        store = _get_store(ConcurrentParameterStore)
+        store.update(a=1.0, b=1.0)
+        seen = list()
+
+        def read():
+            thread = threading.Thread(target=lambda: seen.append(dict(store)))
+            thread.start()
+            thread.join()
+
+        with pytest.raises(InvalidParameterException):
+            with store.trusted():
+                store['a'] = 'not a float'
+                store['b'] = 2.0
+                read()
+        read()
+        with store.trusted():
+            store['a'] = 3
+            read()
+        read()
+
+        assert seen == [{'a': 1.0, 'b': 1.0}] * 3 + [{'a': 3.0, 'b': 1.0}]
+
+    def test_factory_read_during_write(self):
+        store = ConcurrentParameterStore()
+        store.add(_named(Parameter(list, default_factory=list), 'table'))
+        seen = list()
+
+        def read():
+            thread = threading.Thread(
+                target=lambda: seen.append(store['table'])
+            )
+            thread.start()
+            thread.join(timeout=5.0)
+            assert not thread.is_alive()
+
+        with store.trusted():
+            read()
+        read()
+        assert seen[0] is seen[1]
+
+        store.finalize()
+        assert store['table'] is seen[0]
+        assert store.snapshot()['table'] is seen[0]
+
+    def test_pickle(self):
+        store = _get_store(ConcurrentParameterStore)
+        store.update(a=1.0)
+        loaded = pickle.loads(pickle.dumps(store))
+
+        loaded['b'] = 2.0
+        assert loaded.values == {'a': 1.0, 'b': 2.0}
+
+
+@pytest.mark.parametrize('store_cls', [
+    ParameterStore, ConcurrentParameterStore
+])
+class TestTrustedWrites(object):
+    """
+    Tests for unvalidated writes to ParameterStores
+    """
+
+    def test_validated_on_exit(self, store_cls):
+        store = _get_store(store_cls)
+        calls = list()
+        store.subscribe(lambda s, changed: calls.append(changed))
+
+        with store.trusted():
+            store['a'] = 1
+            store['b'] = 2.0
+            assert store['a'] == 1
+            assert not calls
+
+        assert isinstance(store['a'], float)
+        assert calls == [frozenset({'a', 'b'})]
+        assert not store.final
+
+    def test_invalid_rolled_back(self, store_cls):
+        store = _get_store(store_cls)
+        store.update(a=1.0, b=2.0)
+
+        with pytest.raises(InvalidParameterException):
+            with store.trusted():
+                store['a'] = 5.0
+                store['b'] = 'not a float'
+
+        assert store.values == {'a': 1.0, 'b': 2.0}
+
+    def test_unknown_parameter(self, store_cls):
+        store = _get_store(store_cls)
+        with pytest.raises(KeyError):
+            with store.trusted():
+                store['d'] = 1.0
+        assert 'd' not in store
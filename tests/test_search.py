@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the search subpackage.
+"""
+#
+#   Imports
+#
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from spines.search import EvaluationCache
+from spines.search import GridSearch
+from spines.search import Hyperband
+from spines.search import RandomSearch
+from spines.search import SearchResult
+from spines.search import SearchSpace
+from spines.search import SuccessiveHalving
+from spines.search import WarmStartIndex
+from spines.search.cache import _enable_wal
+from spines.search.cache import fingerprint
+from spines.search.cache import get_signature
+from spines.search.space import sobol_sample
+from spines.search.utils import get_hyper_parameters
+from spines.search.utils import grid_values
+from spines.search.utils import sample_value
+
+from .helpers import FloatStepModel
+from .helpers import GradientLineModel
+from .helpers import MixedSpaceModel
+from .helpers import ScaledLineModel
+
+
+#
+#   Helpers
+#
+
+def _write_entries(cache, offset, n=50):
+    """Writes entries to the given cache (from a worker process)"""
+    for i in range(offset, offset + n):
+        cache.put(ScaledLineModel, 'sig', {'shift': i}, 'data', float(i))
+    return n
+
+
+#
+#   Unit tests
+#
+
+class TestGridSearch(object):
+    """
+    Tests for the GridSearch class
+    """
+
+    def test_grid(self):
+        search = GridSearch(ScaledLineModel, space={'scale': [1.0, 2.0]})
+        assert search.grid == {'shift': [0, 1, 2, 3, 4], 'scale': [1.0, 2.0]}
+
+    @pytest.mark.parametrize('executor', ['thread', 'process'])
+    def test_run(self, executor):
+        search = GridSearch(ScaledLineModel, workers=2, executor=executor)
+        results = list(search.run(1.0, 2.0))
+
+        assert len(results) == 15
+        assert all(x.ok for x in results)
+        assert search.best.hyper_params == {'shift': 0, 'scale': 1.0}
+        assert search.best.score == 0.0
+        assert search.best.parameters == {'m': 2.0}
+
+    def test_best_ties(self):
+        search = GridSearch(ScaledLineModel)
+        search._results = [
+            SearchResult({'shift': 1}, score=0.0, index=4),
+            SearchResult({'shift': 2}, score=-1.0, index=0),
+            SearchResult({'shift': 0}, score=0.0, index=2),
+        ]
+        assert search.best.hyper_params == {'shift': 0}
+
+    def test_cancel(self):
+        search = GridSearch(ScaledLineModel, workers=1, executor='thread')
+        results = list()
+        for result in search.run(1.0, 2.0):
+            results.append(result)
+            search.cancel()
+
+        assert search.cancelled
+        assert len(results) < 15
+
+    def test_failures_reported(self):
+        search = GridSearch(
+            ScaledLineModel, space={'shift': [0, -1]}, workers=1,
+            executor='thread'
+        )
+        results = list(search.run(1.0, 2.0))
+
+        assert len(results) == 6
+        assert sum(not x.ok for x in results) == 3
+
+
+class TestRandomSearch(object):
+    """
+    Tests for the RandomSearch class
+    """
+
+    def test_samples_valid(self):
+        specs = get_hyper_parameters(ScaledLineModel)
+        search = RandomSearch(ScaledLineModel, n_iter=50, seed=1)
+
+        for candidate in search._candidates():
+            for name, value in candidate.items():
+                assert specs[name].check(value)
+
+    def test_max_evals(self):
+        search = RandomSearch(
+            ScaledLineModel, n_iter=20, max_evals=5, workers=2,
+            executor='thread', seed=1
+        )
+        assert len(list(search.run(1.0, 2.0))) == 5
+
+
+class TestSchedulers(object):
+    """
+    Tests for the multi-fidelity search schedulers
+    """
+
+    def test_successive_halving(self):
+        search = SuccessiveHalving(
+            GradientLineModel, n_iter=9, max_iter=9, eta=3, workers=2,
+            executor='thread', seed=2
+        )
+        results = list(search.run(1.0, 2.0))
+
+        assert [x.iterations for x in results].count(1) == 9
+        assert [x.iterations for x in results].count(3) == 3
+        assert [x.iterations for x in results].count(9) == 1
+        assert search.best.iterations == 9
+        rates = sorted(
+            (x for x in results if x.iterations == 1),
+            key=lambda x: x.score, reverse=True
+        )
+        assert search.best.hyper_params == rates[0].hyper_params
+
+    def test_resumes_state(self):
+        search = SuccessiveHalving(
+            GradientLineModel, n_iter=3, max_iter=3, eta=3, workers=1,
+            executor='thread', space={'rate': [0.5]}
+        )
+        results = list(search.run(1.0, 2.0))
+
+        # Three fit steps in total (1 then 2 more): m = 2 * (1 - 0.5^3)
+        assert search.best.parameters['m'] == pytest.approx(1.75)
+        assert len(results) == 4
+
+    def test_checkpoints(self, tmp_path):
+        search = SuccessiveHalving(
+            GradientLineModel, n_iter=3, max_iter=3, eta=3, workers=2,
+            executor='process', space={'rate': [0.5]},
+            checkpoint_dir=str(tmp_path)
+        )
+        list(search.run(1.0, 2.0))
+
+        assert search.best.parameters['m'] == pytest.approx(1.75)
+        assert len(list(tmp_path.iterdir())) == 3
+
+    def test_hyperband(self):
+        search = Hyperband(
+            GradientLineModel, max_iter=9, eta=3, workers=2,
+            executor='thread', seed=0
+        )
+        assert search.brackets == [(9, 1), (5, 3), (3, 9)]
+
+        results = list(search.run(1.0, 2.0))
+        assert len(results) == (9 + 3 + 1) + (5 + 1) + 3
+        assert search.best.iterations == 9
+
+
+class TestSearchSpace(object):
+    """
+    Tests for the vectorized SearchSpace
+    """
+
+    @pytest.mark.parametrize('method', ['uniform', 'lhs', 'sobol'])
+    def test_sample_valid(self, method):
+        space = SearchSpace(MixedSpaceModel)
+        columns = space.sample(1000, method=method, seed=1)
+
+        assert set(columns) == {'a', 'b', 'c', 'd', 'e'}
+        assert all(len(v) == 1000 for v in columns.values())
+        assert space.check(columns).all()
+        specs = get_hyper_parameters(MixedSpaceModel)
+        for row in list(space.rows(columns))[:50]:
+            for name, value in row.items():
+                assert specs[name].check(value)
+
+    def test_check(self):
+        space = SearchSpace(MixedSpaceModel)
+        columns = space.sample(4, seed=1)
+        columns['a'][0] = 10.0
+        columns['b'][1] = 7
+        columns['c'][2] = 'w'
+        columns['e'][3] = 1.5
+
+        assert space.check(columns).tolist() == [False] * 4
+
+    def test_float_step(self):
+        param = get_hyper_parameters(FloatStepModel)['s']
+        values = grid_values(param)
+        assert values == pytest.approx([0.0, 0.1, 0.2, 0.3])
+        assert all(param.check(x) for x in values)
+        rng = Random(0)
+        assert all(param.check(sample_value(param, rng)) for _ in range(50))
+
+        space = SearchSpace(FloatStepModel)
+        columns = space.sample(100, seed=1)
+        assert space.check(columns).all()
+        assert np.unique(columns['s']) == pytest.approx(values)
+        assert all(param.check(x) for x in columns['s'])
+
+    def test_unique(self):
+        columns = {
+            'x': np.array([1, 2, 1, 3, 2]),
+            'y': np.array(['a', 'b', 'a', 'a', 'c']),
+        }
+        ret = SearchSpace.unique(columns)
+
+        assert ret['x'].tolist() == [1, 2, 3, 2]
+        assert ret['y'].tolist() == ['a', 'b', 'a', 'c']
+
+    def test_sobol_stratified(self):
+        points = sobol_sample(16, 2)
+        cells = set(map(tuple, np.floor(points * 4).astype(int).tolist()))
+        assert len(cells) == 16
+
+    def test_random_search_method(self):
+        search = RandomSearch(
+            ScaledLineModel, n_iter=200, method='lhs', seed=0
+        )
+        candidates = list(search._candidates())
+        assert len(candidates) == 15
+
+
+class TestEvaluationCache(object):
+    """
+    Tests for the EvaluationCache and cached searches
+    """
+
+    def test_put_get(self, tmp_path):
+        cache = EvaluationCache(str(tmp_path / 'cache.db'))
+        cache.put(
+            ScaledLineModel, 'sig', {'shift': 1, 'scale': 2.0}, 'data', 0.5,
+            parameters={'m': 1.0}, duration=2.0
+        )
+
+        assert cache.get('sig', {'scale': 2, 'shift': 1}, 'data') == \
+            (0.5, {'m': 1.0}, 2.0)
+        assert cache.get('sig', {'shift': 1, 'scale': 1.0}, 'data') is None
+        assert cache.get('sig', {'shift': 1, 'scale': 2.0}, 'other') is None
+
+    def test_fingerprint(self):
+        x = np.arange(10, dtype=float)
+
+        assert fingerprint(x, {'a': 1}) == fingerprint(x.copy(), {'a': 1.0})
+        assert fingerprint(x) != fingerprint(x.astype(np.float32))
+        assert fingerprint(x) != fingerprint(x[::-1])
+
+    def test_search_skips_cached(self, tmp_path):
+        cache = EvaluationCache(str(tmp_path / 'cache.db'))
+        search = GridSearch(
+            ScaledLineModel, workers=2, executor='process', cache=cache
+        )
+        first = list(search.run(1.0, 2.0))
+        assert not any(x.cached for x in first)
+        assert len(cache) == 15
+
+        search = GridSearch(
+            ScaledLineModel, workers=2, executor='thread', cache=cache,
+            max_evals=0
+        )
+        second = list(search.run(1.0, 2.0))
+        assert len(second) == 15
+        assert all(x.cached for x in second)
+        assert search.best.hyper_params == {'shift': 0, 'scale': 1.0}
+        assert search.best.parameters == {'m': 2.0}
+
+        third = list(search.run(1.0, 3.0))
+        assert not third
+
+    def test_invalidated(self, tmp_path):
+        cache = EvaluationCache(str(tmp_path / 'cache.db'))
+        signature = get_signature(ScaledLineModel)
+        cache.put(ScaledLineModel, 'old', {'shift': 1}, 'data', 1.0)
+        cache.put(ScaledLineModel, signature, {'shift': 1}, 'data', 1.0)
+
+        assert cache.invalidate(ScaledLineModel) == 1
+        assert cache.get('old', {'shift': 1}, 'data') is None
+        assert cache.get(signature, {'shift': 1}, 'data') is not None
+
+    def test_concurrent_writers(self, tmp_path):
+        cache = EvaluationCache(str(tmp_path / 'cache.db'))
+        with ProcessPoolExecutor(4) as executor:
+            counts = list(executor.map(
+                _write_entries, [cache] * 4, range(0, 200, 50)
+            ))
+
+        assert sum(counts) == len(cache) == 200
+        assert cache.get('sig', {'shift': 123}, 'data')[0] == 123.0
+
+    def test_wal_retried(self):
+        class Connection(object):
+            def __init__(self, busy):
+                self.busy = busy
+                self.mode = 'delete'
+                self.calls = list()
+
+            def execute(self, stmt):
+                self.calls.append(stmt)
+                if stmt == 'PRAGMA journal_mode=WAL':
+                    if self.busy:
+                        self.busy -= 1
+                        raise sqlite3.OperationalError('database is locked')
+                    self.mode = 'wal'
+                return sqlite3.connect(':memory:').execute(
+                    'SELECT ?', (self.mode,)
+                )
+
+        conn = Connection(busy=3)
+        _enable_wal(conn, 10.0)
+        assert conn.mode == 'wal'
+        assert conn.calls.count('PRAGMA journal_mode=WAL') == 4
+
+        conn.calls.clear()
+        _enable_wal(conn, 10.0)
+        assert conn.calls == ['PRAGMA journal_mode']
+
+        with pytest.raises(sqlite3.OperationalError):
+            _enable_wal(Connection(busy=1000), 0.05)
+
+
+class TestWarmStart(object):
+    """
+    Tests for warm-starting fits in searches
+    """
+
+    def test_nearest(self):
+        index = WarmStartIndex(MixedSpaceModel)
+        base = {'a': 0.01, 'b': 10, 'c': 'x', 'd': 0.5, 'e': 0.5}
+        assert index.nearest(base) is None
+
+        index.add(base, {'p': 1})
+        index.add(dict(base, a=0.1), {'p': 2})
+        index.add(dict(base, c='y'), {'p': 3})
+
+        assert index.nearest(dict(base, a=0.05))[1] == {'p': 2}
+        assert index.nearest(dict(base, a=0.015))[1] == {'p': 1}
+        hyper, params, dist = index.nearest(dict(base, c='y'))
+        assert params == {'p': 3}
+        assert dist == 0.0
+
+    def test_maxsize(self):
+        index = WarmStartIndex(ScaledLineModel, maxsize=2)
+        for shift in range(4):
+            index.add({'shift': shift, 'scale': 1.0}, {'m': float(shift)})
+
+        assert len(index) == 2
+        assert index.nearest({'shift': 0, 'scale': 1.0})[1] == {'m': 2.0}
+
+    @pytest.mark.parametrize('warm_start', [False, True])
+    def test_search(self, warm_start):
+        search = RandomSearch(
+            GradientLineModel, n_iter=4, space={'rate': [0.1]}, workers=1,
+            executor='thread', warm_start=warm_start
+        )
+        scores = [x.score for x in search.run(1.0, 2.0)]
+
+        if warm_start:
+            assert scores == sorted(scores) and scores[0] < scores[-1]
+        else:
+            assert len(set(scores)) == 1
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the serving subpackage.
+"""
+#
+#   Imports
+#
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from spines.cli import get_parser
+from spines.serving import BatchingPredictor
+from spines.serving import ModelServer
+from spines.serving import ModelSource
+
+from .helpers import LinearModel
+
+
+#
+#   Helpers
+#
+
+def _get_model():
+    """Gets a fitted model for testing"""
+    model = LinearModel()
+    model.fit(np.array([0.0, 1.0]), np.array([1.0, 3.0]))
+    return model
+
+
+def _save_model(path, m, b):
+    """Saves a line model with the given parameters"""
+    model = LinearModel()
+    model.fit(np.array([0.0, 1.0]), np.array([b, m + b]))
+    tmp = model.save(os.path.join(os.path.dirname(path), 'tmp'))
+    os.replace(tmp, path)
+    return path
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix socket"""
+
+    def __init__(self, path, timeout=5.0):
+        super(_UnixConnection, self).__init__('localhost', timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+def _request(address, method, url, body=None):
+    """Makes a request to a model server"""
+    if isinstance(address, str):
+        conn = _UnixConnection(address)
+    else:
+        conn = http.client.HTTPConnection(*address[:2], timeout=5.0)
+    try:
+        data = None if body is None else json.dumps(body)
+        conn.request(method, url, body=data)
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def _wait_for(func, timeout=10.0):
+    """Waits for a function to return a truthy value"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            ret = func()
+            if ret:
+                return ret
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+        if time.monotonic() > deadline:
+            raise TimeoutError("Timed out waiting")
+        time.sleep(0.05)
+
+
+async def _request_all(predictor, inputs):
+    """Makes concurrent requests for each of the inputs"""
+    return await asyncio.gather(*(predictor(x) for x in inputs))
+
+
+#
+#   Unit tests
+#
+
+class TestBatchingPredictor(object):
+    """
+    Tests for the BatchingPredictor class
+    """
+
+    @pytest.mark.parametrize('use_executor', [False, True])
+    def test_batches(self, use_executor):
+        executor = ThreadPoolExecutor(1) if use_executor else None
+
+        async def run():
+            async with BatchingPredictor(
+                _get_model(), max_batch_size=8, executor=executor
+            ) as predictor:
+                ret = await _request_all(predictor, range(20))
+                return ret, predictor.metrics
+
+        ret, metrics = asyncio.run(run())
+        if executor is not None:
+            executor.shutdown()
+
+        assert ret == pytest.approx([2.0 * i + 1.0 for i in range(20)])
+        assert metrics.requests == 20
+        assert metrics.batches == 3
+        assert metrics.max_batch_size == 8
+        assert metrics.to_dict()['p99_latency'] >= 0.0
+
+    def test_max_wait(self):
+        async def run():
+            predictor = BatchingPredictor(
+                _get_model(), max_batch_size=100, max_wait=0.01
+            )
+            first = await predictor(1.0)
+            second = await _request_all(predictor, [2.0, 3.0])
+            await predictor.close()
+            return first, second, predictor.metrics
+
+        first, second, metrics = asyncio.run(run())
+
+        assert first == pytest.approx(3.0)
+        assert second == pytest.approx([5.0, 7.0])
+        assert metrics.batches == 2
+        assert metrics.mean_batch_size == 1.5
+
+    def test_errors(self):
+        async def run():
+            predictor = BatchingPredictor(_get_model(), scale=np.ones((1, 1)))
+            results = await asyncio.gather(
+                predictor(1.0), predictor(2.0), return_exceptions=True
+            )
+            await predictor.close()
+            return results, predictor.metrics
+
+        results, metrics = asyncio.run(run())
+
+        assert all(isinstance(x, ValueError) for x in results)
+        assert metrics.errors == 1
+
+
+class TestModelSource(object):
+    """
+    Tests for the ModelSource class
+    """
+
+    def test_check(self, tmp_path):
+        path = _save_model(str(tmp_path / 'model.zip'), 2.0, 1.0)
+        source = ModelSource(path)
+        assert source.version == 0
+
+        assert source.check()
+        assert source.version == 1
+        assert source.archive == path
+        assert source.model.predict(1.0) == pytest.approx(3.0)
+        assert not source.check()
+
+        _save_model(path, 3.0, 0.0)
+        assert source.check()
+        assert source.version == 2
+        assert source.model.predict(1.0) == pytest.approx(3.0)
+
+    def test_directory(self, tmp_path):
+        first = _save_model(str(tmp_path / 'a.zip'), 2.0, 1.0)
+        source = ModelSource(str(tmp_path))
+        assert source.check()
+        assert source.archive == first
+
+        second = _save_model(str(tmp_path / 'b.zip'), 1.0, 0.0)
+        os.utime(second, ns=(0, os.stat(first).st_mtime_ns + 10 ** 9))
+        assert source.check()
+        assert source.archive == second
+
+    def test_reload_errors(self, tmp_path):
+        source = ModelSource(str(tmp_path))
+        with pytest.raises(FileNotFoundError):
+            source.check()
+        assert not source.reload()
+
+        path = tmp_path / 'model.zip'
+        path.write_bytes(b'not an archive')
+        assert not source.reload()
+        assert source.version == 0
+
+
+class TestModelServer(object):
+    """
+    Tests for the ModelServer class
+    """
+
+    def test_serve(self, tmp_path):
+        path = _save_model(str(tmp_path / 'model.zip'), 2.0, 1.0)
+        server = ModelServer(path, port=0, workers=0, reload_interval=0.05)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            address = server.address
+            status, ret = _request(address, 'GET', '/health')
+            assert status == 200
+            assert ret['version'] == 1
+
+            status, ret = _request(
+                address, 'POST', '/predict', {'inputs': [0.0, 1.0]}
+            )
+            assert status == 200
+            assert ret['outputs'] == pytest.approx([1.0, 3.0])
+
+            assert _request(address, 'POST', '/predict', {'x': 1})[0] == 400
+            assert _request(address, 'GET', '/missing')[0] == 404
+
+            _save_model(path, 1.0, 0.0)
+            _wait_for(
+                lambda: _request(address, 'GET', '/health')[1]['version'] == 2
+            )
+            status, ret = _request(address, 'POST', '/predict', [4.0])
+            assert ret == {'outputs': pytest.approx([4.0]), 'version': 2}
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+
+    @pytest.mark.skipif(
+        not hasattr(os, 'fork') or not hasattr(socket, 'AF_UNIX'),
+        reason="Requires fork and Unix sockets"
+    )
+    def test_forked_reload(self, tmp_path):
+        path = _save_model(str(tmp_path / 'model.zip'), 2.0, 1.0)
+        sock = str(tmp_path / 'spines.sock')
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [root, os.path.join(root, 'src'), env.get('PYTHONPATH', '')]
+        )
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'spines', '--log-level', 'warning',
+             'serve', path, '--socket', sock, '--workers', '2',
+             '--reload-interval', '0.05'],
+            env=env, cwd=root,
+        )
+        try:
+            _wait_for(lambda: _request(sock, 'GET', '/health')[0] == 200)
+            pids = {_request(sock, 'GET', '/health')[1]['pid']}
+            assert proc.pid not in pids
+
+            versions, errors = list(), list()
+            done = threading.Event()
+
+            def hammer():
+                while not done.is_set():
+                    try:
+                        status, ret = _request(sock, 'POST', '/predict', [1.0])
+                        assert status == 200
+                        versions.append((ret['version'], ret['outputs'][0]))
+                    except Exception as ex:
+                        errors.append(ex)
+
+            threads = [threading.Thread(target=hammer) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.2)
+            _save_model(path, 1.0, 0.0)
+            try:
+                _wait_for(lambda: any(v == 2 for v, _ in versions))
+                time.sleep(0.2)
+            finally:
+                done.set()
+                for thread in threads:
+                    thread.join()
+
+            assert not errors
+            assert {v for v, _ in versions} == {1, 2}
+            for version, output in versions:
+                expected = 3.0 if version == 1 else 1.0
+                assert output == pytest.approx(expected)
+        finally:
+            proc.terminate()
+            assert proc.wait(10) == 0
+        assert not os.path.exists(sock)
+
+
+class TestCommandLine(object):
+    """
+    Tests for the command-line interface
+    """
+
+    def test_serve_arguments(self):
+        args = get_parser().parse_args(
+            ['serve', 'model.zip', '--port', '0', '--workers', '0']
+        )
+        assert args.path == 'model.zip'
+        assert args.port == 0
+        assert args.workers == 0
+        assert args.socket_path is None
+        assert args.reload_interval == 1.0
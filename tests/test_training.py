@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the training subpackage.
+"""
+#
+#   Imports
+#
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from spines.parameters import InvalidParameterException
+from spines.training import ArraySource
+from spines.training import CSVSource
+from spines.training import IterableSource
+from spines.training import NpySource
+from spines.training import ParallelTrainer
+from spines.training import Patience
+from spines.training import TimeBudget
+from spines.training import Tolerance
+from spines.training import Trainer
+from spines.training import get_source
+
+from .helpers import ConcurrentLineModel
+from .helpers import GradientLineModel
+from .helpers import LinearModel
+from .helpers import MomentumLineModel
+from .helpers import RunningMeanModel
+from .helpers import VectorModel
+
+
+#
+#   Helpers
+#
+
+def _get_data(n=1000, seed=0):
+    """Gets random inputs and outputs of a line through the origin"""
+    rng = np.random.RandomState(seed)
+    x = rng.uniform(-1.0, 1.0, n)
+    return x, 2.0 * x + rng.normal(0.0, 0.01, n)
+
+
+#
+#   Unit tests
+#
+
+class TestDataSources(object):
+    """
+    Tests for the training data sources
+    """
+
+    def test_array_source(self):
+        x, y = np.arange(10), np.arange(10.0)
+        chunks = list(ArraySource(x, y, chunk_size=4))
+
+        assert [len(c[0]) for c in chunks] == [4, 4, 2]
+        assert all(len(c) == 2 for c in chunks)
+        assert np.shares_memory(chunks[0][0], x)
+        assert len(list(ArraySource(x, chunk_size=4))) == 3
+
+        with pytest.raises(ValueError):
+            ArraySource(x, y[:5])
+
+    def test_npy_source(self, tmp_path):
+        x, y = _get_data(25)
+        np.save(str(tmp_path / 'x.npy'), x)
+        np.save(str(tmp_path / 'y.npy'), y)
+        source = get_source(
+            (str(tmp_path / 'x.npy'), str(tmp_path / 'y.npy')), chunk_size=10
+        )
+        assert isinstance(source, NpySource)
+
+        for _ in range(2):
+            chunks = list(source)
+            assert len(chunks) == 3
+            assert not isinstance(chunks[0][0], np.memmap)
+            assert np.array_equal(np.concatenate([c[0] for c in chunks]), x)
+            assert np.array_equal(np.concatenate([c[1] for c in chunks]), y)
+
+    def test_csv_source(self, tmp_path):
+        path = tmp_path / 'data.csv'
+        path.write_text('a,b,y\n' + ''.join(
+            '%d,%d,%d\n' % (i, -i, 2 * i) for i in range(7)
+        ))
+        source = CSVSource(str(path), target='y', chunk_size=3, header=True)
+        chunks = list(source)
+
+        assert [c[0].shape for c in chunks] == [(3, 2), (3, 2), (1, 2)]
+        assert np.array_equal(
+            np.concatenate([c[1] for c in chunks]), 2.0 * np.arange(7)
+        )
+        with pytest.raises(ValueError):
+            list(CSVSource(str(path), target='y'))
+
+    def test_iterable_source(self):
+        def chunks():
+            for i in range(3):
+                yield np.full(2, i), np.full(2, 2 * i)
+
+        source = get_source(chunks)
+        assert len(list(source)) == 3
+        assert len(list(source)) == 3
+
+        source = get_source(x for x in [np.arange(2), np.arange(3)])
+        assert isinstance(source, IterableSource)
+        assert [len(c) for c in source] == [1, 1]
+        with pytest.raises(ValueError):
+            list(source)
+
+    def test_iter_from(self, tmp_path):
+        x, y = _get_data(25)
+        np.save(str(tmp_path / 'x.npy'), x)
+        path = tmp_path / 'data.csv'
+        path.write_text(''.join('%r\n' % float(v) for v in x))
+        sources = [
+            ArraySource(x, chunk_size=10),
+            NpySource(str(tmp_path / 'x.npy'), chunk_size=10),
+            CSVSource(str(path), chunk_size=10),
+            IterableSource(lambda: ArraySource(x, chunk_size=10)),
+        ]
+        for source in sources:
+            chunks = list(source.iter_from(1))
+            assert [len(c[0]) for c in chunks] == [10, 5]
+            values = np.concatenate([c[0] for c in chunks])
+            assert np.allclose(values.ravel(), x[10:])
+            assert list(source.iter_from(3)) == []
+
+    def test_unsupported_file(self):
+        with pytest.raises(ValueError):
+            get_source('data.parquet')
+
+
+class TestTrainer(object):
+    """
+    Tests for training models incrementally
+    """
+
+    def test_train_chunks(self):
+        y = np.random.RandomState(0).normal(size=1003)
+        model = RunningMeanModel()
+        result = model.train((np.zeros_like(y), y), chunk_size=100)
+
+        assert result.epochs == 1
+        assert result.steps == 11
+        assert result.samples == 1003
+        assert model.count == 1003
+        assert model.mean == pytest.approx(np.mean(y))
+        assert model.parameters.final
+
+    def test_epochs(self):
+        x, y = _get_data()
+        model = GradientLineModel()
+        model.set_hyper_params(rate=0.5)
+        result = model.train((x, y), epochs=20, chunk_size=100, prefetch=2)
+
+        assert result.epochs == 20
+        assert result.steps == 200
+        assert model.m == pytest.approx(2.0, abs=0.01)
+
+    def test_prefetch_thread(self):
+        readers = set()
+
+        def chunks():
+            for i in range(4):
+                readers.add(threading.get_ident())
+                yield np.arange(2.0), np.full(2, float(i))
+
+        model = RunningMeanModel()
+        model.train(chunks, prefetch=1)
+        assert readers and threading.get_ident() not in readers
+        assert model.mean == pytest.approx(1.5)
+
+        readers.clear()
+        model.train(chunks, prefetch=0)
+        assert readers == {threading.get_ident()}
+
+    def test_finalize_at_epoch_end(self):
+        class CheckingModel(RunningMeanModel):
+            def partial_fit(self, x, y):
+                return {'count': 'invalid'} if y[0] < 0 else {'count': 1}
+
+        model = CheckingModel()
+        finalized = list()
+        finalize = model.parameters.finalize
+        model.parameters.finalize = lambda: finalized.append(1) or finalize()
+        Trainer(epochs=2, chunk_size=1).train(
+            model, (np.zeros(3), np.ones(3))
+        )
+        assert len(finalized) == 2
+        assert model.count == 1
+        assert model.parameters.final
+
+        with pytest.raises(InvalidParameterException):
+            model.train((np.zeros(2), -np.ones(2)), chunk_size=1)
+        assert model.count == 1
+        assert model.parameters.valid
+
+    def test_fit_fallback(self):
+        x = np.arange(10.0)
+        model = LinearModel()
+        result = model.train((x, 2.0 * x + 1.0), chunk_size=5)
+
+        assert result.steps == 2
+        assert model.m == pytest.approx(2.0)
+        assert model.b == pytest.approx(1.0)
+        with pytest.raises(NotImplementedError):
+            model.partial_fit(x, x)
+
+
+class TestEarlyStopping(object):
+    """
+    Tests for monitoring and stopping training early
+    """
+
+    def test_patience_restores_best(self):
+        x, y = _get_data(200)
+        val_x, val_y = _get_data(50, seed=1)
+        model = GradientLineModel()
+        model.set_hyper_params(rate=1.0)
+        result = model.train(
+            (x, y), epochs=1000, chunk_size=50, validation=(val_x, val_y),
+            stopping=Patience(3, min_delta=1e-6), eval_every=2
+        )
+
+        assert isinstance(result.stopped_by, Patience)
+        assert result.epochs < 1000
+        assert all(step % 2 == 0 for step, _ in result.errors)
+        best_step, best_error = min(result.errors, key=lambda x: x[1])
+        assert result.best_error == best_error
+        assert result.best_step == best_step
+        assert model.error(val_x, val_y) == pytest.approx(result.best_error)
+        assert model.parameters.final
+
+    def test_tolerance(self):
+        x, y = _get_data(200)
+        model = GradientLineModel()
+        model.set_hyper_params(rate=1.0)
+        result = model.train(
+            (x, y), epochs=1000, chunk_size=200, stopping=Tolerance(1e-3)
+        )
+
+        assert isinstance(result.stopped_by, Tolerance)
+        assert result.errors == []
+        assert model.m == pytest.approx(2.0, rel=0.01)
+
+    @pytest.mark.parametrize('model_cls', [
+        GradientLineModel, ConcurrentLineModel
+    ])
+    def test_stopping_within_epoch(self, model_cls):
+        x, y = _get_data(200)
+        val_x, val_y = _get_data(50, seed=1)
+        model = model_cls()
+        result = model.train(
+            (x, y), epochs=1000, chunk_size=20, validation=(val_x, val_y),
+            stopping=Tolerance(1e-3)
+        )
+
+        assert isinstance(result.stopped_by, Tolerance)
+        assert result.steps > 10
+        assert model.m == pytest.approx(2.0, rel=0.1)
+        assert model.error(val_x, val_y) == pytest.approx(result.best_error)
+
+    def test_tolerance_arrays(self):
+        criterion = Tolerance(rtol=0.1)
+        w = np.ones(4)
+        assert not criterion.on_evaluate(None, {'w': w, 'name': 'x'})
+        w += 1.0
+        assert not criterion.on_evaluate(None, {'w': w})
+        assert criterion.on_evaluate(None, {'w': w + 0.01})
+
+    def test_time_budget(self):
+        def chunks():
+            while True:
+                time.sleep(0.01)
+                yield np.zeros(1), np.ones(1)
+
+        model = RunningMeanModel()
+        result = model.train(chunks, stopping=[TimeBudget(0.1)])
+
+        assert isinstance(result.stopped_by, TimeBudget)
+        assert 0.1 <= result.duration < 5.0
+        assert model.count == result.steps
+        assert model.parameters.final
+
+    def test_validation_requires_error(self):
+        with pytest.raises(ValueError):
+            RunningMeanModel().train(
+                (np.zeros(2), np.ones(2)), validation=(np.zeros(1),)
+            )
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _interrupting(x, y, chunk_size, step):
+    """Gets chunks of the data, raising an exception at the given step"""
+    counter = [0]
+
+    def chunks():
+        for start in range(0, len(x), chunk_size):
+            counter[0] += 1
+            if counter[0] == step:
+                raise _Interrupted()
+            yield x[start:start + chunk_size], y[start:start + chunk_size]
+
+    return chunks
+
+
+class TestCheckpoints(object):
+    """
+    Tests for checkpointing and resuming training runs
+    """
+
+    def _train(self, **kwargs):
+        np.random.seed(42)
+        model = MomentumLineModel()
+        model.set_hyper_params(rate=0.2)
+        return model, model.train(epochs=3, prefetch=0, **kwargs)
+
+    def test_resume_matches(self, tmp_path):
+        x, y = _get_data(100)
+        expected, expected_result = self._train(data=(x, y), chunk_size=10)
+        assert expected_result.steps == 30
+
+        path = str(tmp_path / 'run.ckpt')
+        with pytest.raises(_Interrupted):
+            self._train(
+                data=_interrupting(x, y, 10, 25), checkpoint=path,
+                checkpoint_every=4
+            )
+        assert os.path.exists(path)
+        assert os.listdir(str(tmp_path)) == ['run.ckpt']
+
+        np.random.seed(0)
+        model = MomentumLineModel()
+        result = model.train(
+            (x, y), epochs=3, chunk_size=10, prefetch=0, checkpoint=path,
+            resume=True
+        )
+        assert result.epochs == 3
+        assert result.steps == 30
+        assert result.samples == 300
+        assert model.m == expected.m
+        assert model.velocity == expected.velocity
+        assert model.rate == 0.2
+
+        finished = MomentumLineModel().train(
+            (x, y), epochs=3, chunk_size=10, resume=path
+        )
+        assert finished.steps == 30
+
+    def test_resume_early_stopping(self, tmp_path):
+        x, y = _get_data(200)
+        val_x, val_y = _get_data(50, seed=1)
+        kwargs = dict(
+            epochs=50, chunk_size=50, validation=(val_x, val_y),
+            stopping=Patience(3, min_delta=1e-6), prefetch=0
+        )
+        expected = GradientLineModel()
+        expected.set_hyper_params(rate=1.0)
+        expected_result = expected.train((x, y), **kwargs)
+        assert isinstance(expected_result.stopped_by, Patience)
+
+        path = str(tmp_path / 'run.ckpt')
+        model = GradientLineModel()
+        model.set_hyper_params(rate=1.0)
+        with pytest.raises(_Interrupted):
+            model.train(_interrupting(x, y, 50, 7), checkpoint=path, **kwargs)
+        model = GradientLineModel()
+        result = model.train((x, y), checkpoint=path, resume=True, **kwargs)
+
+        assert result.steps == expected_result.steps
+        assert result.errors == expected_result.errors
+        assert result.best_step == expected_result.best_step
+        assert isinstance(result.stopped_by, Patience)
+        assert model.m == expected.m
+
+    def test_resume_concurrent_store(self, tmp_path):
+        x, y = _get_data(100)
+        kwargs = dict(epochs=3, chunk_size=10, prefetch=0)
+        expected = ConcurrentLineModel()
+        expected_result = expected.train((x, y), **kwargs)
+
+        path = str(tmp_path / 'run.ckpt')
+        with pytest.raises(_Interrupted):
+            ConcurrentLineModel().train(
+                _interrupting(x, y, 10, 25), checkpoint=path,
+                checkpoint_every=4, **kwargs
+            )
+        model = ConcurrentLineModel()
+        result = model.train((x, y), checkpoint=path, resume=True, **kwargs)
+
+        assert result.steps == expected_result.steps == 30
+        assert model.m == expected.m
+
+    def test_resume_without_checkpoint(self, tmp_path):
+        x, y = _get_data(100)
+        path = str(tmp_path / 'run.ckpt')
+        result = GradientLineModel().train(
+            (x, y), chunk_size=10, checkpoint=path, resume=True
+        )
+        assert result.steps == 10
+        assert os.path.exists(path)
+
+        with pytest.raises(ValueError):
+            RunningMeanModel().train((x, y), resume=path)
+        with pytest.raises(FileNotFoundError):
+            GradientLineModel().train((x, y), resume=str(tmp_path / 'none'))
+
+    def test_invalid_checkpoint(self, tmp_path):
+        path = tmp_path / 'run.ckpt'
+        path.write_bytes(b'\x80\x04N.')
+        with pytest.raises(ValueError):
+            GradientLineModel().train(
+                (np.zeros(2), np.ones(2)), resume=str(path)
+            )
+
+
+class _CountModel(RunningMeanModel):
+    """Model counting the rows it's fit on (and how they're weighted)"""
+
+    def fit(self, x, y):
+        return {'count': len(y), 'mean': float(np.mean(y))}
+
+
+class TestParallelTrainer(object):
+    """
+    Tests for the data-parallel trainer
+    """
+
+    @pytest.mark.parametrize('executor', ['process', 'thread'])
+    def test_matches_full_batch(self, executor):
+        x, y = _get_data(1001)
+        expected = GradientLineModel()
+        for _ in range(5):
+            expected.fit(x, y)
+
+        model = GradientLineModel()
+        trainer = ParallelTrainer(rounds=5, workers=3, executor=executor)
+        result = trainer.train(model, x, y)
+
+        assert result.epochs == 5
+        assert result.steps == 15
+        assert result.samples == 5005
+        assert model.m == pytest.approx(expected.m)
+        assert model.parameters.final
+
+    def test_reducers(self):
+        y = np.arange(10.0)
+        model = _CountModel()
+        ParallelTrainer(
+            rounds=2, workers=4, reduce={'count': 'sum'}, executor='thread'
+        ).train(model, np.zeros(10), y)
+
+        assert model.count == 10
+        assert model.mean == pytest.approx(4.5)
+
+        ParallelTrainer(
+            workers=2, executor='thread',
+            reduce=lambda values, sizes: values.max(axis=0).astype(int)
+        ).train(model, np.zeros(10), y)
+        assert model.count == 5
+        assert model.mean == 7
+
+    def test_mean_of_ints(self):
+        model = _CountModel()
+        ParallelTrainer(workers=3, executor='thread').train(
+            model, np.zeros(10), np.arange(10.0)
+        )
+
+        assert model.count == 4
+        assert isinstance(model.count, int)
+        assert model.parameters.final
+
+    def test_shared_arrays(self):
+        w = np.arange(4.0)
+        model = VectorModel()
+        model.w = w
+        ParallelTrainer(rounds=3, workers=2).train(
+            model, np.ones((6, 4)), np.ones(6)
+        )
+        assert model.w == pytest.approx(w + 3.0)
+
+    def test_invalid_reduce(self):
+        with pytest.raises(ValueError):
+            ParallelTrainer(reduce='median')
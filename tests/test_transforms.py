@@ -5,10 +5,17 @@ Unit tests for the transforms subpackage.
 #
 #   Imports
 #
+import threading
+import weakref
+
+import numpy as np
 import pytest
 
+from spines import Parameter
 from spines import transforms
 
+from .helpers import LinearModel
+
 
 #
 #   Unit tests
@@ -26,3 +33,267 @@ class TestPassSimple(object):
     ])
     def test_transform(self, data_in, data_out):
         assert self.transform.transform(data_in) == data_out
+
+    def test_transform_batch(self):
+        data = np.arange(30.0).reshape(10, 3)
+        ret = self.transform.transform_batch(data, chunk_size=3, workers=2)
+
+        assert ret.shape == (10, 3)
+        assert (ret == data).all()
+
+    def test_transform_stream(self):
+        records = ((i, -i) for i in range(7))
+        ret = list(self.transform.transform_stream(records, batch_size=3))
+
+        assert [tuple(x) for x in ret] == [(i, -i) for i in range(7)]
+
+    def test_memoize(self):
+        transform = transforms.Pass()
+        cache = transform.memoize()
+        data = np.arange(4.0)
+
+        assert (transform(data) == data).all()
+        assert (transform.transform(data) == data).all()
+        assert transform.transform([1, 2]) == [1, 2]
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+        assert transform.transform((x for x in range(2))) is not None
+        assert len(cache) == 2
+
+
+class Scale(transforms.Transform):
+    """
+    Test transform scaling its inputs, writing to a given buffer
+    """
+
+    def __init__(self, *args, factor=2.0, **kwargs):
+        super(Scale, self).__init__(*args, **kwargs)
+        self.factor = factor
+        self.buffers = list()
+
+    def transform(self, x, out=None):
+        """Scales the inputs"""
+        self.buffers.append(out)
+        return np.multiply(x, self.factor, out=out)
+
+
+class Standardize(transforms.Transform):
+    """
+    Test transform standardizing its inputs (with fitted parameters)
+    """
+    mean = Parameter(float)
+    std = Parameter(float)
+
+    def fit(self, x, *args):
+        """Fits the mean and standard deviation of the inputs"""
+        return {'mean': float(np.mean(x)), 'std': float(np.std(x))}
+
+    def transform(self, x):
+        """Standardizes the inputs"""
+        return (x - self.mean) / self.std
+
+
+class TestPipeline(object):
+    """
+    Tests for pipelines of transforms
+    """
+
+    def test_fit_transform(self):
+        x = np.linspace(0.0, 10.0, 101)
+        y = 3.0 * x + 1.0
+        pipeline = transforms.Pipeline(Standardize(), Scale(), LinearModel())
+        pipeline.fit(x, y)
+
+        standardize, _, model = pipeline.steps
+        assert standardize.mean == pytest.approx(5.0)
+        assert model.m == pytest.approx(3.0 * standardize.std / 2.0)
+        assert pipeline.transform(x) == pytest.approx(y)
+        assert pipeline(x[:3]) == pytest.approx(y[:3])
+
+    def test_chunked(self):
+        x = np.arange(100.0).reshape(50, 2)
+        original = x.copy()
+        first, second = Scale(factor=2.0), Scale(factor=-1.0)
+        pipeline = transforms.Pipeline(first, Standardize(), second)
+        pipeline.steps[1].set_params(mean=1.0, std=2.0)
+
+        expected = pipeline.transform(x)
+        assert expected == pytest.approx(-(2.0 * x - 1.0) / 2.0)
+        first.buffers.clear()
+        second.buffers.clear()
+
+        result = pipeline.transform(x, chunk_size=10)
+        assert np.array_equal(result, expected)
+        assert np.array_equal(x, original)
+        buffers = first.buffers + second.buffers
+        assert len(buffers) == 10
+        assert len({id(b) for b in buffers}) == 1
+        assert all(b.shape == (10, 2) for b in buffers)
+
+    def test_buffer_reuse(self):
+        steps = [Scale(factor=float(i + 1)) for i in range(4)]
+        pipeline = transforms.Pipeline(*steps)
+        x = np.ones(8)
+        assert pipeline.transform(x) == pytest.approx(24.0 * x)
+        buffers = [s.buffers[0] for s in steps]
+        assert len({id(b) for b in buffers}) == 2
+        assert all(a is not b for a, b in zip(buffers, buffers[1:]))
+        assert np.array_equal(x, np.ones(8))
+
+    def test_clone(self):
+        pipeline = transforms.Pipeline(Standardize(), LinearModel())
+        pipeline.fit(np.arange(10.0), np.arange(10.0))
+        clone = pipeline.clone()
+
+        assert len(clone.steps) == 2
+        assert clone.steps[0] is not pipeline.steps[0]
+        assert clone.steps[0].mean is None
+        with pytest.raises(ValueError):
+            transforms.Pipeline().transform(np.ones(2))
+        with pytest.raises(TypeError):
+            transforms.Pipeline(len).transform(np.ones(2))
+
+
+class Join(transforms.Transform):
+    """
+    Test transform stacking its inputs as columns
+    """
+
+    def transform(self, *args):
+        """Stacks the inputs"""
+        return np.column_stack(args)
+
+
+class Wait(transforms.Transform):
+    """
+    Test transform waiting for other transforms to run at the same time
+    """
+
+    def __init__(self, *args, barrier=None, **kwargs):
+        super(Wait, self).__init__(*args, **kwargs)
+        self.barrier = barrier
+
+    def transform(self, x):
+        """Waits at the barrier, then passes the inputs through"""
+        self.barrier.wait()
+        return x
+
+
+class Record(transforms.Transform):
+    """
+    Test transform recording which of the tracked outputs are alive
+    """
+
+    def __init__(self, *args, tracked=None, **kwargs):
+        super(Record, self).__init__(*args, **kwargs)
+        self.tracked = tracked
+        self.alive = None
+
+    def transform(self, x):
+        """Records the live outputs, then passes the inputs through"""
+        self.alive = [ref() is not None for ref in self.tracked]
+        return x + 1.0
+
+
+class Track(transforms.Transform):
+    """
+    Test transform keeping weak references to its outputs
+    """
+
+    def __init__(self, *args, tracked=None, **kwargs):
+        super(Track, self).__init__(*args, **kwargs)
+        self.tracked = tracked
+
+    def transform(self, x):
+        """Adds one to the inputs"""
+        ret = x + 1.0
+        self.tracked.append(weakref.ref(ret))
+        return ret
+
+
+class TestTransformGraph(object):
+    """
+    Tests for graphs of transforms
+    """
+
+    def _get_graph(self):
+        graph = transforms.TransformGraph(inputs='x')
+        graph.add_node('double', Scale(factor=2.0), inputs='x')
+        graph.add_node('standard', Standardize())
+        graph.add_node('join', Join(), inputs=['double', 'x', 'standard'])
+        return graph
+
+    @pytest.mark.parametrize('executor', [None, 'thread', 'process'])
+    def test_fit_transform(self, executor):
+        x = np.arange(10.0)
+        graph = self._get_graph()
+        assert graph.get_order()[-1] == 'join'
+
+        graph.fit(x, executor=executor, workers=2)
+        standard = graph.nodes['standard']
+        assert standard.mean == pytest.approx(4.5)
+
+        result = graph.transform(x, executor=executor, workers=2)
+        assert result.shape == (10, 3)
+        assert result[:, 0] == pytest.approx(2.0 * x)
+        assert result[:, 1] == pytest.approx(x)
+        assert result[:, 2] == pytest.approx((x - 4.5) / standard.std)
+
+    def test_parallel_branches(self):
+        barrier = threading.Barrier(3, timeout=1.0)
+        graph = transforms.TransformGraph()
+        for name in 'abc':
+            graph.add_node(name, Wait(barrier=barrier))
+        graph.add_node('join', Join(), inputs=['a', 'b', 'c'])
+
+        result = graph.transform(np.arange(4.0), workers=3)
+        assert result.shape == (4, 3)
+        with pytest.raises(threading.BrokenBarrierError):
+            barrier.reset()
+            graph.transform(np.arange(4.0), executor=None)
+
+    @pytest.mark.parametrize('outputs, alive', [
+        (None, [False, False, True]),
+        (['d', 'a'], [True, False, True]),
+    ])
+    def test_outputs_and_freeing(self, outputs, alive):
+        tracked = list()
+        graph = transforms.TransformGraph(outputs=outputs)
+        graph.add_node('a', Track(tracked=tracked))
+        graph.add_node('b', Track(tracked=tracked), inputs='a')
+        graph.add_node('c', Track(tracked=tracked), inputs='b')
+        graph.add_node('d', Record(tracked=tracked), inputs='c')
+
+        result = graph.transform(np.zeros(3), executor=None)
+        assert graph.nodes['d'].alive == alive
+        if outputs is None:
+            assert result == pytest.approx(4.0)
+        else:
+            assert result[0] == pytest.approx(4.0)
+            assert result[1] == pytest.approx(1.0)
+
+    def test_invalid(self):
+        graph = transforms.TransformGraph()
+        graph.add_node('a', transforms.Pass())
+        with pytest.raises(ValueError):
+            graph.add_node('a', transforms.Pass())
+        with pytest.raises(ValueError):
+            graph.add_edge('z', 'a')
+        with pytest.raises(TypeError):
+            graph.add_node('b', len)
+
+        graph.add_node('b', transforms.Pass(), inputs='a')
+        graph.add_edge('b', 'a')
+        with pytest.raises(ValueError):
+            graph.transform(np.ones(2))
+        with pytest.raises(ValueError):
+            transforms.TransformGraph().transform(np.ones(2))
+
+    def test_clone(self):
+        graph = self._get_graph()
+        graph.fit(np.arange(10.0))
+        clone = graph.clone()
+
+        assert clone.get_order() == graph.get_order()
+        assert clone.nodes['standard'] is not graph.nodes['standard']
+        assert clone.nodes['standard'].mean is None
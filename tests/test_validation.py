@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the validation subpackage.
+"""
+#
+#   Imports
+#
+import pickle
+
+import numpy as np
+import pytest
+
+from spines.utils.shared import SharedArray
+from spines.validation import cross_validate
+from spines.validation import get_folds
+
+from .helpers import GradientLineModel
+from .helpers import LinearModel
+
+
+#
+#   Unit tests
+#
+
+class TestFolds(object):
+    """
+    Tests for splitting data into folds
+    """
+
+    def test_contiguous(self):
+        order, bounds = get_folds(10, 3)
+
+        assert order is None
+        assert bounds == [(0, 4), (4, 7), (7, 10)]
+
+    def test_shuffled(self):
+        order, bounds = get_folds(10, 5, shuffle=True, seed=1)
+
+        assert sorted(order.tolist()) == list(range(10))
+        assert bounds[-1] == (8, 10)
+
+    @pytest.mark.parametrize('n, folds', [(10, 1), (3, 4)])
+    def test_invalid(self, n, folds):
+        with pytest.raises(ValueError):
+            get_folds(n, folds)
+
+
+class TestSharedArray(object):
+    """
+    Tests for the SharedArray class
+    """
+
+    def test_pickle_shares_memory(self):
+        data = np.arange(1200.0).reshape(400, 3)
+        with SharedArray(data) as shared:
+            attached = pickle.loads(pickle.dumps(shared))
+            shared.array[0, 0] = -1.0
+
+            assert len(pickle.dumps(shared)) < data.nbytes
+            assert attached.array[0, 0] == -1.0
+            assert attached.shape == (400, 3)
+            attached.close()
+
+    def test_object_arrays(self):
+        with pytest.raises(TypeError):
+            SharedArray(np.array([object()]))
+
+
+class TestCrossValidate(object):
+    """
+    Tests for k-fold cross-validation
+    """
+
+    @pytest.mark.parametrize('executor', ['thread', 'process'])
+    @pytest.mark.parametrize('shuffle', [False, True])
+    def test_exact_fit(self, executor, shuffle):
+        x = np.linspace(0.0, 1.0, 50)
+        result = cross_validate(
+            LinearModel, x, 2.0 * x + 1.0, folds=5, workers=2,
+            executor=executor, shuffle=shuffle, seed=0
+        )
+
+        assert len(result.scores) == 5
+        assert result.error == pytest.approx(0.0, abs=1e-12)
+        assert result.score == -result.error
+        for params in result.parameters:
+            assert params['m'] == pytest.approx(2.0)
+            assert params['b'] == pytest.approx(1.0)
+
+    def test_folds_independent(self):
+        x = np.arange(20.0)
+        y = np.where(x < 10, 1.0, 3.0) * x
+        result = cross_validate(
+            LinearModel, x, y, folds=2, workers=2, executor='process'
+        )
+
+        slopes = sorted(p['m'] for p in result.parameters)
+        assert slopes == pytest.approx([1.0, 3.0])
+        assert result.score_std > 0
+
+    def test_uses_hyper_parameters(self):
+        model = GradientLineModel()
+        model.set_hyper_params(rate=0.5)
+        model.m = 10.0
+        x = np.ones(4)
+        result = cross_validate(
+            model, x, 2.0 * x, folds=2, executor='thread'
+        )
+
+        assert all(p['m'] == 1.0 for p in result.parameters)
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            cross_validate(LinearModel, np.ones(10), np.ones(9))
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the versioning subpackage.
+"""
+#
+#   Imports
+#
+from spines import Model
+from spines import Parameter
+from spines.versioning.core import ClassSignature
+
+from .helpers import ScaledLineModel
+
+
+#
+#   Helpers
+#
+
+def _make_model(offset=0.0, desc=None):
+    """Creates a (new) model class with the given fit code"""
+    if offset:
+        def fit(self, x, y):
+            self.m = (y - offset) / x
+    else:
+        def fit(self, x, y):
+            self.m = y / x
+
+    def predict(self, x):
+        return self.m * x
+
+    return type('LineModel', (Model,), {
+        '__doc__': desc, 'm': Parameter(float), 'fit': fit,
+        'predict': predict,
+    })
+
+
+#
+#   Unit tests
+#
+
+class TestClassSignature(object):
+    """
+    Tests for the ClassSignature class
+    """
+
+    def test_stable(self):
+        a = ClassSignature(ScaledLineModel)
+        b = ClassSignature(ScaledLineModel())
+
+        assert a.name == 'ScaledLineModel'
+        assert a.hash == b.hash
+
+    def test_code_changes(self):
+        base = ClassSignature(_make_model()).hash
+
+        assert ClassSignature(_make_model(desc='Docs')).hash == base
+        assert ClassSignature(_make_model(offset=1.0)).hash != base